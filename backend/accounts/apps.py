@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from . import deletion, signals, throttling  # noqa: F401  (job, sinyal ve check kayıtları)
+        from .crypto_utils import get_keyring, is_configured
+
+        # Hatalı anahtar ilk /api/me/ isteğinde değil, açılışta patlasın
+        if is_configured():
+            try:
+                get_keyring()
+            except (RuntimeError, ValueError) as exc:
+                raise ImproperlyConfigured(str(exc)) from exc
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import cache, threads
+from .models import (
+    ArchivedTask,
+    ArchivedTaskComment,
+    Task,
+    TaskComment,
+    TaskCommentWithArchived,
+    TaskDeletion,
+    TaskWithArchived,
+)
+
+TASK_COLUMNS = (
+    "id", "title", "description", "state", "owner_id", "created_at", "updated_at", "done_at"
+)
+COMMENT_COLUMNS = ("id", "task_id", "author_id", "content", "created_at")
+
+
+def include_archived(params):
+    return params.get("include_archived") == "1"
+
+
+def task_model(params):
+    """?include_archived=1 ise sıcak + arşiv view'ı, değilse sadece sıcak tablo."""
+    return TaskWithArchived if include_archived(params) else Task
+
+
+def comment_model(params):
+    return TaskCommentWithArchived if include_archived(params) else TaskComment
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = getattr(settings, "TASK_ARCHIVE_AFTER_DAYS", 90)
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    """cutoff'tan önce DONE'a geçmiş ve o zamandan beri DONE kalmış task'lar."""
+    return Task.objects.filter(state="DONE", done_at__lt=cutoff)
+
+
+@transaction.atomic
+def archive_batch(cutoff, batch_size):
+    """
+    done_at'i cutoff'tan eski olan en fazla batch_size task'ı yorumlarıyla arşive taşır.
+    Satırlar kilitlenir (Postgres'te kilitli olanlar atlanır); taşıma sırasında
+    güncellenen task bir sonraki batch'e kalmaz, sıcak tabloda kalır.
+    Dönen değer: (task sayısı, yorum sayısı)
+    """
+    tasks = archivable(cutoff).order_by("id")
+    if connection.features.has_select_for_update_skip_locked:
+        tasks = tasks.select_for_update(skip_locked=True)
+    rows = list(tasks.values(*TASK_COLUMNS)[:batch_size])
+    if not rows:
+        return 0, 0
+    task_ids = [row["id"] for row in rows]
+
+    ArchivedTask.objects.bulk_create(ArchivedTask(**row) for row in rows)
+    comments = TaskComment.objects.filter(task_id__in=task_ids).values(*COMMENT_COLUMNS)
+    archived_comments = ArchivedTaskComment.objects.bulk_create(
+        (ArchivedTaskComment(**row) for row in comments.iterator()), batch_size=batch_size
+    )
+
+    TaskComment.objects.filter(task_id__in=task_ids)._raw_delete(TaskComment.objects.db)
+    Task.objects.filter(id__in=task_ids)._raw_delete(Task.objects.db)
+
+    # Arşiv varsayılan listelerden çıkar: delta senkronu için tombstone, liste cache'i için bump.
+    # TaskCounter değişmez; arşivlenen task'lar istatistiklerde sayılmaya devam eder.
+    owner_ids = {row["owner_id"] for row in rows}
+    TaskDeletion.objects.bulk_create(
+        TaskDeletion(task_id=row["id"], owner_id=row["owner_id"]) for row in rows
+    )
+    scopes = [cache.ALL_SCOPE, *(cache.user_scope(owner_id) for owner_id in owner_ids)]
+    transaction.on_commit(lambda: cache.bump(*scopes))
+    transaction.on_commit(lambda: threads.invalidate(*task_ids))
+    return len(rows), len(archived_comments)
+
+
+def archive_done_tasks(days=None, batch_size=None):
+    """Batch'ler halinde, her biri ayrı transaction'da. Dönen değer: (task, yorum) toplamları."""
+    cutoff = archive_cutoff(days)
+    if batch_size is None:
+        batch_size = getattr(settings, "TASK_ARCHIVE_BATCH_SIZE", 1000)
+    total_tasks = total_comments = 0
+    while True:
+        tasks, comments = archive_batch(cutoff, batch_size)
+        if not tasks:
+            return total_tasks, total_comments
+        total_tasks += tasks
+        total_comments += comments
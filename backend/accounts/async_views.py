@@ -0,0 +1,147 @@
+"""
+Okuma ağırlıklı GET uçlarının async sürümleri (Django async ORM).
+
+ASGI altında DB beklerken worker thread'i tutulmaz; eşzamanlı bağlantı sayısını
+accounts.db_slots sınırlar. Aynı path'lerdeki yazma metodları ve diğer
+action'lar sync DRF ViewSet'lerinde kalır (bkz. dispatch).
+Cevaplar sync uçlarla aynı renderer (accounts.renderers) ile üretilir, byte byte aynıdır.
+"""
+
+from functools import wraps
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from . import cache, threads
+from .crypto_utils import encrypt_json
+from .db_slots import db_slot
+from .filters import get_requested_fields, project_tasks
+from .compact import comment_rows
+from .archive import task_model
+from .listing import TaskListQuery, comment_list_queryset, sees_all_tasks
+from .pagination import TaskCommentPagination, TaskPagination
+from .renderers import JSONRenderer
+from .permissions import IsStaffOrOwner
+from .serializers import TaskSerializer
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def error_response(exc):
+    # DRF exception_handler ile aynı gövde
+    detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    return json_response(detail, status=exc.status_code)
+
+
+def dispatch(async_views, sync_view):
+    """
+    {method: async view} dışındaki metodları sync DRF view'ına yollar.
+    CSRF'i (DRF'deki gibi) SessionAuthentication kontrol eder.
+    """
+
+    async def view(request, *args, **kwargs):
+        handler = async_views.get(request.method)
+        if handler is None:
+            return await sync_to_async(sync_view)(request, *args, **kwargs)
+        return await handler(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
+
+def authenticated(view):
+    """IsAuthenticated + DB slot + APIException -> JSON cevap."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        async with db_slot():
+            user = await request.auser()
+            if not user.is_authenticated:
+                # SessionAuthentication'da DRF 401 yerine 403 döner
+                exc = exceptions.NotAuthenticated()
+                exc.status_code = 403
+                return error_response(exc)
+            try:
+                return await view(Request(request), user, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return error_response(exc)
+
+    return wrapper
+
+
+@authenticated
+async def task_list(request, user):
+    """GET /api/tasks/ — TaskViewSet ile aynı yol (accounts.listing)."""
+    query = TaskListQuery(user, request.query_params)
+
+    async def build_data():
+        paginator = TaskPagination()
+        page = await paginator.apaginate_queryset(
+            query.queryset(), request, SimpleNamespace(keyset_ordering=query.ordering)
+        )
+        if query.includes:
+            data = await sync_to_async(query.rows)(page)
+        else:
+            data = query.rows(page)
+        return paginator.get_paginated_data(data)
+
+    return await cache.acached_list(request, query.scopes, build_data, json_response)
+
+
+@authenticated
+async def task_detail(request, user, pk):
+    """GET /api/tasks/<id>/"""
+    qs = task_model(request.query_params).objects.select_related("owner")
+    if not sees_all_tasks(user, request.query_params):
+        qs = qs.filter(owner=user)
+    fields = get_requested_fields(request.query_params)
+    if fields is not None:
+        qs = project_tasks(qs, fields, ("id",))
+    try:
+        task = await qs.aget(pk=pk)
+    except qs.model.DoesNotExist:
+        raise exceptions.NotFound("No Task matches the given query.")
+    if not IsStaffOrOwner().has_object_permission(SimpleNamespace(user=user), None, task):
+        raise exceptions.PermissionDenied()
+    data = TaskSerializer(task, fields=fields).data
+    response = json_response(data)
+    if "version" in data:
+        # PUT/PATCH'te If-Match olarak gönderilir
+        response["ETag"] = f'"{data["version"]}"'
+    return response
+
+
+@authenticated
+async def task_comment_list(request, user, task_id):
+    """GET /api/tasks/<task_id>/comments/"""
+    body = await sync_to_async(threads.page)(request, task_id)
+    if body is not None:
+        return HttpResponse(body, content_type="application/json")
+    paginator = TaskCommentPagination()
+    page = await paginator.apaginate_queryset(
+        comment_list_queryset(task_id, request.query_params), request
+    )
+    return json_response(paginator.get_paginated_data(comment_rows(page)))
+
+
+@authenticated
+async def me(request, user):
+    """GET /api/me/"""
+    plain = {
+        "isAuthenticated": True,
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_staff": user.is_staff,
+        "is_superuser": user.is_superuser,
+    }
+    return json_response(encrypt_json(plain))
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+
+class UserRowCache:
+    """
+    user_id -> kolon değerleri, AUTH_USER_CACHE_ALIAS cache'inde kısa TTL'li.
+    Alias tüm worker'ların paylaştığı bir backend olmalı (prod: redis); parola
+    değişikliği ya da pasifleştirme bir worker'da invalidate edilince diğerleri
+    de satırı DB'den yeniden okur. Model örneği değil satır değerleri saklanır;
+    her istek kendi User nesnesini alır, bir view'ın değişikliği diğerine sızmaz.
+    """
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, "AUTH_USER_CACHE_ALIAS", "default")]
+
+    @staticmethod
+    def _key(user_id):
+        return f"auth:user:{user_id}"
+
+    def get(self, user_id):
+        values = self._cache().get(self._key(user_id))
+        field_names = self.field_names()
+        # Kolonlar değiştiyse (migration sonrası eski worker'ın yazdığı satır) yok sayılır
+        if values is None or len(values) != len(field_names):
+            return None
+        return User.from_db("default", field_names, values)
+
+    def set(self, user):
+        ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 30)
+        values = tuple(getattr(user, name) for name in self.field_names())
+        self._cache().set(self._key(user.pk), values, timeout=ttl)
+
+    def invalidate(self, user_id):
+        self._cache().delete(self._key(user_id))
+
+    @staticmethod
+    def field_names():
+        return [field.attname for field in User._meta.concrete_fields]
+
+
+user_cache = UserRowCache()
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    AuthenticationMiddleware her istekte get_user() çağırır; bu backend
+    auth_user SELECT'ini AUTH_USER_CACHE_TTL saniye boyunca paylaşılan cache'te saklar.
+    Kullanıcı kaydedilince/silinince accounts.signals cache'i temizler.
+    """
+
+    def get_user(self, user_id):
+        if getattr(settings, "AUTH_USER_CACHE_TTL", 30) <= 0:
+            return super().get_user(user_id)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = User._default_manager.get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            user_cache.set(user)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis opsiyonel; sadece RedisBackend için gerekli
+    redis = None
+    redis_asyncio = None
+
+
+class InMemoryBackend:
+    """
+    Tek process içinde fan-out. Geliştirme, testler ve tek worker'lı ASGI
+    kurulumları için. Birden fazla worker varsa RedisBackend kullanılmalı.
+    """
+
+    def __init__(self, queue_size=1000, **options):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def subscribe(self):
+        return InMemorySubscription(self)
+
+    def _add(self, channel, subscription):
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+
+    def _remove(self, channel, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+
+class InMemorySubscription:
+    def __init__(self, backend):
+        self.backend = backend
+        self.channels = set()
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=backend.queue_size)
+
+    async def add(self, channel):
+        self.channels.add(channel)
+        self.backend._add(channel, self)
+
+    async def remove(self, channel):
+        self.channels.discard(channel)
+        self.backend._remove(channel, self)
+
+    def deliver(self, message):
+        # publish() view thread'inden çağrılır; kuyruk bu subscription'ın loop'una ait
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # Yavaş client yüzünden bellek büyümesin: en eski event düşer
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+    async def close(self):
+        for channel in list(self.channels):
+            await self.remove(channel)
+
+
+class RedisBackend:
+    """Redis pub/sub ile worker'lar ve makineler arası fan-out."""
+
+    def __init__(self, url="redis://localhost:6379/0", **options):
+        if redis is None:
+            raise ImproperlyConfigured("RedisBackend requires the 'redis' package")
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(channel, message)
+
+    def subscribe(self):
+        return RedisSubscription(self.url)
+
+
+class RedisSubscription:
+    def __init__(self, url):
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+
+    async def add(self, channel):
+        await self._pubsub.subscribe(channel)
+
+    async def remove(self, channel):
+        await self._pubsub.unsubscribe(channel)
+
+    async def get(self):
+        while True:
+            if not self._pubsub.subscribed:
+                await asyncio.sleep(0.5)
+                continue
+            message = await self._pubsub.get_message(timeout=None)
+            if message is not None and message["type"] == "message":
+                return message["data"].decode("utf-8")
+
+    async def close(self):
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    """settings.REALTIME_BROKER ile seçilen backend'in process başına tek örneği."""
+    global _broker
+    if _broker is None:
+        config = getattr(settings, "REALTIME_BROKER", {})
+        backend = config.get("BACKEND", "accounts.broker.InMemoryBackend")
+        _broker = import_string(backend)(**config.get("OPTIONS", {}))
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == "REALTIME_BROKER":
+        _broker = None
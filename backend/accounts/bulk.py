@@ -0,0 +1,247 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import cache, counters, events, threads
+from .filters import MAX_ID
+from .models import Task, TaskComment, TaskDeletion
+from .permissions import IsStaffOrOwner
+from .serializers import TaskSerializer
+
+# owner ayrıca (tek IN sorgusuyla) doğrulanır, serializer'a bırakılmaz
+TASK_WRITE_FIELDS = ("title", "description", "state")
+
+
+def get_bulk_items(data, key=None):
+    """Gövde bir liste (ya da {key: [...]}) olmalı ve TASK_BULK_MAX_ITEMS'ı aşmamalı."""
+    items = data.get(key) if key and isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ValidationError({"detail": "Expected a non-empty list."})
+    max_items = getattr(settings, "TASK_BULK_MAX_ITEMS", 1000)
+    if len(items) > max_items:
+        raise ValidationError({"detail": f"At most {max_items} items per request."})
+    return items
+
+
+def _load_owners(request, items):
+    """Staff'ın atadığı owner'lar + isteği yapan kullanıcı, tek sorguda."""
+    owner_ids = set()
+    if request.user.is_staff:
+        owner_ids = {
+            item.get("owner")
+            for item in items
+            if isinstance(item, dict) and item.get("owner") is not None
+        }
+    owners = User.objects.in_bulk([i for i in owner_ids if isinstance(i, int)])
+    owners[request.user.id] = request.user
+    return owners
+
+
+def _owner_for(request, item, owners, default):
+    """(owner, hata) döner; normal kullanıcının owner alanı tekli uçtaki gibi yok sayılır."""
+    if not request.user.is_staff or item.get("owner") is None:
+        return default, None
+    owner = owners.get(item["owner"]) if isinstance(item["owner"], int) else None
+    if owner is None:
+        return None, {"owner": ["Invalid pk - object does not exist."]}
+    return owner, None
+
+
+def _validate(item, instance=None):
+    data = {name: item[name] for name in TASK_WRITE_FIELDS if name in item}
+    serializer = TaskSerializer(
+        instance, data=data, partial=instance is not None, fields=TASK_WRITE_FIELDS
+    )
+    serializer.is_valid()
+    return serializer
+
+
+def bulk_create_tasks(request, items):
+    """
+    Tüm öğeler doğrulanır; biri bile hatalıysa hiçbir şey yazılmaz.
+    Dönen değer: (başarılı mı, öğe başına sonuçlar)
+    """
+    owners = _load_owners(request, items)
+    results, tasks = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"index": index, "status": 400, "errors": {"detail": "Expected an object."}})
+            continue
+        serializer = _validate(item)
+        owner, owner_error = _owner_for(request, item, owners, request.user)
+        errors = {**serializer.errors, **(owner_error or {})}
+        if errors:
+            results.append({"index": index, "status": 400, "errors": errors})
+            continue
+        tasks.append(Task(owner=owner, **serializer.validated_data))
+        results.append({"index": index, "status": 201})
+
+    if len(tasks) != len(items):
+        return False, [r for r in results if r["status"] != 201]
+
+    now = timezone.now()
+    for task in tasks:
+        # bulk_create save() çağırmaz
+        task.sync_done_at(now)
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        after_write(created=tasks)
+
+    for result, task in zip(results, tasks):
+        result["id"] = task.id
+    return True, results
+
+
+def _load_permitted(request, view, ids):
+    """
+    Tüm id'ler tek sorguda okunur; IsStaffOrOwner nesne başına bellekte uygulanır.
+    Dönen değer: {id: task}, {id: hata sonucu}
+    """
+    permission = IsStaffOrOwner()
+    found = Task.objects.select_related("owner").in_bulk(ids)
+    permitted, failed = {}, {}
+    for task_id in ids:
+        task = found.get(task_id)
+        if task is None:
+            failed[task_id] = {"id": task_id, "status": 404, "errors": {"detail": "Not found."}}
+        elif not permission.has_object_permission(request, view, task):
+            failed[task_id] = {"id": task_id, "status": 403, "errors": {"detail": "Permission denied."}}
+        else:
+            permitted[task_id] = task
+    return permitted, failed
+
+
+def _item_ids(items, key):
+    """key verilirse öğeler {key: id, ...} nesneleri, verilmezse çıplak id'ler olmalı."""
+    ids = []
+    for index, item in enumerate(items):
+        if key is not None and not isinstance(item, dict):
+            raise ValidationError({"detail": f"Item {index} must be an object."})
+        value = item if key is None else item.get(key)
+        # bool int'in alt sınıfı; 64 bit'i aşan id sürücüde OverflowError verir
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 < value <= MAX_ID:
+            raise ValidationError({"detail": f"Item {index} has no integer id."})
+        ids.append(value)
+    if len(set(ids)) != len(ids):
+        raise ValidationError({"detail": "Duplicate ids."})
+    return ids
+
+
+def bulk_update_tasks(request, view, items):
+    ids = _item_ids(items, "id")
+    permitted, failed = _load_permitted(request, view, ids)
+    owners = _load_owners(request, items)
+
+    results, changed, fields = [], [], set()
+    before = {}
+    for item, task_id in zip(items, ids):
+        if task_id in failed:
+            results.append(failed[task_id])
+            continue
+        task = permitted[task_id]
+        serializer = _validate(item, task)
+        owner, owner_error = _owner_for(request, item, owners, task.owner)
+        errors = {**serializer.errors, **(owner_error or {})}
+        if errors:
+            results.append({"id": task_id, "status": 400, "errors": errors})
+            continue
+
+        before[task_id] = TaskSerializer(task).data
+        for name, value in serializer.validated_data.items():
+            setattr(task, name, value)
+            fields.add(name)
+        if owner.id != task.owner_id:
+            task.owner = owner
+            fields.add("owner")
+        changed.append(task)
+        results.append({"id": task_id, "status": 200})
+
+    if len(changed) != len(items):
+        return False, [r for r in results if r["status"] != 200]
+
+    now = timezone.now()
+    for task in changed:
+        # bulk_update auto_now alanlarını ve save()'deki done_at'i kendisi güncellemez
+        task.updated_at = now
+        if "state" in fields and task.sync_done_at(now):
+            fields.add("done_at")
+    with transaction.atomic():
+        Task.objects.bulk_update(changed, [*sorted(fields), "updated_at"])
+        after_write(updated=[(before[task.id], task) for task in changed])
+    return True, results
+
+
+def bulk_delete_tasks(request, view, ids):
+    ids = _item_ids(ids, None)
+    permitted, failed = _load_permitted(request, view, ids)
+    if failed:
+        return False, list(failed.values())
+
+    purge_tasks(list(permitted.values()))
+    return True, [{"id": task_id, "status": 204} for task_id in ids]
+
+
+@transaction.atomic
+def purge_tasks(tasks):
+    """
+    Task'ları ve yorumlarını toplu siler. Model.delete()'in satır satır
+    sinyal/cascade yolunu atlar; tombstone, cache ve event'leri bir kerede üretir.
+    """
+    task_ids = [task.id for task in tasks]
+    TaskComment.objects.filter(task_id__in=task_ids)._raw_delete(TaskComment.objects.db)
+    TaskDeletion.objects.bulk_create(
+        TaskDeletion(task_id=task.id, owner_id=task.owner_id) for task in tasks
+    )
+    Task.objects.filter(id__in=task_ids)._raw_delete(Task.objects.db)
+    transaction.on_commit(lambda: threads.invalidate(*task_ids))
+    after_write(deleted=tasks)
+
+
+@transaction.atomic
+def purge_comments(comments):
+    """
+    Yorumları toplu siler. comments: (yorum id, task id, task owner id) üçlüleri;
+    yorum sinyallerinin yaptığı cache/event işleri burada bir kerede yapılır.
+    """
+    TaskComment.objects.filter(id__in=[c[0] for c in comments])._raw_delete(
+        TaskComment.objects.db
+    )
+    owner_ids = {owner_id for _, _, owner_id in comments}
+    scopes = [
+        cache.comments_scope(cache.ALL_SCOPE),
+        *(cache.comments_scope(cache.user_scope(owner_id)) for owner_id in owner_ids),
+    ]
+    transaction.on_commit(lambda: cache.bump(*scopes))
+    task_ids = {task_id for _, task_id, _ in comments}
+    transaction.on_commit(lambda: threads.invalidate(*task_ids))
+    for comment_id, task_id, _ in comments:
+        events.comment_deleted(comment_id, task_id)
+
+
+def after_write(created=(), updated=(), deleted=()):
+    """Sinyal göndermeyen toplu yazmalardan sonra cache, sayaçlar ve canlı event'ler."""
+    owner_ids = {task.owner_id for task in created}
+    owner_ids |= {task.owner_id for task in deleted}
+    for before, task in updated:
+        owner_ids |= {before["owner"], task.owner_id}
+    scopes = [cache.ALL_SCOPE, *(cache.user_scope(owner_id) for owner_id in owner_ids)]
+    transaction.on_commit(lambda: cache.bump(*scopes))
+    moved = [task.id for before, task in updated if before["owner"] != task.owner_id]
+    if moved:
+        transaction.on_commit(lambda: cache.forget_owners(*moved))
+    counters.apply_deltas(
+        counters.task_deltas(
+            created=created,
+            updated=[((before["owner"], before["state"]), task) for before, task in updated],
+            deleted=deleted,
+        )
+    )
+
+    for task in created:
+        events.task_created(TaskSerializer(task).data)
+    for before, task in updated:
+        events.task_updated(before, TaskSerializer(task).data)
+    for task in deleted:
+        events.task_deleted(task.id, task.owner_id)
@@ -0,0 +1,206 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Task
+
+ALL_SCOPE = "all"
+
+
+class CacheStats:
+    """Process içi hit/miss sayaçları."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+stats = CacheStats()
+
+
+def task_cache():
+    return caches["tasks"]
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def _version_key(scope):
+    return f"tasks:v:{scope}"
+
+
+def bump(*scopes):
+    """
+    Verilen scope'ların versiyonunu yeniler. Eski versiyonla yazılmış
+    anahtarlar bir daha okunmaz ve TIMEOUT ile düşer; silmeye gerek yoktur.
+    """
+    now = time.time_ns()
+    task_cache().set_many({_version_key(scope): now for scope in scopes}, timeout=None)
+
+
+def comments_scope(scope):
+    """Yorum sayısı/önizlemesi içeren liste cevapları bu scope'a da bağlıdır."""
+    return f"comments:{scope}"
+
+
+def _owner_key(task_id):
+    return f"tasks:owner:{task_id}"
+
+
+def task_owner(task_id):
+    """
+    Yorum yazmalarında bump'lanacak owner scope'u için task'ın owner'ı.
+    Task başına cache'lenir; owner değiştiren yazmalar forget_owners çağırır.
+    """
+    cache = task_cache()
+    owner_id = cache.get(_owner_key(task_id))
+    if owner_id is None:
+        owner_id = Task.objects.filter(id=task_id).values_list("owner_id", flat=True).first()
+        if owner_id is not None:
+            cache.set(_owner_key(task_id), owner_id)
+    return owner_id
+
+
+def forget_owners(*task_ids):
+    task_cache().delete_many([_owner_key(task_id) for task_id in task_ids])
+
+
+def get_versions(scopes):
+    cache = task_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+async def aget_versions(scopes):
+    cache = task_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not await cache.aadd(key, version, timeout=None):
+                version = await cache.aget(key, version)
+        versions.append(version)
+    return versions
+
+
+def _request_shape(request):
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    # next/previous linkleri host içerir
+    return repr((request.get_host(), request.path, params))
+
+
+def _list_key(request, scopes, versions):
+    """(cache anahtarı, ETag, Last-Modified)"""
+    version = "-".join(str(v) for v in versions)
+    shape = hashlib.sha1(_request_shape(request).encode("utf-8")).hexdigest()
+    etag = f'"{shape[:16]}-{version}"'
+    key = f"tasks:list:{scopes[0]}:{version}:{shape}"
+    return key, etag, max(versions) // 1_000_000_000
+
+
+def cached_list(request, scopes, build_response):
+    """
+    Serialize edilmiş liste cevabını (scope'lar, versiyonlar, sorgu şekli) anahtarıyla saklar.
+    ETag/Last-Modified versiyondan türetilir; eşleşen If-None-Match
+    isteği sorgu ve cache okuması olmadan 304 alır. Last-Modified saniye
+    hassasiyetinde olduğundan If-Modified-Since'e güvenilmez, sadece ETag bakılır.
+    """
+    key, etag, last_modified = _list_key(request, scopes, get_versions(scopes))
+
+    if _not_modified(request, etag):
+        stats.incr("not_modified")
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        return _finalize(response, etag, last_modified)
+
+    cache = task_cache()
+    data = cache.get(key)
+    if data is not None:
+        stats.incr("hits")
+        return _finalize(Response(data), etag, last_modified)
+
+    stats.incr("misses")
+    response = build_response()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data)
+        _finalize(response, etag, last_modified)
+    return response
+
+
+async def acached_list(request, scopes, build_data, render):
+    """
+    cached_list'in async view sürümü; aynı anahtarları kullanır, sync ve
+    async uçlar cache'i paylaşır. build_data liste verisini döner,
+    render onu HttpResponse'a çevirir.
+    """
+    key, etag, last_modified = _list_key(request, scopes, await aget_versions(scopes))
+
+    if _not_modified(request, etag):
+        stats.incr("not_modified")
+        response = HttpResponseNotModified()
+        return _finalize(response, etag, last_modified)
+
+    cache = task_cache()
+    data = await cache.aget(key)
+    if data is not None:
+        stats.incr("hits")
+        return _finalize(render(data), etag, last_modified)
+
+    stats.incr("misses")
+    data = await build_data()
+    await cache.aset(key, data)
+    return _finalize(render(data), etag, last_modified)
+
+
+def _not_modified(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _finalize(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Cevap kullanıcıya özel; tarayıcı saklayabilir ama her seferinde doğrulamalı
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
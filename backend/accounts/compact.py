@@ -0,0 +1,102 @@
+"""
+Liste uçları için ModelSerializer'sız okuma yolu.
+
+Satırlar .values() ile okunur (owner/author kullanıcı adı aynı sorguda JOIN
+ile gelir) ve cevap dict'leri doğrudan kurulur; DRF'in satır ve alan başına
+to_representation maliyeti ödenmez. Çıktı TaskSerializer /
+TaskCommentSerializer ile aynıdır (alan sırası ve tarih biçimi dahil).
+Sadece okuma içindir; yazma uçları serializer'ları kullanmaya devam eder.
+"""
+
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from .includes import comment_counts, latest_comments_queryset
+from .metrics import serializer_timer
+from .models import TaskComment, task_version
+
+# TaskCommentSerializer.created_at ile aynı biçim (saat dilimi, "Z" soneki)
+_datetime = serializers.DateTimeField()
+
+# Serializer alanı -> (.values() kolonu, dönüşüm ya da None).
+# Sıra, cevaptaki alan sırasıdır: Meta.fields ile aynı tutulmalı.
+TASK_COLUMNS = {
+    "id": ("id", None),
+    "title": ("title", None),
+    "description": ("description", None),
+    "state": ("state", None),
+    "owner": ("owner_id", None),
+    "owner_username": ("owner__username", None),
+    "version": ("updated_at", task_version),
+}
+COMMENT_COLUMNS = {
+    "id": ("id", None),
+    "task": ("task_id", None),
+    "author": ("author_id", None),
+    "author_username": ("author__username", None),
+    "content": ("content", None),
+    "created_at": ("created_at", _datetime.to_representation),
+}
+
+
+def _plan(columns, fields):
+    # ?fields= sırası değil, serializer'daki alan sırası
+    return [(name, *spec) for name, spec in columns.items() if name in fields]
+
+
+def _build(rows, plan):
+    return [
+        {
+            name: row[column] if convert is None or row[column] is None else convert(row[column])
+            for name, column, convert in plan
+        }
+        for row in rows
+    ]
+
+
+def task_values(queryset, fields=None, ordering=("id",)):
+    """
+    Task sorgusunu sayfalanabilir bir .values() sorgusuna çevirir. Sıralama
+    kolonları cursor için, id include'lar için her zaman seçilir.
+    """
+    columns = {"id"} | {name.lstrip("-") for name in ordering}
+    columns.update(TASK_COLUMNS[field][0] for field in fields or TASK_COLUMNS)
+    return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+
+def comment_values(queryset):
+    columns = [column for column, _ in COMMENT_COLUMNS.values()]
+    return queryset.select_related(None).values(*columns)
+
+
+def task_rows(rows, fields=None, include=(), latest_comments=None, comment_model=TaskComment):
+    """
+    task_values sayfasından TaskSerializer(many=True, fields=..., include=...).data
+    ile aynı liste. include'lar sayfadaki task'lar için comment_model'den birer ek sorgu yapar.
+    """
+    task_ids = [row["id"] for row in rows]
+    counts = comment_counts(task_ids, comment_model) if "comment_stats" in include else None
+    latest = None
+    if "latest_comments" in include:
+        latest = defaultdict(list)
+        comments = comment_values(latest_comments_queryset(latest_comments, comment_model).filter(task_id__in=task_ids))
+        for comment in comment_rows(list(comments)):
+            latest[comment["task"]].append(comment)
+
+    with serializer_timer():
+        data = _build(rows, _plan(TASK_COLUMNS, fields or TASK_COLUMNS))
+        # TaskSerializer include alanlarını bu sırayla ekler
+        if counts is not None:
+            for item, task_id in zip(data, task_ids):
+                item["comment_count"] = counts.get(task_id, 0)
+        if latest is not None:
+            for item, task_id in zip(data, task_ids):
+                item["latest_comments"] = latest.get(task_id, [])
+    return data
+
+
+def comment_rows(rows):
+    """comment_values sayfasından TaskCommentSerializer(many=True).data ile aynı liste."""
+    with serializer_timer():
+        return _build(rows, _plan(COMMENT_COLUMNS, COMMENT_COLUMNS))
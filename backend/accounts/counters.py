@@ -0,0 +1,101 @@
+from collections import Counter
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+
+from .models import Task, TaskCounter, TaskWithArchived
+
+
+def apply_deltas(deltas):
+    """
+    {(owner_id, state): fark} değerlerini TaskCounter'a yazar.
+    UPDATE count = count + fark satır kilidiyle atomiktir; satır yoksa ve fark
+    pozitifse oluşturulur. Negatif farkta satır oluşturulmaz: kullanıcı silinirken
+    sayaç satırları cascade ile task'lardan önce gidebilir.
+    """
+    for (owner_id, state), delta in deltas.items():
+        if not delta:
+            continue
+        counters = TaskCounter.objects.filter(owner_id=owner_id, state=state)
+        if counters.update(count=F("count") + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                TaskCounter.objects.create(owner_id=owner_id, state=state, count=delta)
+        except IntegrityError:
+            # Aynı anda başka bir istek satırı oluşturduysa
+            counters.update(count=F("count") + delta)
+
+
+def task_deltas(created=(), updated=(), deleted=()):
+    """
+    created/deleted: Task'lar; updated: ((eski owner_id, eski state), Task) çiftleri.
+    """
+    deltas = Counter()
+    for task in created:
+        deltas[(task.owner_id, task.state)] += 1
+    for task in deleted:
+        deltas[(task.owner_id, task.state)] -= 1
+    for (owner_id, state), task in updated:
+        if (owner_id, state) != (task.owner_id, task.state):
+            deltas[(owner_id, state)] -= 1
+            deltas[(task.owner_id, task.state)] += 1
+    return deltas
+
+
+@transaction.atomic
+def rebuild():
+    """
+    Sayaçları sıcak ve arşiv task tablolarından yeniden hesaplar.
+    Dönen değer: yazılan satır sayısı.
+    """
+    if connection.vendor == "postgresql":
+        # Yeniden hesaplama sırasında gelen yazmalar (arşivleme dahil) kaybolmasın;
+        # okumalar engellenmez
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {Task._meta.db_table} IN SHARE MODE")
+    TaskCounter.objects.all().delete()
+    rows = (
+        TaskWithArchived.objects.values("owner_id", "state")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    counters = TaskCounter.objects.bulk_create(
+        TaskCounter(owner_id=row["owner_id"], state=row["state"], count=row["count"])
+        for row in rows
+    )
+    return len(counters)
+
+
+def get_stats(owner_id=None, by_owner=False):
+    """
+    GET /api/tasks/stats/ cevabı; kullanıcı x state satırı okunur, task tablosu değil.
+    """
+    counters = TaskCounter.objects.filter(count__gt=0).order_by("owner_id", "state")
+    if owner_id is not None:
+        counters = counters.filter(owner_id=owner_id)
+    if by_owner:
+        counters = counters.select_related("owner")
+
+    states = [value for value, _ in Task.STATUS_CHOICES]
+    by_state = dict.fromkeys(states, 0)
+    owners = {}
+    for counter in counters:
+        by_state[counter.state] += counter.count
+        if by_owner:
+            owner = owners.setdefault(
+                counter.owner_id,
+                {
+                    "owner": counter.owner_id,
+                    "owner_username": counter.owner.username,
+                    "total": 0,
+                    "by_state": dict.fromkeys(states, 0),
+                },
+            )
+            owner["total"] += counter.count
+            owner["by_state"][counter.state] += counter.count
+
+    stats = {"total": sum(by_state.values()), "by_state": by_state}
+    if by_owner:
+        stats["by_owner"] = list(owners.values())
+    return stats
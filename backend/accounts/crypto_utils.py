@@ -1,25 +1,95 @@
 import os, json, base64
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
-def _get_key() -> bytes:
-    key_b64 = getattr(settings, "ENCRYPTION_KEY_B64", "")
-    if not key_b64:
-        raise RuntimeError("ENCRYPTION_KEY_B64 not set")
+KEY_SETTINGS = ("ENCRYPTION_KEY_B64", "ENCRYPTION_KEYS_B64", "ENCRYPTION_KEY_ID")
+
+
+class KeyRing:
+    """
+    kid -> AESGCM. Yeni payload'lar current anahtarla şifrelenir; eski
+    anahtarlar rotasyon boyunca çözmek için halkada kalır.
+    """
+
+    def __init__(self, ciphers, current):
+        self.ciphers = ciphers
+        self.current = current
+
+    def cipher(self, kid=None):
+        kid = kid or self.current
+        try:
+            return self.ciphers[kid]
+        except KeyError:
+            raise RuntimeError(f"Unknown encryption key id {kid!r}")
+
+
+_keyring = None
+
+
+def _decode_key(kid, key_b64) -> bytes:
     key = base64.b64decode(key_b64)
     if len(key) != 32:
-        raise RuntimeError("ENCRYPTION_KEY_B64 must decode to 32 bytes")
+        raise RuntimeError(f"Encryption key {kid!r} must decode to 32 bytes")
     return key
 
+
+def is_configured() -> bool:
+    return bool(
+        getattr(settings, "ENCRYPTION_KEYS_B64", None)
+        or getattr(settings, "ENCRYPTION_KEY_B64", "")
+    )
+
+
+def load_keyring() -> KeyRing:
+    keys = dict(getattr(settings, "ENCRYPTION_KEYS_B64", None) or {})
+    current = getattr(settings, "ENCRYPTION_KEY_ID", "") or ""
+    legacy = getattr(settings, "ENCRYPTION_KEY_B64", "")
+    if not keys and legacy:
+        keys = {current or "1": legacy}
+    if not keys:
+        raise RuntimeError("ENCRYPTION_KEY_B64 not set")
+
+    current = current or next(iter(keys))
+    if current not in keys:
+        raise RuntimeError(f"ENCRYPTION_KEY_ID {current!r} is not in the key ring")
+    ciphers = {kid: AESGCM(_decode_key(kid, key_b64)) for kid, key_b64 in keys.items()}
+    return KeyRing(ciphers, current)
+
+
+def get_keyring() -> KeyRing:
+    """Anahtarlar process başına bir kez çözülür ve doğrulanır."""
+    global _keyring
+    if _keyring is None:
+        _keyring = load_keyring()
+    return _keyring
+
+
+@receiver(setting_changed)
+def reset_keyring(setting, **kwargs):
+    global _keyring
+    if setting in KEY_SETTINGS:
+        _keyring = None
+
+
 def encrypt_json(payload: dict) -> dict:
+    ring = get_keyring()
     iv = os.urandom(12)
     plaintext = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    aesgcm = AESGCM(_get_key())
-    ct = aesgcm.encrypt(iv, plaintext, None)
+    ct = ring.cipher().encrypt(iv, plaintext, None)
     return {
         "encrypted": True,
         "payload": {
+            "kid": ring.current,
             "iv": base64.b64encode(iv).decode(),
             "data": base64.b64encode(ct).decode(),
         }
     }
+
+
+def decrypt_json(payload: dict) -> dict:
+    cipher = get_keyring().cipher(payload.get("kid"))
+    iv = base64.b64decode(payload["iv"])
+    plaintext = cipher.decrypt(iv, base64.b64decode(payload["data"]), None)
+    return json.loads(plaintext.decode("utf-8"))
@@ -0,0 +1,40 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+# Event loop başına bir semaphore (uvicorn worker'ında tek loop vardır)
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(getattr(settings, "ASYNC_DB_MAX_CONNECTIONS", 10))
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def _release_connection():
+    # ASGI'de her istek kendi thread'inde kendi bağlantısını açar; slot
+    # bırakılırken kapatılmazsa açık bağlantı sayısı thread sayısını izler
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+@asynccontextmanager
+async def db_slot():
+    """
+    Async view'ların DB işini sınırlar: aynı anda en fazla
+    ASYNC_DB_MAX_CONNECTIONS istek bağlantı tutar, diğerleri event loop'ta
+    (thread harcamadan) sıra bekler.
+    """
+    async with _semaphore():
+        try:
+            yield
+        finally:
+            await sync_to_async(_release_connection)()
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import jobs
+from .bulk import purge_comments, purge_tasks
+from .models import ArchivedTask, ArchivedTaskComment, Task, TaskComment
+
+PURGE_USER_JOB = "accounts.purge_user"
+
+
+def schedule_account_deletion(user):
+    """
+    Kullanıcı hemen pasifleşir (giriş yapamaz, oturumları geçersizleşir);
+    task ve yorumları arka planda purge_user job'u ile silinir.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        jobs.enqueue(PURGE_USER_JOB, user_id=user.id)
+
+
+def _batches(queryset, batch_size):
+    # Her batch kendi transaction'ında: kilitler kısa sürer, yarıda kalan iş tekrar denenebilir
+    while True:
+        batch = list(queryset[:batch_size])
+        if not batch:
+            return
+        yield batch
+
+
+@jobs.job(PURGE_USER_JOB)
+def purge_user(user_id):
+    """
+    User.delete()'in cascade'ini (task'lar, task'ların yorumları, kullanıcının
+    başka task'lara yazdığı yorumlar ve bunların arşivdeki karşılıkları)
+    batch batch raw DELETE ile yapar;
+    en sonda kalan küçük ilişkilerle birlikte kullanıcı satırı silinir.
+    """
+    if not User.objects.filter(id=user_id, is_active=False).exists():
+        # Silinmiş ya da bu arada tekrar aktifleştirilmiş
+        return
+
+    batch_size = getattr(settings, "ACCOUNT_PURGE_BATCH_SIZE", 500)
+    tasks = Task.objects.filter(owner_id=user_id).only("id", "owner_id", "state").order_by("id")
+    for batch in _batches(tasks, batch_size):
+        purge_tasks(batch)
+
+    comments = (
+        TaskComment.objects.filter(author_id=user_id)
+        .values_list("id", "task_id", "task__owner_id")
+        .order_by("id")
+    )
+    for batch in _batches(comments, batch_size):
+        purge_comments(batch)
+
+    # Arşiv tabloları: cache/event yok, raw DELETE yeterli
+    archived = ArchivedTask.objects.filter(owner_id=user_id).values_list("id", flat=True).order_by("id")
+    for batch in _batches(archived, batch_size):
+        with transaction.atomic():
+            ArchivedTaskComment.objects.filter(task_id__in=batch)._raw_delete(ArchivedTaskComment.objects.db)
+            ArchivedTask.objects.filter(id__in=batch)._raw_delete(ArchivedTask.objects.db)
+    archived_comments = (
+        ArchivedTaskComment.objects.filter(author_id=user_id).values_list("id", flat=True).order_by("id")
+    )
+    for batch in _batches(archived_comments, batch_size):
+        ArchivedTaskComment.objects.filter(id__in=batch)._raw_delete(ArchivedTaskComment.objects.db)
+
+    User.objects.filter(id=user_id, is_active=False).delete()
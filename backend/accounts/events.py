@@ -0,0 +1,93 @@
+import json
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .broker import get_broker
+
+ALL_TASKS_CHANNEL = "board.all"
+
+
+def board_channel(user_id):
+    return f"board.user.{user_id}"
+
+
+def task_channel(task_id):
+    return f"task.{task_id}"
+
+
+def diff(before, after):
+    """İki serializer çıktısı arasında değişen alanlar."""
+    return {key: value for key, value in after.items() if before.get(key) != value}
+
+
+def publish(channels, event):
+    """
+    Event transaction commit olduktan sonra yayınlanır; rollback olursa gitmez.
+    Aynı event birden çok kanala gider; WebSocketConsumer tekrarları "eid" ile ayıklar.
+    """
+    event = {"eid": uuid.uuid4().hex, **event}
+    message = json.dumps(event, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, message)
+
+    transaction.on_commit(send)
+
+
+def _task_channels(task_id, *owner_ids):
+    channels = [ALL_TASKS_CHANNEL, task_channel(task_id)]
+    channels.extend(board_channel(owner_id) for owner_id in set(owner_ids))
+    return channels
+
+
+def task_created(data):
+    publish(
+        _task_channels(data["id"], data["owner"]),
+        {"type": "task.created", "id": data["id"], "data": data},
+    )
+
+
+def task_updated(before, after):
+    changes = diff(before, after)
+    if not changes:
+        return
+    # Task başka kullanıcıya verildiyse eski sahibinin board'u da haberdar olur
+    publish(
+        _task_channels(after["id"], before["owner"], after["owner"]),
+        {"type": "task.updated", "id": after["id"], "changes": changes},
+    )
+
+
+def task_deleted(task_id, owner_id):
+    publish(
+        _task_channels(task_id, owner_id),
+        {"type": "task.deleted", "id": task_id},
+    )
+
+
+def comment_created(data):
+    publish(
+        [task_channel(data["task"])],
+        {"type": "comment.created", "id": data["id"], "task": data["task"], "data": data},
+    )
+
+
+def comment_updated(before, after):
+    changes = diff(before, after)
+    if not changes:
+        return
+    publish(
+        [task_channel(after["task"])],
+        {"type": "comment.updated", "id": after["id"], "task": after["task"], "changes": changes},
+    )
+
+
+def comment_deleted(comment_id, task_id):
+    publish(
+        [task_channel(task_id)],
+        {"type": "comment.deleted", "id": comment_id, "task": task_id},
+    )
@@ -0,0 +1,174 @@
+import csv
+import json
+
+from django.conf import settings
+
+from .models import TaskComment, TaskCommentWithArchived, TaskWithArchived
+
+TASK_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "state",
+    "owner_id",
+    "owner__username",
+    "created_at",
+    "updated_at",
+)
+COMMENT_COLUMNS = ("id", "task_id", "author_id", "author__username", "content", "created_at")
+
+CSV_HEADER = [
+    "task_id",
+    "title",
+    "description",
+    "state",
+    "owner_id",
+    "owner_username",
+    "task_created_at",
+    "task_updated_at",
+    "comment_id",
+    "comment_author_id",
+    "comment_author_username",
+    "comment_content",
+    "comment_created_at",
+]
+
+
+def _comments(tasks):
+    # ?include_archived=1: task'lar view'dan geliyorsa yorumlar da
+    comment_model = TaskCommentWithArchived if tasks.model is TaskWithArchived else TaskComment
+    return (
+        comment_model.objects.filter(task_id__in=tasks.values("id"))
+        .order_by("task_id", "created_at", "id")
+        .values(*COMMENT_COLUMNS)
+    )
+
+
+def iter_task_threads(tasks):
+    """
+    (task, [yorumlar]) çiftlerini sabit bellekle üretir.
+    Task'lar id, yorumlar task_id sırasıyla iki server-side cursor'dan okunur
+    ve merge-join ile eşleştirilir; task başına ayrı sorgu atılmaz.
+    """
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    comments = _comments(tasks).iterator(chunk_size=chunk_size)
+    pending = next(comments, None)
+
+    for task in tasks.order_by("id").values(*TASK_COLUMNS).iterator(chunk_size=chunk_size):
+        thread = []
+        while pending is not None and pending["task_id"] <= task["id"]:
+            if pending["task_id"] == task["id"]:
+                thread.append(pending)
+            pending = next(comments, None)
+        yield task, thread
+
+
+async def aiter_task_threads(tasks):
+    """iter_task_threads'in ASGI sürümü: aynı merge-join, aiterator ile."""
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    comments = _comments(tasks).aiterator(chunk_size=chunk_size)
+    pending = await anext(comments, None)
+
+    async for task in tasks.order_by("id").values(*TASK_COLUMNS).aiterator(chunk_size=chunk_size):
+        thread = []
+        while pending is not None and pending["task_id"] <= task["id"]:
+            if pending["task_id"] == task["id"]:
+                thread.append(pending)
+            pending = await anext(comments, None)
+        yield task, thread
+
+
+class _Echo:
+    """csv.writer'ın yazdığı satırı geri döndüren sahte dosya."""
+
+    def write(self, value):
+        return value
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else ""
+
+
+def _csv_rows(writer, task, thread):
+    task_cells = [
+        task["id"],
+        task["title"],
+        task["description"] or "",
+        task["state"],
+        task["owner_id"],
+        task["owner__username"],
+        _iso(task["created_at"]),
+        _iso(task["updated_at"]),
+    ]
+    if not thread:
+        return [writer.writerow(task_cells + [""] * 5)]
+    return [
+        writer.writerow(
+            task_cells
+            + [
+                comment["id"],
+                comment["author_id"],
+                comment["author__username"],
+                comment["content"],
+                _iso(comment["created_at"]),
+            ]
+        )
+        for comment in thread
+    ]
+
+
+def _ndjson_line(task, thread):
+    record = {
+        "id": task["id"],
+        "title": task["title"],
+        "description": task["description"],
+        "state": task["state"],
+        "owner": task["owner_id"],
+        "owner_username": task["owner__username"],
+        "created_at": _iso(task["created_at"]),
+        "updated_at": _iso(task["updated_at"]),
+        "comments": [
+            {
+                "id": comment["id"],
+                "author": comment["author_id"],
+                "author_username": comment["author__username"],
+                "content": comment["content"],
+                "created_at": _iso(comment["created_at"]),
+            }
+            for comment in thread
+        ],
+    }
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def stream_csv(tasks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for task, thread in iter_task_threads(tasks):
+        yield from _csv_rows(writer, task, thread)
+
+
+async def astream_csv(tasks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    async for task, thread in aiter_task_threads(tasks):
+        for row in _csv_rows(writer, task, thread):
+            yield row
+
+
+def stream_ndjson(tasks):
+    for task, thread in iter_task_threads(tasks):
+        yield _ndjson_line(task, thread)
+
+
+async def astream_ndjson(tasks):
+    async for task, thread in aiter_task_threads(tasks):
+        yield _ndjson_line(task, thread)
+
+
+# Biçim -> (WSGI generator'ı, ASGI async generator'ı, content type).
+# ASGI'de sync generator Django tarafından tamamen belleğe okunup öyle gönderilir.
+EXPORT_FORMATS = {
+    "csv": (stream_csv, astream_csv, "text/csv; charset=utf-8"),
+    "ndjson": (stream_ndjson, astream_ndjson, "application/x-ndjson"),
+}
@@ -0,0 +1,119 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Task
+
+# 64 bit'i aşan id'ler veritabanı sürücüsünde OverflowError verir
+MAX_ID = 2**63 - 1
+
+TASK_ORDERING_FIELDS = ("id", "created_at", "updated_at", "title", "state")
+
+# Serializer alanı -> .only() ile yüklenecek kolonlar
+TASK_FIELD_COLUMNS = {
+    "id": ("id",),
+    "title": ("title",),
+    "description": ("description",),
+    "state": ("state",),
+    "owner": ("owner",),
+    "owner_username": ("owner__username",),
+    "version": ("updated_at",),
+}
+
+
+def parse_list_param(params, name):
+    """?state=TODO&state=DONE ve ?state=TODO,DONE biçimlerinin ikisini de kabul eder."""
+    values = []
+    for raw in params.getlist(name):
+        values.extend(v.strip() for v in raw.split(",") if v.strip())
+    return values
+
+
+def filter_tasks(queryset, params):
+    """
+    GET /api/tasks/ filtreleri:
+    ?state=  ?owner=  ?updated_since=  ?created_after=  ?created_before=  ?search=
+    """
+    states = parse_list_param(params, "state")
+    if states:
+        valid = {value for value, _ in Task.STATUS_CHOICES}
+        unknown = sorted(set(states) - valid)
+        if unknown:
+            raise ValidationError({"state": f"Unknown state(s): {', '.join(unknown)}"})
+        queryset = queryset.filter(state__in=states)
+
+    owner = (params.get("owner") or "").strip()
+    if owner:
+        # isdigit() "²" gibi int()'in kabul etmediği rakamları da geçirir
+        try:
+            owner_id = int(owner)
+        except ValueError:
+            owner_id = 0
+        if not 0 < owner_id <= MAX_ID:
+            raise ValidationError({"owner": "Owner must be a user id."})
+        queryset = queryset.filter(owner_id=owner_id)
+
+    for param, lookup in [
+        ("updated_since", "updated_at__gte"),
+        ("created_after", "created_at__gte"),
+        ("created_before", "created_at__lt"),
+    ]:
+        raw = (params.get(param) or "").strip()
+        if raw:
+            try:
+                value = parse_datetime(raw)
+            except ValueError:
+                # Biçimi doğru ama geçersiz tarih (ör. 2024-13-40T00:00)
+                value = None
+            if value is None:
+                raise ValidationError({param: "Expected an ISO 8601 datetime."})
+            queryset = queryset.filter(**{lookup: value})
+
+    search = (params.get("search") or "").strip()
+    if search:
+        queryset = queryset.filter(
+            Q(title__icontains=search) | Q(description__icontains=search)
+        )
+
+    return queryset
+
+
+def get_task_ordering(params):
+    """
+    ?ordering=-updated_at -> ("-updated_at", "-id")
+    Cursor sayfalamanın satırları tekil sıralayabilmesi için id her zaman eklenir.
+    """
+    raw = (params.get("ordering") or "id").strip()
+    name = raw.lstrip("-")
+    if name not in TASK_ORDERING_FIELDS:
+        raise ValidationError(
+            {"ordering": f"Ordering must be one of: {', '.join(TASK_ORDERING_FIELDS)}"}
+        )
+    if name == "id":
+        return (raw,)
+    prefix = "-" if raw.startswith("-") else ""
+    return (prefix + name, prefix + "id")
+
+
+def get_requested_fields(params):
+    """?fields=id,title,state -> ["id", "title", "state"]; parametre yoksa None."""
+    fields = parse_list_param(params, "fields")
+    if not fields:
+        return None
+    unknown = sorted(set(fields) - set(TASK_FIELD_COLUMNS))
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}"})
+    return fields
+
+
+def project_tasks(queryset, fields, ordering=("id",)):
+    """
+    İstenen serializer alanları ve sıralama kolonları dışındaki kolonları SELECT etmez.
+    owner_id, IsStaffOrOwner kontrolü ek sorgu yapmasın diye her zaman yüklenir.
+    """
+    columns = {"id", "owner"} | {name.lstrip("-") for name in ordering}
+    for field in fields:
+        columns.update(TASK_FIELD_COLUMNS[field])
+    if "owner_username" not in fields:
+        queryset = queryset.select_related(None)
+    return queryset.only(*columns)
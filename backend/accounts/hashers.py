@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Django'nun argon2 hasher'ı, maliyet parametreleri settings'ten
+    (varsayılanları yalnız backend_project/settings.py'de).
+    Algoritma adı aynı; parametre değişince must_update sayesinde kullanıcı
+    bir sonraki başarılı girişte yeni maliyetle yeniden hash'lenir.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Django'nun scrypt hasher'ı (ek bağımlılık yok), work factor settings'ten."""
+
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def maxmem(self):
+        # scrypt 128 * r * N bayt ister; OpenSSL'in varsayılan 32 MiB sınırı 2**15'te yetmez
+        return 256 * self.block_size * self.work_factor
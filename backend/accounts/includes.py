@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+
+from .filters import parse_list_param
+from .models import TaskComment
+
+TASK_INCLUDES = ("comment_stats", "latest_comments")
+
+
+def get_requested_includes(params):
+    """?include=comment_stats,latest_comments"""
+    includes = parse_list_param(params, "include")
+    unknown = sorted(set(includes) - set(TASK_INCLUDES))
+    if unknown:
+        raise ValidationError({"include": f"Unknown include(s): {', '.join(unknown)}"})
+    return tuple(includes)
+
+
+def get_latest_comments_limit(params):
+    default = getattr(settings, "TASK_LATEST_COMMENTS", 3)
+    raw = (params.get("latest_comments") or "").strip()
+    if not raw:
+        return default
+    # isdigit() "²" gibi int()'in kabul etmediği rakamları da geçirir
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= 20:
+        raise ValidationError({"latest_comments": "Must be between 1 and 20."})
+    return limit
+
+
+def latest_comments_queryset(limit, model=TaskComment):
+    """
+    Task başına son `limit` yorum, tek sorguda:
+    ROW_NUMBER() OVER (PARTITION BY task_id ORDER BY created_at DESC, id DESC) <= limit
+    """
+    return (
+        model.objects.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F("task_id"),
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(row_number__lte=limit)
+        .order_by("task_id", "-created_at", "-id")
+    )
+
+
+def comment_counts(task_ids, model=TaskComment):
+    """
+    {task_id: yorum sayısı}; sayfadaki task'lar için tek GROUP BY sorgusu.
+    model: TaskComment ya da ?include_archived=1 için TaskCommentWithArchived.
+    """
+    return dict(
+        model.objects.filter(task_id__in=task_ids)
+        .values_list("task_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
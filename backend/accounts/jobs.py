@@ -0,0 +1,145 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import F, Q
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# job adı -> fonksiyon; @job ile kaydedilir, AccountsConfig.ready modülleri yükler
+JOB_HANDLERS = {}
+
+
+def job(name):
+    """
+    Fonksiyonu arka plan job'u olarak kaydeder. Payload JSON'a yazıldığından
+    argümanlar sadece JSON tipleri olmalı. Job tekrar denenebilir ya da süresi
+    dolan kilit sonrası başka worker'da yeniden çalışabilir; idempotent yazılmalı.
+    """
+
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return JOB_HANDLERS[name]
+    except KeyError:
+        raise LookupError(f"Unknown job: {name}") from None
+
+
+class ImmediateQueue:
+    """
+    Job'u çağıran transaction commit olunca aynı process'te çalıştırır.
+    Testler ve worker'sız geliştirme ortamı için; hata çağırana yükselir.
+    """
+
+    def __init__(self, **options):
+        pass
+
+    def enqueue(self, name, payload):
+        handler = get_handler(name)
+        transaction.on_commit(lambda: handler(**payload))
+
+
+class DatabaseQueue:
+    """
+    Job'lar accounts_job tablosuna çağıranla aynı transaction'da yazılır;
+    rollback olursa job da kaybolur. run_jobs komutu (bir ya da daha fazla
+    process) kuyruğu boşaltır.
+    """
+
+    def __init__(self, lease_seconds=300, max_attempts=5, retry_delay=30, keep_finished=False, **options):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.keep_finished = keep_finished
+
+    def enqueue(self, name, payload):
+        get_handler(name)
+        return Job.objects.create(name=name, payload=payload, max_attempts=self.max_attempts)
+
+    def claim(self, worker_id, limit=1):
+        """
+        Sıradaki job'ları kilitler. Kilidi lease_seconds'tan eski RUNNING job'lar
+        (çöken worker) yeniden alınır.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=self.lease_seconds)
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Job.QUEUED, run_after__lte=now)
+                    | Q(status=Job.RUNNING, locked_at__lt=stale)
+                )
+                .order_by("run_after", "id")[:limit]
+            )
+            Job.objects.filter(id__in=[j.id for j in jobs]).update(
+                status=Job.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+            )
+        for claimed in jobs:
+            claimed.status, claimed.locked_by, claimed.locked_at = Job.RUNNING, worker_id, now
+            claimed.attempts += 1
+        return jobs
+
+    def run(self, claimed):
+        """Job'u çalıştırır; başarısızsa üstel beklemeyle tekrar sıraya koyar. Dönen değer: başarılı mı."""
+        # Başka worker kilidi devraldıysa sonucu o yazar
+        current = Job.objects.filter(id=claimed.id, locked_by=claimed.locked_by, status=Job.RUNNING)
+        try:
+            get_handler(claimed.name)(**claimed.payload)
+        except Exception:
+            logger.exception("Job %s #%s failed", claimed.name, claimed.id)
+            now = timezone.now()
+            if claimed.attempts >= claimed.max_attempts:
+                changes = {"status": Job.FAILED, "finished_at": now}
+            else:
+                delay = self.retry_delay * 2 ** (claimed.attempts - 1)
+                changes = {"status": Job.QUEUED, "run_after": now + timedelta(seconds=delay)}
+            current.update(last_error=traceback.format_exc(), locked_by="", locked_at=None, **changes)
+            return False
+
+        if self.keep_finished:
+            current.update(status=Job.DONE, finished_at=timezone.now(), locked_by="", locked_at=None)
+        else:
+            current.delete()
+        return True
+
+
+_queue = None
+
+
+def get_queue():
+    """settings.JOBS_QUEUE ile seçilen kuyruğun process başına tek örneği."""
+    global _queue
+    if _queue is None:
+        config = getattr(settings, "JOBS_QUEUE", {})
+        backend = config.get("BACKEND", "accounts.jobs.DatabaseQueue")
+        _queue = import_string(backend)(**config.get("OPTIONS", {}))
+    return _queue
+
+
+@receiver(setting_changed)
+def reset_queue(setting, **kwargs):
+    global _queue
+    if setting == "JOBS_QUEUE":
+        _queue = None
+
+
+def enqueue(name, **payload):
+    return get_queue().enqueue(name, payload)
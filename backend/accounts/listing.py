@@ -0,0 +1,63 @@
+"""
+GET /api/tasks/ ve GET /api/tasks/<id>/comments/ listelerinin tek uygulaması.
+
+HTTP'de bu uçlar async view'lardan (accounts.async_views) sunulur; sync
+ViewSet'ler (explain_querysets, browsable API) aynı sorgu, cache scope'u ve
+satır kurma yolunu buradan kullanır, iki kopya birbirinden ayrışmaz.
+"""
+
+from . import cache
+from .archive import comment_model, task_model
+from .compact import comment_values, task_rows, task_values
+from .filters import filter_tasks, get_requested_fields, get_task_ordering
+from .includes import get_latest_comments_limit, get_requested_includes
+
+
+def sees_all_tasks(user, params):
+    return user.is_staff or params.get("all") == "1"
+
+
+class TaskListQuery:
+    """
+    GET /api/tasks/ parametrelerinin çözülmüş hali.
+    Parametre hataları (ValidationError) oluştururken yükselir; cache'e bakılmadan 400 döner.
+    """
+
+    def __init__(self, user, params):
+        self.user = user
+        self.params = params
+        self.sees_all = sees_all_tasks(user, params)
+        self.includes = get_requested_includes(params)
+        self.fields = get_requested_fields(params)
+        self.ordering = get_task_ordering(params)
+        self.latest_comments = None
+        if "latest_comments" in self.includes:
+            self.latest_comments = get_latest_comments_limit(params)
+
+    @property
+    def scopes(self):
+        """Cevabın bağlı olduğu cache scope'ları (bkz. accounts.cache.cached_list)."""
+        scope = cache.ALL_SCOPE if self.sees_all else cache.user_scope(self.user.id)
+        if self.includes:
+            return [scope, cache.comments_scope(scope)]
+        return [scope]
+
+    def queryset(self):
+        """Sayfalanacak .values() sorgusu; pagination self.ordering ile keyset kurar."""
+        qs = task_model(self.params).objects.all()
+        if not self.sees_all:
+            qs = qs.filter(owner=self.user)
+        qs = filter_tasks(qs, self.params).order_by(*self.ordering)
+        return task_values(qs, self.fields, self.ordering)
+
+    def rows(self, page):
+        """Sayfanın cevap dict'leri; include varsa ek sorgu yapar (async'te thread'de çağrılır)."""
+        return task_rows(
+            page, self.fields, self.includes, self.latest_comments, comment_model(self.params)
+        )
+
+
+def comment_list_queryset(task_id, params):
+    """?cursor= / ?include_archived=1 sayfalarının sorgusu; diğerleri thread cache'inden."""
+    qs = comment_model(params).objects.filter(task_id=task_id).order_by("created_at", "id")
+    return comment_values(qs)
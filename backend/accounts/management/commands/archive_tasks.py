@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from accounts.archive import archivable, archive_cutoff, archive_done_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "TASK_ARCHIVE_AFTER_DAYS'ten (ya da --days) uzun süredir DONE olan task'ları "
+        "yorumlarıyla birlikte arşiv tablolarına taşır. Süre DONE'a geçiş anından (done_at) "
+        "sayılır; sonradan yapılan düzenlemeler süreyi uzatmaz. Cron ile periyodik çalıştırılabilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Varsayılan: TASK_ARCHIVE_AFTER_DAYS")
+        parser.add_argument("--batch-size", type=int, help="Varsayılan: TASK_ARCHIVE_BATCH_SIZE")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Sadece arşivlenecek task sayısını yaz.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archivable(archive_cutoff(options["days"])).count()
+            self.stdout.write(self.style.SUCCESS(f"Would archive {count} task(s)."))
+            return
+
+        tasks, comments = archive_done_tasks(options["days"], options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {tasks} task(s) and {comments} comment(s).")
+        )
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from accounts.provisioning import REGISTER_FORMATS, batched, read_rows, register_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV (username,email,password başlıklı) ya da NDJSON dosyasından toplu "
+        "kullanıcı oluşturur. Dosya batch batch okunur; parolalar tüm çekirdeklerde hash'lenir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Dosya yolu; '-' ise stdin.")
+        parser.add_argument("--format", choices=REGISTER_FORMATS, help="Varsayılan: dosya uzantısı.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Parola hash'leyen process sayısı (1: process havuzu kullanılmaz).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Sadece doğrula ve tekillik kontrolü yap, kaydetme.",
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or self._format_from_path(options["path"])
+
+        with ExitStack() as stack:
+            if options["path"] == "-":
+                stream = sys.stdin
+            else:
+                try:
+                    stream = stack.enter_context(
+                        open(options["path"], newline="", encoding="utf-8")
+                    )
+                except OSError as exc:
+                    raise CommandError(str(exc))
+
+            hash_passwords = None
+            if options["workers"] > 1 and not options["dry_run"]:
+                # Fork'tan önce açık DB bağlantıları kapatılır, çocuk process'ler DB kullanmaz
+                connections.close_all()
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=options["workers"]))
+                chunksize = max(1, options["batch_size"] // (options["workers"] * 4))
+
+                def hash_passwords(passwords):
+                    return pool.map(make_password, passwords, chunksize=chunksize)
+
+            created = invalid = 0
+            rows = read_rows(stream, fmt)
+            for batch in batched(rows, options["batch_size"]):
+                count, errors = register_batch(batch, hash_passwords, options["dry_run"])
+                created += count
+                invalid += len(errors)
+                for line_no, error in sorted(errors, key=lambda e: e[0] or 0):
+                    self.stderr.write(f"line {line_no}: {json.dumps(error, ensure_ascii=False)}")
+
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {created} user(s); {invalid} row(s) rejected.")
+        )
+
+    @staticmethod
+    def _format_from_path(path):
+        suffix = Path(path).suffix.lower().lstrip(".")
+        if suffix in ("ndjson", "jsonl"):
+            return "ndjson"
+        if suffix == "csv":
+            return "csv"
+        raise CommandError("Cannot infer format from the file name; pass --format.")
@@ -0,0 +1,124 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import Task
+from accounts.threads import thread_queryset
+from accounts.views import TaskCommentViewSet, TaskViewSet, UserViewSet
+
+# Plandaki rows= filtreden sonraki tahmini çıktıdır; taranan tablonun boyutu
+# pg_class.reltuples'tan okunur (bkz. _table_rows)
+PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Liste uçlarının çalıştırdığı sorgulara (.values() hızlı yolu, yorum "
+        "thread'i dahil) EXPLAIN çalıştırır; eşikten büyük bir tabloda "
+        "sequential scan bulursa hata verir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-seq-rows",
+            type=int,
+            default=10000,
+            help="Bu satır sayısından büyük tablolarda seq scan hata sayılır.",
+        )
+        parser.add_argument(
+            "--user",
+            help="Sorguları bu kullanıcı adına üret (varsayılan: ilk normal kullanıcı).",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            raise CommandError(f"EXPLAIN parsing is not supported for {connection.vendor}")
+
+        user = self._get_user(options["user"])
+        staff = User.objects.filter(is_staff=True).order_by("id").first() or user
+        task = Task.objects.filter(owner=user).order_by("id").first()
+        task_id = task.id if task else 0
+
+        cases = [
+            ("tasks-list", TaskViewSet, user, {}, {}),
+            ("tasks-list (all)", TaskViewSet, staff, {"all": "1"}, {}),
+            ("tasks-list (ordering)", TaskViewSet, staff, {"all": "1", "ordering": "-updated_at"}, {}),
+            ("task-comments (cursor)", TaskCommentViewSet, user, {}, {"task_id": task_id}),
+            ("users-list", UserViewSet, staff, {}, {}),
+            ("users-list (q)", UserViewSet, staff, {"q": "a"}, {}),
+        ]
+        querysets = [
+            (label, self._list_queryset(viewset_class, request_user, params, kwargs))
+            for label, viewset_class, request_user, params, kwargs in cases
+        ]
+        # İlk sayfa ve ?after= sayfaları thread cache'inden; cache boşsa bu sorgu çalışır
+        querysets.append(("task-comments (thread rebuild)", thread_queryset(task_id)))
+
+        failures = []
+        for label, queryset in querysets:
+            plan = queryset.explain()
+            self.stdout.write(f"== {label}\n{plan}\n")
+            for table, rows in self._seq_scans(plan):
+                if rows > options["max_seq_rows"]:
+                    failures.append(f"{label}: sequential scan on {table} (~{rows} rows)")
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("No sequential scans over the threshold."))
+
+    def _get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User {username!r} does not exist")
+        user = User.objects.filter(is_staff=False).order_by("id").first()
+        if user is None:
+            raise CommandError("No users found; seed some data first")
+        return user
+
+    def _list_queryset(self, viewset_class, user, params, kwargs):
+        request = Request(APIRequestFactory().get("/", params))
+        request.user = user
+
+        view = viewset_class()
+        view.action = "list"
+        view.request = request
+        view.kwargs = kwargs
+        view.format_kwarg = None
+
+        # Task ve yorum listeleri .values() sorgusunu çalıştırır (bkz. list_queryset)
+        list_queryset = getattr(view, "list_queryset", view.get_queryset)
+        queryset = list_queryset()
+        if view.pagination_class is None:
+            return queryset
+
+        # Liste isteği sayfalayıcıdan geçtiği haliyle ölçülür (ORDER BY + LIMIT)
+        paginator = view.pagination_class()
+        queryset, _ = paginator.prepare(queryset, request, view)
+        return queryset[: paginator.page_size + 1]
+
+    def _seq_scans(self, plan):
+        pattern = PG_SEQ_SCAN if connection.vendor == "postgresql" else SQLITE_SCAN
+        for table in dict.fromkeys(match.group(1) for match in pattern.finditer(plan)):
+            yield table, self._table_rows(table)
+
+    def _table_rows(self, table):
+        """Taranan tablonun satır sayısı: Postgres'te istatistikten, yoksa COUNT(*)."""
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                    [connection.ops.quote_name(table)],
+                )
+                row = cursor.fetchone()
+                # -1: tablo henüz ANALYZE edilmemiş
+                if row is not None and row[0] >= 0:
+                    return row[0]
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.sync import prune_deletions
+
+
+class Command(BaseCommand):
+    help = "TASK_SYNC_RETENTION_DAYS'ten eski task tombstone'larını siler."
+
+    def handle(self, *args, **options):
+        deleted = prune_deletions()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} task deletion record(s)."))
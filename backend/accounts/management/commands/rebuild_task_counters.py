@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.counters import rebuild
+
+
+class Command(BaseCommand):
+    help = "TaskCounter tablosunu sıcak ve arşiv task tablolarından yeniden hesaplar."
+
+    def handle(self, *args, **options):
+        written = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} task counter row(s)."))
@@ -0,0 +1,55 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from accounts.jobs import DatabaseQueue, get_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "accounts_job kuyruğundaki job'ları çalıştırır. Birden fazla process "
+        "aynı anda çalışabilir; job'lar SKIP LOCKED ile paylaşılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Kuyruk boşalınca çık (cron / tek seferlik çalıştırma için).",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Kuyruk boşken bekleme (sn).")
+        parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}")
+
+    def handle(self, *args, **options):
+        queue = get_queue()
+        if not isinstance(queue, DatabaseQueue):
+            raise CommandError("JOBS_QUEUE is not a database queue; nothing to run.")
+
+        # SIGTERM/SIGINT: elindeki job bitince çık
+        self.stopping = False
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+
+        done = failed = 0
+        while not self.stopping:
+            close_old_connections()
+            jobs = queue.claim(options["worker_id"])
+            if not jobs:
+                if options["burst"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+            for job in jobs:
+                if queue.run(job):
+                    done += 1
+                else:
+                    failed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {done} job(s); {failed} failed."))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,195 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# İsteğin ölçüm kaydı; middleware set eder, serializer'lar süre ekler
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class Registry:
+    """
+    Process içi, route + method etiketli histogramlar.
+    Her worker kendi sayılarını tutar; Prometheus her worker'ı ayrı hedef olarak toplar.
+    """
+
+    METRICS = {
+        "http_request_duration_seconds": ("wall", SECONDS_BUCKETS),
+        "http_request_db_seconds": ("db_time", SECONDS_BUCKETS),
+        "http_request_serializer_seconds": ("serializer_time", SECONDS_BUCKETS),
+        "http_request_db_queries": ("queries", QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self.budget_exceeded = {}
+
+    def observe(self, route, method, sample):
+        labels = (route, method)
+        with self._lock:
+            for name, (attr, buckets) in self.METRICS.items():
+                key = (name, labels)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(buckets)
+                self._histograms[key].observe(getattr(sample, attr))
+
+    def record_budget_exceeded(self, route, method):
+        with self._lock:
+            labels = (route, method)
+            self.budget_exceeded[labels] = self.budget_exceeded.get(labels, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.budget_exceeded.clear()
+
+    def render(self, extra_counters=(), extra_samples=()):
+        """
+        Prometheus text exposition format (0.0.4).
+        extra_samples: ada göre sıralı (ad, tip, etiketler, değer) dörtlüleri.
+        """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            budget_exceeded = sorted(self.budget_exceeded.items())
+
+        last_name = None
+        for (name, (route, method)), histogram in histograms:
+            if name != last_name:
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            labels = f'route="{_escape(route)}",method="{method}"'
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        lines.append("# TYPE http_request_query_budget_exceeded_total counter")
+        for (route, method), count in budget_exceeded:
+            labels = f'route="{_escape(route)}",method="{method}"'
+            lines.append(f"http_request_query_budget_exceeded_total{{{labels}}} {count}")
+
+        for name, value in extra_counters:
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+
+        last_name = None
+        for name, kind, labels, value in extra_samples:
+            if name != last_name:
+                lines.append(f"# TYPE {name} {kind}")
+                last_name = name
+            label_text = ",".join(f'{key}="{_escape(str(v))}"' for key, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+# psycopg_pool get_stats() anahtarlarından anlık değer olanlar; diğerleri birikimli sayaç
+POOL_GAUGES = ("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting")
+
+
+def pool_samples():
+    """
+    Havuzlu DB bağlantılarının doluluk ve bekleme metrikleri (process başına).
+    pool_available 0 ve requests_waiting > 0 ise havuz doymuştur;
+    requests_wait_ms_total / requests_queued_total ortalama bekleme süresini verir.
+    """
+    samples = []
+    for connection in connections.all():
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            continue
+        for key, value in pool.get_stats().items():
+            if key in POOL_GAUGES:
+                name, kind = f"db_pool_{key.removeprefix('pool_')}", "gauge"
+            else:
+                name, kind = f"db_pool_{key}_total", "counter"
+            samples.append((name, kind, {"alias": connection.alias}, value))
+    return sorted(samples, key=lambda sample: sample[0])
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.wall = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper kancası
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """
+    Her DB bağlantısına bir kez takılır (bkz. install_execute_wrapper).
+    Ölçüm ContextVar'dan okunur; async view'ların sorguları sync_to_async
+    thread'inde çalışsa da context kopyalandığı için aynı isteğe yazılır.
+    """
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    # connection_created yeniden bağlanmada da gelir; wrapper bir kez eklenir
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def serializer_timer():
+    metrics = current_request_metrics.get()
+    if metrics is None or metrics._serializer_depth:
+        # İç içe serializer'lar (liste -> öğe -> nested) bir kez sayılır
+        yield
+        return
+    metrics._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serializer_depth -= 1
+        metrics.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """to_representation süresini isteğin serializer_time'ına ekler."""
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
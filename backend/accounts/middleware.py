@@ -0,0 +1,76 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestMetrics, current_request_metrics, registry
+
+logger = logging.getLogger("accounts.metrics")
+
+
+class RequestMetricsMiddleware:
+    """
+    Her isteğin SQL sorgu sayısını, DB süresini, serializer süresini ve toplam
+    süresini çözülen route adına (tasks-list, task-comments, auth-me...) göre
+    histogramlara yazar. Sorgu sayısı bütçeyi aşarsa uyarı loglar; N+1
+    regresyonları böyle yakalanır.
+
+    Sync ve async zincirde çalışır; async view'lar ASGI altında thread'e düşmez.
+    Sorgular accounts.metrics.execute_wrapper üzerinden sayılır.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.wall = time.perf_counter() - start
+            current_request_metrics.reset(token)
+        self.record(request, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.wall = time.perf_counter() - start
+            current_request_metrics.reset(token)
+        self.record(request, metrics)
+        return response
+
+    def record(self, request, metrics):
+        match = getattr(request, "resolver_match", None)
+        route = match.url_name if match and match.url_name else "unresolved"
+        registry.observe(route, request.method, metrics)
+        self.check_budget(route, request, metrics)
+
+    def check_budget(self, route, request, metrics):
+        budgets = getattr(settings, "QUERY_COUNT_BUDGETS", {})
+        budget = budgets.get(route, getattr(settings, "QUERY_COUNT_BUDGET", 20))
+        if metrics.queries > budget:
+            registry.record_budget_exceeded(route, request.method)
+            logger.warning(
+                "Query budget exceeded on %s %s (%s): %d queries > %d, db %.1f ms",
+                request.method,
+                request.path,
+                route,
+                metrics.queries,
+                budget,
+                metrics.db_time * 1000,
+            )
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='state',
+            field=models.CharField(choices=[('TODO', 'Yapılacak'), ('IN_PROGRESS', 'Devam Ediyor'), ('BLOCKED', 'Engellendi'), ('DONE', 'Tamamlandı')], default='TODO', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='taskcomment',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+from accounts.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0002_sync_task_fields'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['owner', 'id'], name='task_owner_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['state', 'updated_at'], name='task_state_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='taskcomment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_search_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at'], name='taskdeletion_deleted_idx'), models.Index(fields=['owner_id', 'deleted_at'], name='taskdeletion_owner_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Task = apps.get_model("accounts", "Task")
+    TaskCounter = apps.get_model("accounts", "TaskCounter")
+    rows = Task.objects.values("owner_id", "state").annotate(count=Count("id")).order_by()
+    TaskCounter.objects.bulk_create(
+        TaskCounter(owner_id=row["owner_id"], state=row["state"], count=row["count"])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_taskdeletion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('TODO', 'Yapılacak'), ('IN_PROGRESS', 'Devam Ediyor'), ('BLOCKED', 'Engellendi'), ('DONE', 'Tamamlandı')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('owner', 'state'), name='taskcounter_owner_state_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
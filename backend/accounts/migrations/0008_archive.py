@@ -0,0 +1,98 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TASK_COLUMNS = "id, title, description, state, owner_id, created_at, updated_at"
+COMMENT_COLUMNS = "id, task_id, author_id, content, created_at"
+
+# ?include_archived=1 okumaları için sıcak + arşiv tablolarının birleşimi
+CREATE_VIEWS = [
+    f"""
+    CREATE VIEW accounts_task_with_archived AS
+    SELECT {TASK_COLUMNS} FROM accounts_task
+    UNION ALL
+    SELECT {TASK_COLUMNS} FROM accounts_archivedtask
+    """,
+    f"""
+    CREATE VIEW accounts_taskcomment_with_archived AS
+    SELECT {COMMENT_COLUMNS} FROM accounts_taskcomment
+    UNION ALL
+    SELECT {COMMENT_COLUMNS} FROM accounts_archivedtaskcomment
+    """,
+]
+DROP_VIEWS = [
+    "DROP VIEW IF EXISTS accounts_taskcomment_with_archived",
+    "DROP VIEW IF EXISTS accounts_task_with_archived",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCommentWithArchived',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'accounts_taskcomment_with_archived',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskWithArchived',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('state', models.CharField(choices=[('TODO', 'Yapılacak'), ('IN_PROGRESS', 'Devam Ediyor'), ('BLOCKED', 'Engellendi'), ('DONE', 'Tamamlandı')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'accounts_task_with_archived',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('state', models.CharField(choices=[('TODO', 'Yapılacak'), ('IN_PROGRESS', 'Devam Ediyor'), ('BLOCKED', 'Engellendi'), ('DONE', 'Tamamlandı')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskComment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='accounts.archivedtask')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['owner', 'id'], name='archivedtask_owner_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtaskcomment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='archivedcomment_task_idx'),
+        ),
+        migrations.RunSQL(CREATE_VIEWS, DROP_VIEWS),
+    ]
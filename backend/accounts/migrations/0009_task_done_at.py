@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+from accounts.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz; mevcut satırlar 0010'da doldurulur
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0008_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='done_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='done_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['state', 'done_at'], name='task_state_done_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import F
+
+BATCH_SIZE = 5000
+
+
+def backfill_done_at(apps, schema_editor):
+    # Geçiş anı bilinmiyor; mevcut DONE task'lar için en iyi tahmin updated_at.
+    # Her batch kendi transaction'ında: sıcak tablo uzun süre kilitlenmez.
+    for name in ("Task", "ArchivedTask"):
+        model = apps.get_model("accounts", name)
+        pending = model.objects.filter(state="DONE", done_at__isnull=True)
+        last_id = 0
+        while True:
+            batch = pending.filter(id__gt=last_id).order_by("id")[:BATCH_SIZE]
+            ids = list(batch.values_list("id", flat=True))
+            if not ids:
+                break
+            pending.filter(id__in=ids).update(done_at=F("updated_at"))
+            last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0009_task_done_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_done_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,21 @@
-from django.db import models
+from datetime import datetime, timedelta, timezone
+
+from django.db import models, transaction
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
+from django.utils import timezone as dj_timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def task_version(updated_at):
+    """ETag/If-Match için updated_at'in mikrosaniye değeri."""
+    return str((updated_at - EPOCH) // timedelta(microseconds=1))
+
+
+class TaskVersionConflict(Exception):
+    """Koşullu UPDATE hiçbir satırı değiştirmedi: task bu arada başkası tarafından güncellendi."""
+
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -22,6 +38,60 @@ class Task(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # DONE'a geçiş anı; arşivleme bunu kullanır (updated_at sonraki düzenlemelerle kayar)
+    done_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "id"], name="task_owner_id_idx"),
+            models.Index(fields=["state", "updated_at"], name="task_state_updated_idx"),
+            models.Index(fields=["state", "done_at"], name="task_state_done_idx"),
+        ]
+
+    # Verilirse save() sadece satırın updated_at'i hâlâ bu değerse yazar (If-Match)
+    expected_updated_at = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Sahibi değişen task'ta eski sahibin cache'i de düşürülebilsin
+        instance._loaded_owner_id = instance.__dict__.get("owner_id")
+        # TaskCounter güncellemesi için: (owner, state) değiştiyse eski anahtar azaltılır
+        instance._loaded_state = instance.__dict__.get("state")
+        return instance
+
+    def sync_done_at(self, now=None):
+        """DONE'a geçişte done_at'i işaretler, DONE'dan çıkışta temizler. Değiştiyse True."""
+        if self.state != "DONE":
+            done_at = None
+        elif self.done_at is None or getattr(self, "_loaded_state", "DONE") != "DONE":
+            done_at = now or dj_timezone.now()
+        else:
+            return False
+        changed, self.done_at = done_at != self.done_at, done_at
+        return changed
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "state" in update_fields:
+            if self.sync_done_at() and update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "done_at"]
+        # post_save'deki TaskCounter güncellemesi aynı transaction'da kalsın
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+    @property
+    def version(self):
+        return task_version(self.updated_at)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # UPDATE ... WHERE id = ? AND updated_at = ?; satır değişmişse INSERT'e düşmeden hata
+        if self.expected_updated_at is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        base_qs = base_qs.filter(updated_at=self.expected_updated_at)
+        if not super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update):
+            raise TaskVersionConflict(pk_val)
+        return True
 
     def __str__(self):
         return f"{self.title} - {self.state}"
@@ -36,6 +106,180 @@ class TaskComment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"], name="comment_task_created_idx"
+            ),
+        ]
+
     def __str__(self):
        
-        return f"{self.author.username} kullanıcısının yorumu"
\ No newline at end of file
+        return f"{self.author.username} kullanıcısının yorumu"
+
+
+class TaskDeletion(models.Model):
+    """
+    Silinen task'lar için tombstone.
+    /api/tasks/changes/ delta senkronu silmeleri buradan okur.
+    """
+
+    task_id = models.BigIntegerField()
+    owner_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at"], name="taskdeletion_deleted_idx"),
+            models.Index(
+                fields=["owner_id", "deleted_at"], name="taskdeletion_owner_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Task #{self.task_id} silindi"
+
+
+class TaskCounter(models.Model):
+    """
+    (owner, state) başına task sayısı; dashboard'lar COUNT(*) GROUP BY yerine bunu okur.
+    accounts.counters Task yazmalarıyla aynı transaction'da günceller.
+    Arşivlenen task'lar sayılmaya devam eder (arşivleme sayaçları değiştirmez).
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="task_counters")
+    state = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "state"], name="taskcounter_owner_state_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id} / {self.state}: {self.count}"
+
+
+class Job(models.Model):
+    """
+    accounts.jobs.DatabaseQueue kaydı. run_jobs worker'ları QUEUED ve
+    run_after'ı gelmiş satırları SELECT ... FOR UPDATE SKIP LOCKED ile alır.
+    """
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Sırada"),
+        (RUNNING, "Çalışıyor"),
+        (DONE, "Tamamlandı"),
+        (FAILED, "Başarısız"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(db_default=Now())
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+
+
+class ArchivedTask(models.Model):
+    """
+    TASK_ARCHIVE_AFTER_DAYS'ten uzun süredir DONE olan task'lar (bkz. accounts.archive).
+    id asıl task'ın id'sidir; sıcak tablo ve index'leri küçük kalır.
+    Salt okunur; ?include_archived=1 okumaları TaskWithArchived üzerinden yapılır.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    state = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_tasks")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    done_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "id"], name="archivedtask_owner_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.state} (arşiv)"
+
+
+class ArchivedTaskComment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name="comments")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    content = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"], name="archivedcomment_task_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Arşivlenmiş yorum #{self.id}"
+
+
+class TaskWithArchived(models.Model):
+    """
+    accounts_task UNION ALL accounts_archivedtask view'ı (migration 0008).
+    Task ya da ArchivedTask kolonları değişirse view da yeniden oluşturulmalı.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    state = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    owner = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "accounts_task_with_archived"
+
+    @property
+    def version(self):
+        return task_version(self.updated_at)
+
+
+class TaskCommentWithArchived(models.Model):
+    """accounts_taskcomment UNION ALL accounts_archivedtaskcomment view'ı (migration 0008)."""
+
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(
+        TaskWithArchived, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "accounts_taskcomment_with_archived"
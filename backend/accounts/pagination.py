@@ -0,0 +1,195 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    OFFSET kullanmadan sayfalama yapar.
+    Cursor, sayfanın sınırındaki satırın sıralama alanı değerlerini taşır;
+    sonraki sayfa "WHERE (alanlar) > (değerler)" ile okunur, bu yüzden
+    derin sayfalar da ilk sayfa kadar ucuzdur.
+    """
+
+    ordering = ("id",)
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+
+    def get_page_size(self, request):
+        page_size = getattr(settings, "API_PAGE_SIZE", 100)
+        max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", page_size)
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                page_size = int(raw)
+            except ValueError:
+                pass
+        return max(1, min(page_size, max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, cursor = self.prepare(queryset, request, view)
+        return self.finish(list(queryset[: self.page_size + 1]), cursor)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async view'lar için; sayfa aiterator ile tek sorguda okunur."""
+        queryset, cursor = self.prepare(queryset, request, view)
+        # chunk_size verilince aiterator prefetch_related'ı da uygular
+        rows = [
+            row
+            async for row in queryset[: self.page_size + 1].aiterator(
+                chunk_size=self.page_size + 1
+            )
+        ]
+        return self.finish(rows, cursor)
+
+    def prepare(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(view)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+
+        order_by = [self._order_expr(f, reverse) for f in self.fields]
+        queryset = queryset.order_by(*order_by)
+        if cursor is not None:
+            keys = self._clean_keys(queryset.model, cursor["k"])
+            queryset = queryset.filter(self._seek(keys, reverse))
+        return queryset, cursor
+
+    def finish(self, rows, cursor):
+        reverse = bool(cursor and cursor["r"])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        return self.encode_cursor(self._key(self.last_row), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_row is None:
+            return None
+        return self.encode_cursor(self._key(self.first_row), reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii"))
+            cursor = json.loads(raw.decode("utf-8"))
+            keys = cursor["k"]
+            reverse = bool(cursor.get("r", 0))
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(keys, list) or len(keys) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return {"k": keys, "r": reverse}
+
+    def encode_cursor(self, keys, reverse):
+        payload = json.dumps({"k": keys, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _clean_keys(self, model, keys):
+        # Cursor client'tan gelir: değerler alan tipine çevrilemiyorsa ya da
+        # alanın aralığı dışındaysa (ör. 64 bit'i aşan id) geçersizdir
+        values = []
+        try:
+            for field, value in zip(self.fields, keys):
+                model_field = model._meta.get_field(field.lstrip("-"))
+                value = model_field.to_python(value)
+                if value is not None:
+                    model_field.run_validators(value)
+                values.append(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _key(self, row):
+        values = []
+        for field in self.fields:
+            name = field.lstrip("-")
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _order_expr(field, reverse):
+        descending = field.startswith("-")
+        if reverse:
+            descending = not descending
+        return ("-" if descending else "") + field.lstrip("-")
+
+    def _seek(self, keys, reverse):
+        # (a, b) > (x, y)  ==>  a > x OR (a = x AND b > y)
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.fields, keys):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+
+class TaskPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class TaskCommentPagination(KeysetPagination):
+    ordering = ("created_at", "id")
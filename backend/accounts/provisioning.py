@@ -0,0 +1,98 @@
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from .serializers import BulkRegisterSerializer
+
+REGISTER_FORMATS = ("csv", "ndjson")
+
+
+def read_rows(stream, fmt):
+    """
+    (satır no, dict | None) üretir; dosya baştan sona okunmaz.
+    CSV başlığı: username,email,password
+    """
+    if fmt == "csv":
+        for line_no, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_no, row
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def register_batch(rows, hash_passwords=None, dry_run=False):
+    """
+    Bir batch satırı doğrular ve kaydeder. Dönen değer: (oluşturulan sayısı, hatalar)
+    hatalar: [(satır no, {alan: mesaj})]
+
+    Tekillik iki IN sorgusuyla kontrol edilir; parolalar hash_passwords ile
+    (örn. ProcessPoolExecutor.map) topluca hash'lenir, kayıt tek bulk_create'tir.
+    Önceki batch'ler zaten yazıldığı için dosya içindeki tekrarlar da yakalanır.
+    """
+    errors, valid = [], []
+    for line_no, row in rows:
+        if row is None:
+            errors.append((line_no, {"detail": "Expected a JSON object."}))
+            continue
+        serializer = BulkRegisterSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((line_no, serializer.validated_data))
+        else:
+            errors.append((line_no, serializer.errors))
+
+    usernames = {data["username"] for _, data in valid}
+    emails = {data["email"] for _, data in valid}
+    taken_usernames = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    taken_emails = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+
+    accepted = []
+    for line_no, data in valid:
+        row_errors = {}
+        if data["username"] in taken_usernames:
+            row_errors["username"] = ["This username is already taken."]
+        if data["email"] in taken_emails:
+            row_errors["email"] = ["This email is already in use."]
+        if row_errors:
+            errors.append((line_no, row_errors))
+            continue
+        # Batch içindeki tekrarlarda ilk satır kazanır
+        taken_usernames.add(data["username"])
+        taken_emails.add(data["email"])
+        accepted.append(data)
+
+    if dry_run or not accepted:
+        return (len(accepted) if dry_run else 0), errors
+
+    hash_passwords = hash_passwords or (lambda passwords: map(make_password, passwords))
+    hashes = hash_passwords([data["password"] for data in accepted])
+    users = [
+        User(username=data["username"], email=data["email"], password=password)
+        for data, password in zip(accepted, hashes)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+    except IntegrityError as exc:
+        # Aynı anda başka bir kayıt araya girdiyse batch bütünüyle yazılmaz
+        return 0, errors + [(None, {"detail": f"Batch rejected: {exc}"})]
+    return len(users), errors
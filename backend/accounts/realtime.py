@@ -0,0 +1,132 @@
+import asyncio
+import json
+from collections import deque
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http.cookie import parse_cookie
+
+from .broker import get_broker
+from .events import ALL_TASKS_CHANNEL, board_channel, task_channel
+
+
+class WebSocketConsumer:
+    """
+    WS /ws/
+
+    Client -> server:
+      {"action": "subscribe", "board": "mine" | "all"}
+      {"action": "subscribe", "task": <task_id>}
+      {"action": "unsubscribe", ...aynı alanlar}
+
+    Server -> client: accounts.events içindeki task.* / comment.* event'leri.
+
+    Yetki kuralları REST uçlarıyla aynıdır: "all" board'u /api/tasks/?all=1
+    gibi her giriş yapmış kullanıcıya açıktır, yorum akışı da öyle.
+    """
+
+    def __init__(self, scope, receive, send):
+        self.scope = scope
+        self.receive = receive
+        self.send = send
+        self.user = None
+        self.subscription = None
+
+    async def __call__(self):
+        event = await self.receive()
+        if event["type"] != "websocket.connect":
+            return
+
+        if not self.origin_allowed():
+            await self.send({"type": "websocket.close", "code": 4403})
+            return
+
+        self.user = await get_scope_user(self.scope)
+        if not self.user.is_authenticated:
+            await self.send({"type": "websocket.close", "code": 4401})
+            return
+
+        await self.send({"type": "websocket.accept"})
+        self.subscription = get_broker().subscribe()
+        pump = asyncio.create_task(self.pump())
+        try:
+            while True:
+                event = await self.receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+                if event["type"] == "websocket.receive":
+                    await self.handle(event.get("text"))
+        finally:
+            pump.cancel()
+            await self.subscription.close()
+
+    async def pump(self):
+        # Hem board'a hem task'a abone olan client aynı event'i iki kanaldan alır
+        recent = deque(maxlen=256)
+        while True:
+            message = await self.subscription.get()
+            eid = json.loads(message).get("eid")
+            if eid in recent:
+                continue
+            recent.append(eid)
+            await self.send({"type": "websocket.send", "text": message})
+
+    async def handle(self, text):
+        try:
+            message = json.loads(text or "")
+            action = message["action"]
+        except (ValueError, KeyError, TypeError):
+            return await self.reply({"type": "error", "error": "Invalid message"})
+
+        channel = self.channel_for(message)
+        if action not in ("subscribe", "unsubscribe") or channel is None:
+            return await self.reply({"type": "error", "error": "Invalid subscription"})
+
+        if action == "subscribe":
+            await self.subscription.add(channel)
+        else:
+            await self.subscription.remove(channel)
+        await self.reply({"type": f"{action}d", "channel": channel})
+
+    def channel_for(self, message):
+        board = message.get("board")
+        if board == "mine":
+            return board_channel(self.user.id)
+        if board == "all":
+            return ALL_TASKS_CHANNEL
+        task_id = message.get("task")
+        if isinstance(task_id, int):
+            return task_channel(task_id)
+        return None
+
+    async def reply(self, payload):
+        await self.send({"type": "websocket.send", "text": json.dumps(payload)})
+
+    def origin_allowed(self):
+        # Tarayıcılar WebSocket'te CORS uygulamaz; cookie'li cross-site bağlantıyı burada keseriz
+        headers = dict(self.scope.get("headers") or [])
+        origin = headers.get(b"origin")
+        if origin is None:
+            return True
+        origin = origin.decode("latin1")
+        host = headers.get(b"host", b"").decode("latin1")
+        if origin.split("://", 1)[-1] == host:
+            return True
+        return origin in getattr(settings, "CSRF_TRUSTED_ORIGINS", [])
+
+
+@sync_to_async
+def get_scope_user(scope):
+    """Session cookie'sinden kullanıcıyı, AuthenticationMiddleware ile aynı yoldan çözer."""
+    headers = dict(scope.get("headers") or [])
+    cookies = parse_cookie(headers.get(b"cookie", b"").decode("latin1"))
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore(cookies.get(settings.SESSION_COOKIE_NAME))
+    return get_user(SimpleNamespace(session=session))
+
+
+async def websocket_application(scope, receive, send):
+    await WebSocketConsumer(scope, receive, send)()
@@ -0,0 +1,40 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel; yoksa DRF'in json.dumps yolu kullanılır
+    orjson = None
+
+# Tarih/dataclass'lar DRF encoder'ına bırakılır: orjson'un kendi biçimi farklı
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF JSONRenderer ile byte byte aynı çıktı, orjson kuruluysa onunla.
+    Girintili çıktı (?indent=, browsable API) ve ASCII/uzun ayraç ayarları
+    DRF'in kendi yoluna düşer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # 64 bit'i aşan tamsayı gibi orjson'un desteklemediği değerler
+            return super().render(data, accepted_media_type, renderer_context)
+        # DRF gibi U+2028 / U+2029 kaçışlanır (JSON'u geçerli JavaScript tutmak için)
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,32 @@
+from django.db import connections
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.functions import Greatest
+
+USER_SEARCH_FIELDS = ("email", "first_name", "last_name", "username")
+
+
+class Similarity(Func):
+    """pg_trgm similarity(a, b): 0..1 arası benzerlik skoru."""
+
+    function = "SIMILARITY"
+    output_field = FloatField()
+
+
+def search_users(queryset, q):
+    """
+    ?q= araması.
+    Filtre her veritabanında aynı icontains OR'udur. Postgres'te bu
+    predicate'ler 0004 migration'ındaki UPPER(col) gin_trgm_ops index'lerinden
+    karşılanır ve sonuçlar trigram benzerliğine göre sıralanır.
+    SQLite vb. backend'lerde eski davranış (id sırası) korunur.
+    """
+    condition = Q()
+    for field in USER_SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": q})
+    queryset = queryset.filter(condition)
+
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset
+
+    rank = Greatest(*(Similarity(F(field), Value(q)) for field in USER_SEARCH_FIELDS))
+    return queryset.annotate(search_rank=rank).order_by("-search_rank", "id")
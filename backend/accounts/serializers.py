@@ -2,6 +2,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
+from .metrics import TimedSerializerMixin
 from .models import Task, TaskComment
 
 
@@ -34,7 +35,20 @@ class RegisterSerializer(serializers.Serializer):
         )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class BulkRegisterSerializer(RegisterSerializer):
+    """
+    bulk_register için: alan doğrulaması RegisterSerializer ile aynı, ama
+    tekillik kontrolleri satır satır değil accounts.provisioning'de toplu yapılır.
+    """
+
+    def validate_username(self, value):
+        return User.normalize_username(value)
+
+    def validate_email(self, value):
+        return value.lower().strip()
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -109,10 +123,24 @@ class AccountDeleteSerializer(serializers.Serializer):
         return attrs
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     owner_username = serializers.CharField(
         source="owner.username", read_only=True
     )
+    # PUT/PATCH'te If-Match: "<version>" olarak geri gönderilir
+    version = serializers.CharField(read_only=True)
+
+    def __init__(self, *args, fields=None, include=(), **kwargs):
+        # ?fields= projeksiyonu: sadece istenen alanlar serialize edilir
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        # ?include= ile view'ın önceden hesapladığı yorum alanları
+        if "comment_stats" in include:
+            self.fields["comment_count"] = serializers.IntegerField(read_only=True)
+        if "latest_comments" in include:
+            self.fields["latest_comments"] = TaskCommentSerializer(many=True, read_only=True)
 
     class Meta:
         model = Task
@@ -123,13 +151,14 @@ class TaskSerializer(serializers.ModelSerializer):
             "state",
             "owner",
             "owner_username",
+            "version",
         ]
         extra_kwargs = {
             "owner": {"required": False}
         }
 
 
-class TaskCommentSerializer(serializers.ModelSerializer):
+class TaskCommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author_username = serializers.CharField(
         source="author.username", read_only=True
     )
@@ -0,0 +1,116 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, counters, threads
+from .backends import user_cache
+from .metrics import install_execute_wrapper
+from .models import Task, TaskComment, TaskDeletion
+from .serializers import TaskCommentSerializer
+
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion(sender, instance, **kwargs):
+    # Kullanıcı silinince cascade ile giden task'lar da buradan geçer
+    TaskDeletion.objects.create(task_id=instance.id, owner_id=instance.owner_id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_lists(sender, instance, **kwargs):
+    owner_ids = {instance.owner_id, getattr(instance, "_loaded_owner_id", None)}
+    owner_ids.discard(None)
+    scopes = [cache.ALL_SCOPE, *(cache.user_scope(owner_id) for owner_id in owner_ids)]
+    # Commit'ten önce versiyon değişirse eski veri yeni versiyonla cache'lenebilir
+    transaction.on_commit(lambda: cache.bump(*scopes))
+    if len(owner_ids) > 1:
+        # Owner değişti: yorum sinyallerinin kullandığı owner cache'i de
+        transaction.on_commit(lambda: cache.forget_owners(instance.id))
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, **kwargs):
+    # Task.save atomic olduğundan sayaç task satırıyla birlikte commit/rollback olur
+    if created:
+        counters.apply_deltas(counters.task_deltas(created=[instance]))
+    else:
+        before = (getattr(instance, "_loaded_owner_id", None), getattr(instance, "_loaded_state", None))
+        if before[0] is not None:
+            counters.apply_deltas(counters.task_deltas(updated=[(before, instance)]))
+    # Aynı nesne tekrar kaydedilirse fark yeni değerlerden hesaplansın
+    instance._loaded_owner_id = instance.owner_id
+    instance._loaded_state = instance.state
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    counters.apply_deltas(counters.task_deltas(deleted=[instance]))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_owner_username(sender, instance, update_fields=None, **kwargs):
+    # owner_username task listelerinde tekrar ediliyor.
+    # Login sadece last_login'i (ve rehash'te parolayı) yazar, listeleri etkilemez.
+    if update_fields is not None and set(update_fields) <= {"last_login", "password"}:
+        return
+    scopes = [cache.ALL_SCOPE, cache.user_scope(instance.id)]
+    transaction.on_commit(lambda: cache.bump(*scopes))
+    if getattr(instance, "_username_changed", False):
+        # author_username yorum thread'lerinde de tekrar ediliyor
+        transaction.on_commit(threads.invalidate_all)
+
+
+@receiver(pre_save, sender=User)
+def detect_username_change(sender, instance, update_fields=None, **kwargs):
+    # Kayıt, profil/aktiflik değişiklikleri yorum thread'lerini etkilemez
+    instance._username_changed = False
+    if instance._state.adding or (update_fields is not None and "username" not in update_fields):
+        return
+    before = User.objects.filter(pk=instance.pk).values_list("username", flat=True).first()
+    instance._username_changed = before is not None and before != instance.username
+
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def invalidate_comment_includes(sender, instance, **kwargs):
+    # Sadece ?include= ile yorum taşıyan liste cevapları etkilenir.
+    # Owner için ek sorgu yok: task yüklenmişse ondan, değilse cache'ten (bkz. cache.task_owner)
+    if TaskComment.task.is_cached(instance):
+        owner_id = instance.task.owner_id
+    else:
+        owner_id = cache.task_owner(instance.task_id)
+    scopes = [cache.comments_scope(cache.ALL_SCOPE)]
+    if owner_id is not None:
+        scopes.append(cache.comments_scope(cache.user_scope(owner_id)))
+    transaction.on_commit(lambda: cache.bump(*scopes))
+
+
+@receiver(post_save, sender=TaskComment)
+def update_comment_thread(sender, instance, created, **kwargs):
+    # Sadece değişen yorumun parçası yeniden yazılır (bkz. accounts.threads)
+    key = threads.comment_key(instance.created_at, instance.id)
+    item = TaskCommentSerializer(instance).data
+    write = threads.append if created else threads.replace
+    transaction.on_commit(lambda: write(instance.task_id, key, item))
+
+
+@receiver(post_delete, sender=TaskComment)
+def remove_from_comment_thread(sender, instance, **kwargs):
+    key = threads.comment_key(instance.created_at, instance.id)
+    transaction.on_commit(lambda: threads.remove(instance.task_id, key))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # profile_update, password_change, account_delete ve admin düzenlemeleri.
+    # Commit'ten önce başka bir istek eski satırı yeniden cache'leyebilir; commit'te tekrar.
+    user_id = instance.pk
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+connection_created.connect(install_execute_wrapper, dispatch_uid="accounts.metrics")
@@ -0,0 +1,73 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import TaskDeletion
+
+
+def encode_sync_token(moment):
+    payload = json.dumps({"t": moment.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_sync_token(token):
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+        moment = parse_datetime(json.loads(raw.decode("utf-8"))["t"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        moment = None
+    if moment is None:
+        raise ValidationError({"since": "Invalid sync token."})
+    return moment
+
+
+def new_watermark():
+    """
+    Yeni token'ın zamanı "şimdi"den biraz geridedir: o anda commit olmamış
+    transaction'ların yazdığı satırlar bir sonraki poll'da kaçırılmaz.
+    Bu yüzden aynı değişiklik iki kez gelebilir; client'lar id ile upsert eder.
+    """
+    overlap = getattr(settings, "TASK_SYNC_OVERLAP_SECONDS", 2)
+    return timezone.now() - timedelta(seconds=overlap)
+
+
+def collect_changes(queryset, since, owner_id=None):
+    """
+    since'ten sonra oluşturulan/güncellenen task'lar ve silinen task id'leri.
+    Değişiklik sayısı TASK_SYNC_MAX_CHANGES'ı aşarsa ya da since tombstone
+    saklama süresinden eskiyse None döner; client tam listeyi yeniden çekmelidir.
+    """
+    max_changes = getattr(settings, "TASK_SYNC_MAX_CHANGES", 1000)
+    retention = timedelta(days=getattr(settings, "TASK_SYNC_RETENTION_DAYS", 7))
+    if since < timezone.now() - retention:
+        return None
+
+    changed = list(
+        queryset.filter(updated_at__gt=since).order_by("updated_at", "id")[
+            : max_changes + 1
+        ]
+    )
+    deletions = TaskDeletion.objects.filter(deleted_at__gt=since)
+    if owner_id is not None:
+        deletions = deletions.filter(owner_id=owner_id)
+    deleted = list(
+        deletions.order_by("deleted_at", "id").values_list("task_id", flat=True)[
+            : max_changes + 1
+        ]
+    )
+
+    if len(changed) + len(deleted) > max_changes:
+        return None
+    return changed, deleted
+
+
+def prune_deletions(now=None):
+    retention = timedelta(days=getattr(settings, "TASK_SYNC_RETENTION_DAYS", 7))
+    cutoff = (now or timezone.now()) - retention
+    return TaskDeletion.objects.filter(deleted_at__lt=cutoff).delete()[0]
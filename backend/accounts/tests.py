@@ -1,3 +1,1439 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import io
+import json
+import multiprocessing
+import os
+import runpy
+import tempfile
+import unittest
+from importlib import import_module
+from unittest import mock
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import renderers
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from . import crypto_utils, jobs, threads, throttling
+from .backends import CachedModelBackend, user_cache
+from .metrics import Histogram, pool_samples, registry
+from .archive import archive_done_tasks
+from .broker import InMemoryBackend, get_broker
+from .compact import comment_rows, comment_values, task_rows, task_values
+from .db_slots import db_slot
+from .events import board_channel, task_channel
+from .includes import comment_counts, latest_comments_queryset
+from .models import Job, Task, TaskComment, TaskCounter, TaskVersionConflict
+from .realtime import websocket_application
+from .renderers import JSONRenderer
+from .serializers import TaskCommentSerializer, TaskSerializer
+from .sync import encode_sync_token
+from .views import TaskCommentViewSet, TaskViewSet
+
+PASSWORD = "pw12345!!"
+
+
+def encode_cursor(keys, reverse=False):
+    payload = json.dumps({"k": keys, "r": int(reverse)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+class ApiTestCase(APITestCase):
+    def setUp(self):
+        # Liste/thread cache'leri test DB'si geri alınsa da process'te kalır
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user("a", "a@x.com", PASSWORD)
+        self.staff = User.objects.create_user("s", "s@x.com", PASSWORD, is_staff=True)
+        # Async GET uçları sadece session'a bakar; force_authenticate yetmez
+        self.client.force_login(self.user)
+
+
+class CursorPaginationTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = Task.objects.bulk_create(
+            Task(title=f"t{i}", owner=self.user) for i in range(25)
+        )
+
+    def test_next_and_previous_links_round_trip(self):
+        seen = []
+        response = self.client.get("/api/tasks/?page_size=10")
+        pages = [response.json()]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).json())
+        for page in pages:
+            seen.extend(item["id"] for item in page["results"])
+        self.assertEqual(seen, sorted(task.id for task in self.tasks))
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(pages[-1]["previous"]).json()
+        self.assertEqual(
+            [item["id"] for item in previous["results"]],
+            [item["id"] for item in pages[-2]["results"]],
+        )
+
+    def test_tampered_cursor_is_rejected(self):
+        for cursor in (
+            "zzz",
+            encode_cursor(["abc"]),
+            encode_cursor([None]),
+            encode_cursor([2**70]),
+            encode_cursor([1, 2]),
+            base64.urlsafe_b64encode(b'{"r":0}').decode("ascii"),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f"/api/tasks/?cursor={cursor}")
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json()["detail"], "Invalid cursor")
+
+    def test_comment_cursor_round_trip(self):
+        task = self.tasks[0]
+        TaskComment.objects.bulk_create(
+            TaskComment(task=task, author=self.user, content=f"c{i}") for i in range(7)
+        )
+        contents = []
+        url = f"/api/tasks/{task.id}/comments/?page_size=3"
+        while url:
+            page = self.client.get(url).json()
+            contents.extend(item["content"] for item in page["results"])
+            url = page["next"]
+        self.assertEqual(contents, [f"c{i}" for i in range(7)])
+
+
+class UserSearchTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.staff)
+        self.alice = User.objects.create_user(
+            "alice", "alice@example.com", PASSWORD, first_name="Alice", last_name="Kaya"
+        )
+        self.bob = User.objects.create_user(
+            "bobby", "bob@example.com", PASSWORD, first_name="Bob", last_name="Alison"
+        )
+
+    def usernames(self, q):
+        response = self.client.get("/api/users/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return {user["username"] for user in response.json()}
+
+    def test_q_matches_any_field_case_insensitively(self):
+        self.assertEqual(self.usernames("KAYA"), {"alice"})
+        self.assertEqual(self.usernames("bob@"), {"bobby"})
+        self.assertEqual(self.usernames("ali"), {"alice", "bobby"})
+        self.assertEqual(self.usernames("nobody"), set())
+
+    def test_staff_and_inactive_users_are_not_listed(self):
+        User.objects.filter(id=self.alice.id).update(is_active=False)
+        self.assertEqual(self.usernames("example.com"), {"bobby"})
+        self.assertNotIn("s", self.usernames("x.com"))
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "pg_trgm ranking")
+    def test_results_are_ranked_by_similarity(self):
+        User.objects.create_user("carol", "carol@example.com", PASSWORD, last_name="Malicevic")
+        response = self.client.get("/api/users/", {"q": "alice"})
+        self.assertEqual([user["username"] for user in response.json()], ["alice", "carol"])
+
+
+class TaskFilterTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.staff)
+        self.todo = Task.objects.create(title="Write docs", owner=self.user)
+        self.done = Task.objects.create(
+            title="Fix bug", description="docs typo", owner=self.user, state="DONE"
+        )
+        self.other = Task.objects.create(title="Review", owner=self.staff, state="BLOCKED")
+
+    def get(self, **params):
+        return self.client.get("/api/tasks/", params)
+
+    def ids(self, **params):
+        response = self.get(**params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_filters_combine(self):
+        self.assertEqual(self.ids(state="TODO,DONE"), [self.todo.id, self.done.id])
+        self.assertEqual(self.ids(owner=self.staff.id), [self.other.id])
+        self.assertEqual(self.ids(search="DOCS"), [self.todo.id, self.done.id])
+        self.assertEqual(self.ids(search="docs", state="DONE"), [self.done.id])
+
+    def test_updated_since(self):
+        Task.objects.filter(id=self.todo.id).update(updated_at="2000-01-01T00:00:00Z")
+        self.assertEqual(
+            self.ids(updated_since="2001-01-01T00:00:00Z"), [self.done.id, self.other.id]
+        )
+
+    def test_ordering_breaks_ties_by_id(self):
+        self.assertEqual(
+            self.ids(ordering="-title"), [self.todo.id, self.other.id, self.done.id]
+        )
+        Task.objects.update(state="TODO")
+        self.assertEqual(
+            self.ids(ordering="-state"), [self.other.id, self.done.id, self.todo.id]
+        )
+
+    def test_fields_projection(self):
+        response = self.get(fields="id,title")
+        self.assertEqual(response.json()["results"][0], {"id": self.todo.id, "title": "Write docs"})
+
+    def test_invalid_parameters_are_rejected(self):
+        for params, key in [
+            ({"state": "LATER"}, "state"),
+            ({"owner": "abc"}, "owner"),
+            ({"owner": "²"}, "owner"),
+            ({"owner": str(2**70)}, "owner"),
+            ({"owner": "-1"}, "owner"),
+            ({"updated_since": "yesterday"}, "updated_since"),
+            ({"updated_since": "2024-13-40T00:00"}, "updated_since"),
+            ({"ordering": "password"}, "ordering"),
+            ({"fields": "id,secret"}, "fields"),
+        ]:
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(key, response.json())
+
+
+@override_settings(TASK_SYNC_OVERLAP_SECONDS=0)
+class DeltaSyncTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept = Task.objects.create(title="kept", owner=self.user)
+        self.edited = Task.objects.create(title="edited", owner=self.user)
+        self.removed = Task.objects.create(title="removed", owner=self.user)
+        self.foreign = Task.objects.create(title="foreign", owner=self.staff)
+
+    def changes(self, token):
+        response = self.client.get("/api/tasks/changes/", {"since": token})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_first_sync_asks_for_a_reset(self):
+        data = self.client.get("/api/tasks/changes/").json()
+        self.assertEqual((data["reset"], data["changed"], data["deleted"]), (True, [], []))
+        self.assertTrue(data["token"])
+
+    def test_changes_and_tombstones_since_token(self):
+        token = self.client.get("/api/tasks/changes/").json()["token"]
+        self.client.patch(f"/api/tasks/{self.edited.id}/", {"title": "new"}, format="json")
+        self.client.delete(f"/api/tasks/{self.removed.id}/")
+        self.foreign.delete()
+        created = self.client.post("/api/tasks/", {"title": "created"}, format="json").json()
+
+        data = self.changes(token)
+        self.assertFalse(data["reset"])
+        self.assertEqual([task["id"] for task in data["changed"]], [self.edited.id, created["id"]])
+        self.assertEqual(data["changed"][0]["title"], "new")
+        # Başka kullanıcının silinen task'ı sızmaz
+        self.assertEqual(data["deleted"], [self.removed.id])
+
+        self.assertEqual(self.changes(data["token"])["changed"], [])
+
+    @override_settings(TASK_SYNC_MAX_CHANGES=1)
+    def test_too_many_changes_asks_for_a_reset(self):
+        token = self.client.get("/api/tasks/changes/").json()["token"]
+        Task.objects.update(title="bulk", updated_at=timezone.now())
+        self.assertTrue(self.changes(token)["reset"])
+
+    def test_expired_token_asks_for_a_reset(self):
+        token = encode_sync_token(timezone.now() - timedelta(days=30))
+        self.assertTrue(self.changes(token)["reset"])
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get("/api/tasks/changes/", {"since": "not-a-token"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.json())
+
+
+@override_settings(REALTIME_BROKER={"BACKEND": "accounts.broker.InMemoryBackend"})
+class InMemoryBrokerTests(TestCase):
+    async def test_publish_fans_out_to_every_subscriber_of_the_channel(self):
+        broker = get_broker()
+        self.assertIsInstance(broker, InMemoryBackend)
+        first, second, other = broker.subscribe(), broker.subscribe(), broker.subscribe()
+        await first.add("task.1")
+        await second.add("task.1")
+        await other.add("task.2")
+
+        broker.publish("task.1", "hello")
+        self.assertEqual(await asyncio.wait_for(first.get(), 1), "hello")
+        self.assertEqual(await asyncio.wait_for(second.get(), 1), "hello")
+        await asyncio.sleep(0)
+        self.assertTrue(other.queue.empty())
+
+        await first.close()
+        broker.publish("task.1", "again")
+        self.assertEqual(await asyncio.wait_for(second.get(), 1), "again")
+        await asyncio.sleep(0)
+        self.assertTrue(first.queue.empty())
+        await second.close()
+        await other.close()
+        self.assertEqual(dict(broker._subscribers), {})
+
+    async def test_full_queue_drops_the_oldest_event(self):
+        broker = InMemoryBackend(queue_size=2)
+        subscription = broker.subscribe()
+        await subscription.add("board.all")
+        for message in ("1", "2", "3"):
+            broker.publish("board.all", message)
+        await asyncio.sleep(0)
+        self.assertEqual([await subscription.get(), await subscription.get()], ["2", "3"])
+        await subscription.close()
+
+
+class RecordingBroker:
+    published = []
+
+    def __init__(self, **options):
+        pass
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+@override_settings(REALTIME_BROKER={"BACKEND": "accounts.tests.RecordingBroker"})
+class TaskEventTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        RecordingBroker.published = []
+
+    def test_events_are_published_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            task = self.client.post("/api/tasks/", {"title": "t"}, format="json").json()
+        self.assertEqual(RecordingBroker.published, [])
+        for callback in callbacks:
+            callback()
+        channels = {channel for channel, _ in RecordingBroker.published}
+        self.assertEqual(
+            channels, {"board.all", task_channel(task["id"]), board_channel(self.user.id)}
+        )
+        [eid] = {event["eid"] for _, event in RecordingBroker.published}
+        self.assertTrue(eid)
+
+    def test_update_event_carries_only_changed_fields(self):
+        task = Task.objects.create(title="t", owner=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/tasks/{task.id}/", {"state": "DONE"}, format="json")
+        event = RecordingBroker.published[0][1]
+        self.assertEqual(event["type"], "task.updated")
+        self.assertEqual(set(event["changes"]) - {"version"}, {"state"})
+
+
+class WebSocketSession:
+    """websocket_application'ı ASGI receive/send kuyruklarıyla sürer."""
+
+    def __init__(self, cookie="", origin=None):
+        headers = [(b"host", b"testserver"), (b"cookie", cookie.encode("latin1"))]
+        if origin is not None:
+            headers.append((b"origin", origin.encode("latin1")))
+        self.scope = {"type": "websocket", "path": "/ws/", "headers": headers}
+        self.incoming, self.outgoing = asyncio.Queue(), asyncio.Queue()
+
+    async def connect(self):
+        self.app = asyncio.create_task(
+            websocket_application(self.scope, self.incoming.get, self.outgoing.put)
+        )
+        await self.incoming.put({"type": "websocket.connect"})
+        return await self.next()
+
+    async def next(self):
+        return await asyncio.wait_for(self.outgoing.get(), 1)
+
+    async def send_json(self, payload):
+        await self.incoming.put({"type": "websocket.receive", "text": json.dumps(payload)})
+        return json.loads((await self.next())["text"])
+
+    async def close(self):
+        await self.incoming.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(self.app, 1)
+
+
+@override_settings(REALTIME_BROKER={"BACKEND": "accounts.broker.InMemoryBackend"})
+class WebSocketConsumerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("a", "a@x.com", PASSWORD)
+        self.client.force_login(self.user)
+        self.cookie = f"{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+    async def test_anonymous_connection_is_closed(self):
+        self.assertEqual(
+            await WebSocketSession().connect(), {"type": "websocket.close", "code": 4401}
+        )
+
+    async def test_cross_site_origin_is_closed(self):
+        session = WebSocketSession(self.cookie, origin="https://evil.example")
+        self.assertEqual(await session.connect(), {"type": "websocket.close", "code": 4403})
+
+    async def test_subscribed_events_are_delivered_once(self):
+        session = WebSocketSession(self.cookie)
+        self.assertEqual(await session.connect(), {"type": "websocket.accept"})
+        mine = await session.send_json({"action": "subscribe", "board": "mine"})
+        self.assertEqual(mine, {"type": "subscribed", "channel": board_channel(self.user.id)})
+        await session.send_json({"action": "subscribe", "task": 7})
+        self.assertEqual(
+            await session.send_json({"action": "subscribe", "task": "7"}),
+            {"type": "error", "error": "Invalid subscription"},
+        )
+
+        # Aynı event iki kanaldan gelir, client'a bir kez gider
+        message = json.dumps({"eid": "e1", "type": "task.updated", "id": 7})
+        get_broker().publish(board_channel(self.user.id), message)
+        get_broker().publish(task_channel(7), message)
+        get_broker().publish(task_channel(8), json.dumps({"eid": "e2"}))
+        self.assertEqual((await session.next())["text"], message)
+        await asyncio.sleep(0.05)
+        self.assertTrue(session.outgoing.empty())
+
+        await session.send_json({"action": "unsubscribe", "task": 7})
+        await session.send_json({"action": "unsubscribe", "board": "mine"})
+        get_broker().publish(task_channel(7), json.dumps({"eid": "e3"}))
+        await asyncio.sleep(0.05)
+        self.assertTrue(session.outgoing.empty())
+        await session.close()
+        self.assertEqual(dict(get_broker()._subscribers), {})
+
+
+class TaskListCacheTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title="t", owner=self.user)
+        self.other = User.objects.create_user("b", "b@x.com", PASSWORD)
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        etag = response["ETag"]
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        # Farklı sorgu şekli farklı ETag
+        self.assertNotEqual(self.client.get("/api/tasks/?state=DONE")["ETag"], etag)
+
+    def test_write_invalidates_owner_and_all_scopes(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        self.client.force_login(self.staff)
+        staff_etag = self.client.get("/api/tasks/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "new"}, format="json")
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=staff_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["title"], "new")
+
+        self.client.force_login(self.user)
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["title"], "new")
+
+    def test_other_users_writes_keep_the_cache(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title="theirs", owner=self.other)
+        self.assertEqual(self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_cached_body_is_served_until_invalidated(self):
+        first = self.client.get("/api/tasks/").content
+        # Sinyalsiz yazma: cache bilinçli olarak eski cevabı döner
+        Task.objects.filter(id=self.task.id).update(title="raw")
+        self.assertEqual(self.client.get("/api/tasks/").content, first)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.get(id=self.task.id).save()
+        self.assertIn(b"raw", self.client.get("/api/tasks/").content)
+
+
+class BulkTaskTests(ApiTestCase):
+    url = "/api/tasks/bulk/"
+
+    def setUp(self):
+        super().setUp()
+        self.mine = Task.objects.create(title="mine", owner=self.user)
+        self.theirs = Task.objects.create(title="theirs", owner=self.staff)
+
+    def test_create_is_all_or_nothing(self):
+        response = self.client.post(self.url, [{"title": "ok"}, {"state": "LATER"}, 5], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r["index"] for r in response.json()["results"]], [1, 2])
+        self.assertEqual(Task.objects.count(), 2)
+
+        response = self.client.post(self.url, [{"title": "a"}, {"title": "b"}], format="json")
+        self.assertEqual(response.status_code, 201)
+        ids = [r["id"] for r in response.json()["results"]]
+        self.assertEqual(
+            list(Task.objects.filter(id__in=ids).values_list("owner_id", flat=True)),
+            [self.user.id, self.user.id],
+        )
+
+    def test_update_checks_every_item(self):
+        response = self.client.patch(
+            self.url,
+            [{"id": self.mine.id, "title": "x"}, {"id": self.theirs.id, "title": "x"},
+             {"id": self.theirs.id + 100, "title": "x"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r["status"] for r in response.json()["results"]], [403, 404])
+        self.mine.refresh_from_db()
+        self.assertEqual(self.mine.title, "mine")
+
+        response = self.client.patch(self.url, [{"id": self.mine.id, "title": "x"}], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.mine.refresh_from_db()
+        self.assertEqual(self.mine.title, "x")
+
+    def test_update_items_must_be_objects_with_ids(self):
+        for body in ([self.mine.id], [{"title": "x"}], [{"id": "1"}], [{"id": True}],
+                     [{"id": 2**70}], [{"id": self.mine.id}, {"id": self.mine.id}], []):
+            with self.subTest(body=body):
+                response = self.client.patch(self.url, body, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("detail", response.json())
+
+    def test_delete(self):
+        response = self.client.delete(self.url, {"ids": [self.mine.id, self.theirs.id]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Task.objects.filter(id=self.mine.id).exists())
+
+        for body in ({"ids": [{"id": self.mine.id}]}, {"ids": [-1]}, {"id": [1]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.delete(self.url, body, format="json").status_code, 400)
+
+        response = self.client.delete(self.url, {"ids": [self.mine.id]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.filter(id=self.mine.id).exists())
+
+    @override_settings(TASK_BULK_MAX_ITEMS=2)
+    def test_item_limit(self):
+        response = self.client.post(self.url, [{"title": "t"}] * 3, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.staff)
+        self.quiet = Task.objects.create(title="quiet", owner=self.user)
+        self.busy = Task.objects.create(title="busy, \"quoted\"", owner=self.user, state="DONE")
+        for i in range(3):
+            TaskComment.objects.create(task=self.busy, author=self.staff, content=f"c{i}\nline")
+
+    def export(self, client, query):
+        return client.get(f"/api/tasks/export/?{query}")
+
+    def test_csv_has_one_row_per_comment(self):
+        response = self.export(self.client, "type=csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:2], ["task_id", "title"])
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.quiet.id)] + [str(self.busy.id)] * 3)
+        self.assertEqual(rows[1][8:], [""] * 5)
+        self.assertEqual([row[11] for row in rows[2:]], ["c0\nline", "c1\nline", "c2\nline"])
+
+    def test_ndjson_nests_comments_and_honours_filters(self):
+        response = self.export(self.client, "type=ndjson&state=DONE")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        [record] = [json.loads(line) for line in lines]
+        self.assertEqual(record["title"], 'busy, "quoted"')
+        self.assertEqual([c["content"] for c in record["comments"]], ["c0\nline", "c1\nline", "c2\nline"])
+
+    def test_export_is_staff_only_and_validates_type(self):
+        self.assertEqual(self.export(self.client, "type=xml").status_code, 400)
+        self.client.force_login(self.user)
+        self.assertEqual(self.export(self.client, "type=csv").status_code, 403)
+
+    async def test_asgi_export_streams_the_same_bytes(self):
+        for export_type in ("csv", "ndjson"):
+            sync_response = await sync_to_async(self.export)(self.client, f"type={export_type}")
+            sync_body = await sync_to_async(b"".join)(sync_response.streaming_content)
+            self.async_client.cookies = self.client.cookies
+            response = await self.export(self.async_client, f"type={export_type}")
+            self.assertTrue(response.is_async)
+            body = b"".join([chunk async for chunk in response.streaming_content])
+            self.assertEqual(body, sync_body)
+
+
+OLD_KEY = base64.b64encode(b"o" * 32).decode()
+NEW_KEY = base64.b64encode(b"n" * 32).decode()
+
+
+@override_settings(ENCRYPTION_KEY_B64="", ENCRYPTION_KEYS_B64={"1": OLD_KEY}, ENCRYPTION_KEY_ID="1")
+class KeyRingTests(SimpleTestCase):
+    def test_round_trip_uses_current_key_id(self):
+        envelope = crypto_utils.encrypt_json({"name": "ş", "n": 1})
+        self.assertTrue(envelope["encrypted"])
+        self.assertEqual(envelope["payload"]["kid"], "1")
+        self.assertEqual(crypto_utils.decrypt_json(envelope["payload"]), {"name": "ş", "n": 1})
+
+    def test_keyring_is_built_once_and_reset_on_setting_change(self):
+        ring = crypto_utils.get_keyring()
+        self.assertIs(crypto_utils.get_keyring(), ring)
+        with self.settings(ENCRYPTION_KEY_ID="1"):
+            self.assertIsNot(crypto_utils.get_keyring(), ring)
+
+    def test_rotation_keeps_old_payloads_readable(self):
+        old = crypto_utils.encrypt_json({"v": "old"})["payload"]
+        with self.settings(ENCRYPTION_KEYS_B64={"2": NEW_KEY, "1": OLD_KEY}, ENCRYPTION_KEY_ID="2"):
+            new = crypto_utils.encrypt_json({"v": "new"})["payload"]
+            self.assertEqual(new["kid"], "2")
+            self.assertEqual(crypto_utils.decrypt_json(old), {"v": "old"})
+            self.assertEqual(crypto_utils.decrypt_json(new), {"v": "new"})
+        with self.assertRaisesMessage(RuntimeError, "Unknown encryption key id '2'"):
+            crypto_utils.decrypt_json(new)
+
+    def test_legacy_single_key_setting(self):
+        with self.settings(ENCRYPTION_KEYS_B64={}, ENCRYPTION_KEY_ID="", ENCRYPTION_KEY_B64=NEW_KEY):
+            payload = crypto_utils.encrypt_json({"v": 1})["payload"]
+            self.assertEqual(payload["kid"], "1")
+            self.assertEqual(crypto_utils.decrypt_json(payload), {"v": 1})
+
+    def test_invalid_configuration_is_rejected(self):
+        for overrides, message in [
+            ({"ENCRYPTION_KEYS_B64": {"1": base64.b64encode(b"short").decode()}}, "32 bytes"),
+            ({"ENCRYPTION_KEY_ID": "9"}, "not in the key ring"),
+            ({"ENCRYPTION_KEYS_B64": {}}, "not set"),
+        ]:
+            with self.subTest(overrides=overrides), self.settings(**overrides):
+                with self.assertRaisesMessage(RuntimeError, message):
+                    crypto_utils.get_keyring()
+
+
+class TaskIncludeTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = [Task.objects.create(title=f"t{i}", owner=self.user) for i in range(3)]
+        for task in self.tasks[:2]:
+            for i in range(4):
+                TaskComment.objects.create(task=task, author=self.user, content=f"{task.title}-c{i}")
+
+    def test_comment_stats_and_latest_comments(self):
+        response = self.client.get(
+            "/api/tasks/", {"include": "comment_stats,latest_comments", "latest_comments": 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([item["comment_count"] for item in results], [4, 4, 0])
+        self.assertEqual(
+            [[c["content"] for c in item["latest_comments"]] for item in results],
+            [["t0-c3", "t0-c2"], ["t1-c3", "t1-c2"], []],
+        )
+
+    def list_queries(self):
+        caches["tasks"].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/?include=comment_stats,latest_comments")
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_includes_do_not_query_per_task(self):
+        self.list_queries()  # kullanıcı/oturum cache'leri ısınsın
+        before = self.list_queries()
+        for i in range(10):
+            task = Task.objects.create(title=f"more{i}", owner=self.user)
+            TaskComment.objects.create(task=task, author=self.user, content="c")
+        self.assertEqual(self.list_queries(), before)
+
+    def test_comment_writes_refresh_cached_includes(self):
+        url = "/api/tasks/?include=comment_stats"
+        etag = self.client.get(url)["ETag"]
+        plain_etag = self.client.get("/api/tasks/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/tasks/{self.tasks[2].id}/comments/", {"content": "new"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][2]["comment_count"], 1)
+        # Yorum içermeyen listeler etkilenmez
+        self.assertEqual(
+            self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=plain_etag).status_code, 304
+        )
+
+    def test_invalid_include_parameters(self):
+        for params, key in [
+            ({"include": "owner"}, "include"),
+            ({"latest_comments": "0"}, "latest_comments"),
+            ({"latest_comments": "21"}, "latest_comments"),
+            ({"latest_comments": "²"}, "latest_comments"),
+            ({"latest_comments": "x"}, "latest_comments"),
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get("/api/tasks/", {"include": "latest_comments", **params})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(key, response.json())
+
+
+class RequestMetricsTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        Task.objects.create(title="t", owner=self.user)
+
+    def histogram(self, name, route, method="GET"):
+        return registry._histograms[(name, (route, method))]
+
+    def test_requests_are_recorded_per_route_with_query_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/tasks/")
+        # Sonraki istekler request_started ile sorgu logunu sıfırlar
+        list_queries = len(queries)
+        self.client.post("/api/tasks/", {"title": "x"}, format="json")
+        self.client.get("/api/does-not-exist/")
+
+        listed = self.histogram("http_request_db_queries", "tasks-list")
+        self.assertEqual((listed.count, listed.sum), (1, list_queries))
+        self.assertEqual(self.histogram("http_request_duration_seconds", "tasks-list", "POST").count, 1)
+        self.assertEqual(self.histogram("http_request_db_queries", "unresolved").count, 1)
+        self.assertGreater(self.histogram("http_request_serializer_seconds", "tasks-list", "POST").sum, 0)
+
+    @override_settings(QUERY_COUNT_BUDGETS={"tasks-list": 0})
+    def test_query_budget_overrun_is_logged_and_counted(self):
+        with self.assertLogs("accounts.metrics", "WARNING") as logs:
+            self.client.get("/api/tasks/")
+        self.assertIn("Query budget exceeded on GET /api/tasks/ (tasks-list)", logs.output[0])
+        self.assertEqual(registry.budget_exceeded, {("tasks-list", "GET"): 1})
+
+    def test_metrics_endpoint_is_staff_only_prometheus_text(self):
+        self.client.get("/api/tasks/")
+        self.assertEqual(self.client.get("/api/_metrics").status_code, 403)
+        self.client.force_login(self.staff)
+        response = self.client.get("/api/_metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('http_request_db_queries_count{route="tasks-list",method="GET"} 1', body)
+        self.assertIn("task_list_cache_misses_total", body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+        for value in (0, 3, 9):
+            histogram.observe(value)
+        self.assertEqual((histogram.counts, histogram.count, histogram.sum), ([1, 2], 3, 12))
+
+
+def _invalidate_user_row(user_id):
+    # Başka bir worker process'inin post_save sinyali
+    user_cache.invalidate(user_id)
+
+
+class CachedUserBackendTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.user = User.objects.create_user("a", "a@x.com", PASSWORD)
+        self.backend = CachedModelBackend()
+
+    def test_user_row_is_served_from_the_cache(self):
+        self.backend.get_user(self.user.id)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.id)
+        self.assertEqual(user.username, "a")
+        # Her çağrı kendi nesnesini alır
+        self.assertIsNot(user, self.backend.get_user(self.user.id))
+
+    def test_saves_invalidate_the_row(self):
+        self.backend.get_user(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("new-password!!")
+            self.user.save()
+        self.assertTrue(self.backend.get_user(self.user.id).check_password("new-password!!"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+    def test_invalidation_reaches_other_processes(self):
+        with tempfile.TemporaryDirectory() as location, self.settings(
+            CACHES={
+                **settings.CACHES,
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                },
+            }
+        ):
+            self.backend.get_user(self.user.id)
+            # Sinyalsiz yazma: bu process'in cache'i eski satırı tutar
+            User.objects.filter(id=self.user.id).update(is_active=False)
+            self.assertIsNotNone(self.backend.get_user(self.user.id))
+
+            child = multiprocessing.get_context("fork").Process(
+                target=_invalidate_user_row, args=(self.user.id,)
+            )
+            child.start()
+            child.join(10)
+            self.assertEqual(child.exitcode, 0)
+            self.assertIsNone(self.backend.get_user(self.user.id))
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_ttl_zero_disables_the_cache(self):
+        self.backend.get_user(self.user.id)
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.user.id)
+
+
+class GunicornConfigTests(SimpleTestCase):
+    path = os.path.join(settings.BASE_DIR, "gunicorn.conf.py")
+
+    def load(self, **env):
+        with mock.patch.dict(os.environ, env):
+            return runpy.run_path(self.path)
+
+    def test_multiple_workers_refuse_process_local_state(self):
+        config = self.load(WEB_CONCURRENCY="2", DEFAULT_CACHE_BACKEND="locmem")
+        with self.assertRaisesMessage(RuntimeError, "auth user rows"):
+            config["on_starting"](None)
+
+    def test_shared_state_or_single_worker_starts(self):
+        self.load(WEB_CONCURRENCY="1")["on_starting"](None)
+        shared = self.load(
+            WEB_CONCURRENCY="4",
+            DEFAULT_CACHE_BACKEND="redis",
+            TASK_CACHE_BACKEND="redis",
+            REALTIME_REDIS_URL="redis://redis:6379/2",
+        )
+        shared["on_starting"](None)
+
+
+class AsyncViewTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user("b", password=PASSWORD)
+        self.mine = Task.objects.create(title="mine", owner=self.user)
+        self.theirs = Task.objects.create(title="theirs", owner=self.other)
+
+    async def test_anonymous_requests_get_403(self):
+        for url in ["/api/me/", "/api/tasks/", f"/api/tasks/{self.mine.id}/"]:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(
+                    response.json(), {"detail": "Authentication credentials were not provided."}
+                )
+
+    async def test_foreign_or_missing_task_is_404(self):
+        await self.async_client.aforce_login(self.user)
+        for task_id in [self.theirs.id, 999999]:
+            with self.subTest(task_id=task_id):
+                response = await self.async_client.get(f"/api/tasks/{task_id}/")
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {"detail": "No Task matches the given query."})
+
+    async def test_detail_sends_version_etag(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(f"/api/tasks/{self.mine.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], f'"{self.mine.version}"')
+        response = await self.async_client.get(f"/api/tasks/{self.mine.id}/?fields=id,title")
+        self.assertEqual(response.json(), {"id": self.mine.id, "title": "mine"})
+        self.assertFalse(response.has_header("ETag"))
+
+    async def test_invalid_params_are_400(self):
+        await self.async_client.aforce_login(self.user)
+        for url, key in [
+            ("/api/tasks/?state=NOPE", "state"),
+            ("/api/tasks/?fields=id,nope", "fields"),
+            ("/api/tasks/?ordering=nope", "ordering"),
+            ("/api/tasks/?include=latest_comments&latest_comments=x", "latest_comments"),
+        ]:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(key, response.json())
+        response = await self.async_client.get("/api/tasks/?cursor=bozuk")
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_and_sync_list_render_the_same_bytes(self):
+        TaskComment.objects.create(task=self.mine, author=self.user, content="c")
+        factory = APIRequestFactory()
+        for url, view, kwargs in [
+            ("/api/tasks/?include=comment_stats,latest_comments", TaskViewSet, {}),
+            ("/api/tasks/?ordering=-title&fields=id,title", TaskViewSet, {}),
+            (f"/api/tasks/{self.mine.id}/comments/", TaskCommentViewSet, {"task_id": self.mine.id}),
+        ]:
+            with self.subTest(url=url):
+                caches["tasks"].clear()
+                expected = self.client.get(url).content
+                caches["tasks"].clear()
+                request = factory.get(url)
+                force_authenticate(request, self.user)
+                response = view.as_view({"get": "list"})(request, **kwargs)
+                if hasattr(response, "render"):
+                    # yorum thread'i cache'ten hazır HttpResponse olarak gelir
+                    response.render()
+                self.assertEqual(response.content, expected)
+
+    def test_writes_fall_through_to_the_sync_viewset(self):
+        response = self.client.patch(
+            f"/api/tasks/{self.mine.id}/", {"title": "yeni"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "yeni")
+
+    @override_settings(ASYNC_DB_MAX_CONNECTIONS=1)
+    async def test_db_slot_serializes_requests(self):
+        active = []
+        peak = 0
+
+        async def hold():
+            nonlocal peak
+            async with db_slot():
+                active.append(1)
+                peak = max(peak, len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+        await asyncio.gather(*(hold() for _ in range(3)))
+        self.assertEqual(peak, 1)
+
+
+class FakePool:
+    def get_stats(self):
+        return {
+            "pool_min": 2,
+            "pool_max": 4,
+            "pool_size": 4,
+            "pool_available": 0,
+            "requests_waiting": 3,
+            "requests_num": 40,
+            "requests_wait_ms": 120,
+        }
+
+
+class DatabasePoolTests(ApiTestCase):
+    settings_path = os.path.join(settings.BASE_DIR, "backend_project", "settings.py")
+
+    def load_settings(self, **env):
+        with mock.patch.dict(os.environ, {"DB_ENGINE": "postgresql", **env}):
+            return runpy.run_path(self.settings_path)
+
+    def test_pool_is_configured_from_the_environment(self):
+        config = self.load_settings(DB_POOL_MAX_SIZE="4", DB_POOL_TIMEOUT="2.5")
+        database = config["DATABASES"]["default"]
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 4)
+        self.assertEqual(database["OPTIONS"]["pool"]["timeout"], 2.5)
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["ASYNC_DB_MAX_CONNECTIONS"], 4)
+
+    def test_pool_can_be_disabled(self):
+        database = self.load_settings(DB_POOL="0", DB_CONN_MAX_AGE="60")["DATABASES"]["default"]
+        self.assertNotIn("pool", database["OPTIONS"])
+        self.assertEqual(database["CONN_MAX_AGE"], 60)
+
+    def test_no_pool_no_samples(self):
+        self.assertEqual(pool_samples(), [])
+
+    def test_pool_stats_are_exposed_as_gauges_and_counters(self):
+        with mock.patch.object(connections["default"], "pool", FakePool(), create=True):
+            samples = pool_samples()
+            self.client.force_login(self.staff)
+            body = self.client.get("/api/_metrics").content.decode()
+        self.assertIn(("db_pool_available", "gauge", {"alias": "default"}, 0), samples)
+        self.assertIn(("db_pool_requests_num_total", "counter", {"alias": "default"}, 40), samples)
+        self.assertEqual([sample[0] for sample in samples], sorted(sample[0] for sample in samples))
+        self.assertIn("# TYPE db_pool_requests_waiting gauge", body)
+        self.assertIn('db_pool_requests_wait_ms_total{alias="default"} 120', body)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["accounts.hashers.Argon2PasswordHasher"],
+    ARGON2_TIME_COST=1,
+    ARGON2_MEMORY_COST=1024,
+    ARGON2_PARALLELISM=1,
+)
+class PasswordHasherTests(SimpleTestCase):
+    def test_argon2_costs_come_from_settings(self):
+        encoded = make_password(PASSWORD)
+        self.assertIn("$m=1024,t=1,p=1$", encoded)
+        self.assertTrue(check_password(PASSWORD, encoded))
+        hasher = get_hasher()
+        self.assertFalse(hasher.must_update(encoded))
+        with self.settings(ARGON2_TIME_COST=2):
+            self.assertTrue(hasher.must_update(encoded))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkRegisterCommandTests(TestCase):
+    def setUp(self):
+        User.objects.create_user("taken", email="taken@example.com", password=PASSWORD)
+
+    def run_command(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, encoding="utf-8", delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("bulk_register", f.name, "--workers=1", *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue().splitlines()
+
+    def test_csv_rows_are_validated_and_deduplicated_across_batches(self):
+        content = (
+            "username,email,password\n"
+            f"u1,u1@example.com,{PASSWORD}\n"
+            f"u2,u2@example.com,{PASSWORD}\n"
+            f"u1,other@example.com,{PASSWORD}\n"
+            f"taken,u3@example.com,{PASSWORD}\n"
+            f"u4,not-an-email,{PASSWORD}\n"
+        )
+        out, errors = self.run_command(content, ".csv", "--batch-size=2")
+        self.assertIn("Created 2 user(s); 3 row(s) rejected.", out)
+        self.assertEqual([line.split(":")[0] for line in errors], ["line 4", "line 5", "line 6"])
+        self.assertIn("username", errors[0])
+        user = User.objects.get(username="u1")
+        self.assertEqual(user.email, "u1@example.com")
+        self.assertTrue(user.check_password(PASSWORD))
+
+    def test_ndjson_rejects_non_objects(self):
+        row = json.dumps({"username": "nd", "email": "nd@example.com", "password": PASSWORD})
+        out, errors = self.run_command(f"{row}\nnot json\n\n[1]\n", ".ndjson")
+        self.assertIn("Created 1 user(s); 2 row(s) rejected.", out)
+        rejected = '{"detail": "Expected a JSON object."}'
+        self.assertEqual(errors, [f"line 2: {rejected}", f"line 4: {rejected}"])
+
+    def test_dry_run_writes_nothing(self):
+        content = f"username,email,password\nu1,u1@example.com,{PASSWORD}\n"
+        out, _ = self.run_command(content, ".csv", "--dry-run")
+        self.assertIn("Would create 1 user(s); 0 row(s) rejected.", out)
+        self.assertFalse(User.objects.filter(username="u1").exists())
+
+    def test_unknown_extension_needs_format(self):
+        with self.assertRaisesMessage(CommandError, "pass --format"):
+            self.run_command("", ".txt")
+
+
+@override_settings(
+    LOGIN_THROTTLE_STORE={"BACKEND": "accounts.throttling.InMemoryCounterStore"},
+    LOGIN_THROTTLE_ACCOUNT_RATE="3/min",
+    LOGIN_THROTTLE_IP_RATE="100/min",
+)
+class LoginThrottleTests(APITestCase):
+    def setUp(self):
+        # Her test boş sayaçlarla başlasın
+        throttling.reset_counter_store(setting="LOGIN_THROTTLE_STORE")
+        User.objects.create_user("a", "a@x.com", PASSWORD)
+
+    def login(self, password):
+        return self.client.post("/api/login/", {"username": "a", "password": password}, format="json")
+
+    def test_account_is_locked_after_failed_attempts(self):
+        for _ in range(3):
+            self.assertEqual(self.login("wrong").status_code, 401)
+        response = self.login(PASSWORD)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+    def test_successful_login_resets_the_account_counter(self):
+        for _ in range(2):
+            self.assertEqual(self.login("wrong").status_code, 401)
+        self.assertEqual(self.login(PASSWORD).status_code, 200)
+        for _ in range(3):
+            self.assertEqual(self.login("wrong").status_code, 401)
+        self.assertEqual(self.login("wrong").status_code, 429)
+
+    @override_settings(LOGIN_THROTTLE_IP_RATE="2/min")
+    def test_ip_limit_counts_every_attempt(self):
+        self.assertEqual(self.login(PASSWORD).status_code, 200)
+        self.assertEqual(self.login(PASSWORD).status_code, 200)
+        self.assertEqual(self.login(PASSWORD).status_code, 429)
+
+
+
+class ConditionalUpdateTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title="t", owner=self.user)
+        self.url = f"/api/tasks/{self.task.id}/"
+        self.data = {"title": "new", "state": "TODO"}
+
+    def test_matching_version_updates_and_returns_new_etag(self):
+        response = self.client.put(
+            self.url, self.data, format="json", HTTP_IF_MATCH=f'"{self.task.version}"'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "new")
+        self.assertEqual(response["ETag"], f'"{self.task.version}"')
+
+    def test_stale_version_returns_412_with_current_task(self):
+        stale = self.task.version
+        Task.objects.filter(id=self.task.id).update(
+            title="other", updated_at=self.task.updated_at + timedelta(seconds=1)
+        )
+        response = self.client.put(self.url, self.data, format="json", HTTP_IF_MATCH=f'"{stale}"')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()["title"], "other")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "other")
+        self.assertEqual(response["ETag"], f'"{self.task.version}"')
+
+    def test_without_if_match_writes_unconditionally(self):
+        response = self.client.put(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, 200)
+
+
+
+    def test_weak_list_and_wildcard_tags_match(self):
+        response = self.client.patch(
+            self.url, {"title": "x"}, format="json", HTTP_IF_MATCH=f'"0", "{self.task.version}"'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(self.url, {"title": "y"}, format="json", HTTP_IF_MATCH="*")
+        self.assertEqual(response.status_code, 200)
+
+    def test_save_refuses_a_row_changed_since_it_was_read(self):
+        Task.objects.filter(id=self.task.id).update(
+            updated_at=self.task.updated_at + timedelta(seconds=1)
+        )
+        self.task.expected_updated_at = self.task.updated_at
+        self.task.title = "lost update"
+        with self.assertRaises(TaskVersionConflict), transaction.atomic():
+            self.task.save()
+        self.assertEqual(Task.objects.get(id=self.task.id).title, "t")
+
+
+class TaskCounterTests(ApiTestCase):
+    def assertCountersMatch(self):
+        expected = {
+            (row["owner_id"], row["state"]): row["count"]
+            for row in Task.objects.values("owner_id", "state").annotate(count=Count("id")).order_by()
+        }
+        actual = {
+            (counter.owner_id, counter.state): counter.count
+            for counter in TaskCounter.objects.filter(count__gt=0)
+        }
+        self.assertEqual(actual, expected)
+
+    def test_counters_follow_bulk_operations(self):
+        self.client.force_login(self.staff)
+        response = self.client.post(
+            "/api/tasks/bulk/",
+            [{"title": f"t{i}", "state": "TODO", "owner": self.user.id} for i in range(4)],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        ids = [result["id"] for result in response.json()["results"]]
+        self.assertCountersMatch()
+
+        response = self.client.patch(
+            "/api/tasks/bulk/",
+            [
+                {"id": ids[0], "state": "DONE"},
+                {"id": ids[1], "state": "DONE", "owner": self.staff.id},
+                {"id": ids[2], "title": "renamed"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatch()
+
+        response = self.client.delete("/api/tasks/bulk/", {"ids": ids[1:3]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatch()
+        self.assertEqual(
+            self.client.get("/api/tasks/stats/").json()["by_state"],
+            {"TODO": 1, "IN_PROGRESS": 0, "BLOCKED": 0, "DONE": 1},
+        )
+
+    def test_failed_bulk_update_leaves_counters_untouched(self):
+        task = Task.objects.create(title="t", owner=self.user)
+        response = self.client.patch(
+            "/api/tasks/bulk/",
+            [{"id": task.id, "state": "DONE"}, {"id": task.id + 1000, "state": "DONE"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertCountersMatch()
+        self.assertEqual(TaskCounter.objects.get(owner=self.user, state="TODO").count, 1)
+
+
+
+    def test_counters_follow_single_task_writes(self):
+        response = self.client.post("/api/tasks/", {"title": "t"}, format="json")
+        task_id = response.json()["id"]
+        self.client.patch(f"/api/tasks/{task_id}/", {"state": "BLOCKED"}, format="json")
+        self.assertCountersMatch()
+        self.client.delete(f"/api/tasks/{task_id}/")
+        self.assertCountersMatch()
+        self.assertFalse(TaskCounter.objects.filter(count__gt=0).exists())
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(title="t", owner=self.user, state="DONE")
+        TaskCounter.objects.update(count=7)
+        out = io.StringIO()
+        call_command("rebuild_task_counters", stdout=out)
+        self.assertIn("Rebuilt", out.getvalue())
+        self.assertCountersMatch()
+
+
+
+# DatabaseQueue testleri için; ilk FLAKY_FAILURES çağrı hata verir
+FLAKY_CALLS = []
+FLAKY_FAILURES = 1
+
+
+@jobs.job("accounts.tests.flaky")
+def flaky_job(value):
+    FLAKY_CALLS.append(value)
+    if len(FLAKY_CALLS) <= FLAKY_FAILURES:
+        raise RuntimeError("flaky")
+
+
+@override_settings(JOBS_QUEUE={"BACKEND": "accounts.jobs.DatabaseQueue"})
+class DatabaseQueueTests(TestCase):
+    def setUp(self):
+        FLAKY_CALLS.clear()
+        self.queue = jobs.DatabaseQueue(retry_delay=0, max_attempts=2)
+
+    def test_enqueue_writes_a_row_instead_of_running(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.enqueue("accounts.tests.flaky", value=1)
+        self.assertEqual(FLAKY_CALLS, [])
+        self.assertEqual(Job.objects.get(id=job.id).status, Job.QUEUED)
+
+    def test_unknown_job_is_rejected(self):
+        with self.assertRaises(LookupError):
+            jobs.enqueue("accounts.tests.missing")
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        self.queue.enqueue("accounts.tests.flaky", {"value": 1})
+        self.assertEqual(len(self.queue.claim("w1")), 1)
+        self.assertEqual(self.queue.claim("w2"), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.enqueue("accounts.tests.flaky", {"value": 1})
+        [claimed] = self.queue.claim("w1")
+        Job.objects.filter(id=claimed.id).update(locked_at=timezone.now() - timedelta(seconds=301))
+        [reclaimed] = self.queue.claim("w2")
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (claimed.id, 2))
+
+    def test_failed_job_is_retried_then_removed(self):
+        self.queue.enqueue("accounts.tests.flaky", {"value": 1})
+        [claimed] = self.queue.claim("w1")
+        with self.assertLogs("accounts.jobs", "ERROR"):
+            self.assertFalse(self.queue.run(claimed))
+        job = Job.objects.get(id=claimed.id)
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.QUEUED, 1, ""))
+        self.assertIn("RuntimeError", job.last_error)
+
+        [claimed] = self.queue.claim("w1")
+        self.assertTrue(self.queue.run(claimed))
+        self.assertFalse(Job.objects.filter(id=claimed.id).exists())
+        self.assertEqual(FLAKY_CALLS, [1, 1])
+
+    def test_job_fails_after_max_attempts(self):
+        queue = jobs.DatabaseQueue(retry_delay=0, max_attempts=1)
+        queue.enqueue("accounts.tests.flaky", {"value": 1})
+        [claimed] = queue.claim("w1")
+        with self.assertLogs("accounts.jobs", "ERROR"):
+            self.assertFalse(queue.run(claimed))
+        self.assertEqual(Job.objects.get(id=claimed.id).status, Job.FAILED)
+        self.assertEqual(queue.claim("w1"), [])
+
+
+
+
+@override_settings(JOBS_QUEUE={"BACKEND": "accounts.jobs.ImmediateQueue"})
+class ImmediateQueueTests(TestCase):
+    def setUp(self):
+        FLAKY_CALLS.clear()
+
+    def test_job_runs_after_commit_and_raises_to_the_caller(self):
+        with self.assertRaisesMessage(RuntimeError, "flaky"):
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue("accounts.tests.flaky", value=7)
+                self.assertEqual(FLAKY_CALLS, [])
+        self.assertEqual(FLAKY_CALLS, [7])
+        self.assertFalse(Job.objects.exists())
+
+
+class CompactRowsTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        first = Task.objects.create(title="ş \"q\" </script> ", description=None, owner=self.user)
+        Task.objects.create(title="b", description="d", state="DONE", owner=self.staff)
+        for i in range(3):
+            TaskComment.objects.create(task=first, author=self.staff, content=f"c{i}")
+
+    def assertSameJson(self, rows, expected):
+        # Alan sırası dahil: render edilmiş byte'lar da DRF'inkiyle aynı olmalı
+        self.assertEqual(
+            [list(row.items()) for row in rows], [list(row.items()) for row in expected]
+        )
+        self.assertEqual(JSONRenderer().render(rows), renderers.JSONRenderer().render(expected))
+
+    def test_task_rows_match_the_serializer(self):
+        tasks = list(Task.objects.select_related("owner").order_by("id"))
+        for fields in [None, ["state", "id"], ["owner_username", "version", "description"]]:
+            with self.subTest(fields=fields):
+                rows = task_rows(list(task_values(Task.objects.order_by("id"), fields)), fields)
+                self.assertSameJson(rows, TaskSerializer(tasks, many=True, fields=fields).data)
+
+    def test_task_rows_with_includes_match_the_serializer(self):
+        tasks = list(Task.objects.select_related("owner").order_by("id"))
+        counts = comment_counts([task.id for task in tasks])
+        latest = list(latest_comments_queryset(2).select_related("author"))
+        for task in tasks:
+            task.comment_count = counts.get(task.id, 0)
+            task.latest_comments = [comment for comment in latest if comment.task_id == task.id]
+        include = ("comment_stats", "latest_comments")
+        rows = task_rows(list(task_values(Task.objects.order_by("id"))), None, include, 2)
+        self.assertSameJson(rows, TaskSerializer(tasks, many=True, include=include).data)
+
+    def test_comment_rows_match_the_serializer(self):
+        comments = TaskComment.objects.select_related("author").order_by("created_at", "id")
+        rows = comment_rows(list(comment_values(TaskComment.objects.order_by("created_at", "id"))))
+        self.assertSameJson(rows, TaskCommentSerializer(comments, many=True).data)
+
+    def test_renderer_output_matches_drf(self):
+        for data in [
+            {1: timezone.now(), "sep": "a\u2028b\u2029", "none": None},
+            # orjson 64 bit'i aşan tamsayıyı reddeder, DRF yoluna düşülür
+            {"big": 2**70},
+        ]:
+            with self.subTest(data=data):
+                self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+
+
+class ArchiveTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.old = Task.objects.create(title="old", owner=self.user, state="DONE")
+        TaskComment.objects.create(task=self.old, author=self.user, content="kept")
+        self.recent = Task.objects.create(title="recent", owner=self.user, state="DONE")
+        self.open = Task.objects.create(title="open", owner=self.user)
+        # Uzun süre önce bitmiş ama yakın zamanda düzenlenmiş; sadece done_at sayılır
+        Task.objects.filter(id=self.old.id).update(done_at=timezone.now() - timedelta(days=200))
+        Task.objects.filter(id=self.recent.id).update(
+            updated_at=timezone.now() - timedelta(days=200)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_done_tasks(days=90), (1, 1))
+
+    def ids(self, url):
+        return [item["id"] for item in self.client.get(url).json()["results"]]
+
+    def test_archived_task_leaves_the_default_list(self):
+        self.assertEqual(self.ids("/api/tasks/"), [self.recent.id, self.open.id])
+        self.assertEqual(
+            self.ids("/api/tasks/?include_archived=1"), [self.old.id, self.recent.id, self.open.id]
+        )
+
+    def test_archived_task_and_comments_are_readable_with_include_archived(self):
+        self.assertEqual(self.client.get(f"/api/tasks/{self.old.id}/").status_code, 404)
+        response = self.client.get(f"/api/tasks/{self.old.id}/?include_archived=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "old")
+
+        response = self.client.get(f"/api/tasks/{self.old.id}/comments/?include_archived=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["content"] for item in response.json()["results"]], ["kept"])
+
+    def test_archived_tasks_stay_in_stats(self):
+        self.assertEqual(self.client.get("/api/tasks/stats/").json()["total"], 3)
+
+    def test_other_users_cannot_read_archived_tasks(self):
+        self.client.force_login(User.objects.create_user("b", "b@x.com", PASSWORD))
+        response = self.client.get(f"/api/tasks/{self.old.id}/?include_archived=1")
+        self.assertEqual(response.status_code, 404)
+
+
+class DoneAtBackfillTests(TestCase):
+    migration = import_module("accounts.migrations.0010_backfill_done_at")
+
+    def test_backfill_runs_in_batches_and_keeps_existing_values(self):
+        user = User.objects.create_user("a", password=PASSWORD)
+        done = [Task.objects.create(title=f"t{i}", owner=user, state="DONE") for i in range(5)]
+        Task.objects.create(title="open", owner=user)
+        kept = timezone.now() - timedelta(days=3)
+        Task.objects.filter(id__in=[task.id for task in done[1:]]).update(done_at=None)
+        Task.objects.filter(id=done[0].id).update(done_at=kept)
+
+        # Task: 2 batch (SELECT id + UPDATE) ve boş son okuma; ArchivedTask: boş okuma
+        with mock.patch.object(self.migration, "BATCH_SIZE", 2), self.assertNumQueries(6):
+            self.migration.backfill_done_at(django_apps, None)
+
+        rows = dict(Task.objects.filter(state="DONE").values_list("id", "done_at"))
+        self.assertEqual(rows.pop(done[0].id), kept)
+        for task in done[1:]:
+            self.assertEqual(rows[task.id], Task.objects.get(id=task.id).updated_at)
+        self.assertIsNone(Task.objects.get(title="open").done_at)
+
+
+@override_settings(COMMENT_THREAD_CHUNK_SIZE=2)
+class CommentThreadTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title="t", owner=self.user)
+        self.url = f"/api/tasks/{self.task.id}/comments/"
+        self.comments = [self.comment(f"c{i}") for i in range(5)]
+
+    def comment(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TaskComment.objects.create(task=self.task, author=self.user, content=content)
+
+    def contents(self, url=None):
+        return [item["content"] for item in self.client.get(url or self.url).json()["results"]]
+
+    def test_after_links_walk_the_whole_thread(self):
+        seen, url = [], f"{self.url}?page_size=2"
+        while url:
+            body = self.client.get(url).json()
+            seen += [item["content"] for item in body["results"]]
+            url = body["next"]
+        self.assertEqual(seen, [f"c{i}" for i in range(5)])
+        rows = comment_rows(list(comment_values(TaskComment.objects.order_by("created_at", "id"))))
+        self.assertEqual(self.client.get(self.url).json()["results"], json.loads(json.dumps(rows)))
+
+    def test_after_accepts_a_comment_id_even_if_it_was_deleted(self):
+        after = self.comments[1].id
+        self.assertEqual(self.contents(f"{self.url}?after={after}"), ["c2", "c3", "c4"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.comments[1].delete()
+        self.assertEqual(self.contents(f"{self.url}?after={after}"), ["c2", "c3", "c4"])
+        self.assertEqual(self.client.get(f"{self.url}?after=x_y").status_code, 404)
+
+    def test_writes_patch_the_cached_thread_without_a_rebuild(self):
+        self.contents()
+        with mock.patch.object(threads, "rebuild", wraps=threads.rebuild) as rebuild:
+            self.comment("c5")
+            with self.captureOnCommitCallbacks(execute=True):
+                self.comments[0].content = "edited"
+                self.comments[0].save()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.comments[2].delete()
+            self.assertEqual(self.contents(), ["edited", "c1", "c3", "c4", "c5"])
+        rebuild.assert_not_called()
+
+    def test_username_change_rebuilds_every_thread(self):
+        self.contents()
+        self.user.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        results = self.client.get(self.url).json()["results"]
+        self.assertEqual({item["author_username"] for item in results}, {"renamed"})
+
+    def test_signal_less_writes_invalidate_the_thread(self):
+        self.contents()
+        TaskComment.objects.filter(id=self.comments[0].id).delete()
+        threads.invalidate(self.task.id)
+        self.assertEqual(self.contents(), ["c1", "c2", "c3", "c4"])
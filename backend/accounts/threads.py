@@ -0,0 +1,345 @@
+"""
+Task başına önceden serialize edilmiş yorum thread'i (cache'te, parça parça).
+
+Thread (created_at, id) sırasındaki yorumların render edilmiş JSON'larıdır;
+COMMENT_THREAD_CHUNK_SIZE'lık parçalara bölünür. Bir sayfa okumak sadece
+ilgili parça(lar)ı okur, thread ne kadar uzun olursa olsun sabit maliyetlidir.
+Yeni yorum sadece son parçayı, düzenleme/silme sadece yorumun parçasını
+yeniden yazar (bkz. accounts.signals).
+
+Anahtarlar:
+  thread:<task>:gen    her yazmada artan sayaç
+  thread:<task>:meta   {"gen", "epoch", "chunks": [[son anahtar, adet, parça adı], ...]}
+  thread:<task>:chunk:<parça adı>   [[anahtar, yorum JSON'u], ...]; yazıldıktan
+                                    sonra değişmez, her yazma yeni adla yazar
+
+meta'daki gen güncel sayaçtan farklıysa (kaçan ya da yarışan bir yazma) ya
+da epoch değiştiyse (kullanıcı adı değişikliği) thread veritabanından
+yeniden kurulur; yarışan yazmalar eski veri döndürmez, sadece yeniden kurulum yaptırır.
+"""
+
+import bisect
+import secrets
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .archive import include_archived
+from .cache import task_cache
+from .compact import comment_rows, comment_values
+from .models import EPOCH, TaskComment
+from .pagination import TaskCommentPagination
+from .renderers import JSONRenderer
+
+EPOCH_KEY = "thread:epoch"
+
+
+def _gen_key(task_id):
+    return f"thread:{task_id}:gen"
+
+
+def _meta_key(task_id):
+    return f"thread:{task_id}:meta"
+
+
+def _chunk_key(task_id, name):
+    return f"thread:{task_id}:chunk:{name}"
+
+
+def _chunk_name(gen, index):
+    # Aynı gen'de yarışan iki yazma birbirinin parçasının üzerine yazmasın
+    return f"{gen}.{index}.{secrets.token_hex(4)}"
+
+
+def _timeout():
+    return getattr(settings, "COMMENT_THREAD_CACHE_TIMEOUT", 60)
+
+
+def _chunk_size():
+    return getattr(settings, "COMMENT_THREAD_CHUNK_SIZE", 200)
+
+
+def comment_key(created_at, comment_id):
+    """Thread sırası: (created_at mikrosaniye, id)."""
+    return [(created_at - EPOCH) // timedelta(microseconds=1), comment_id]
+
+
+def _render(item):
+    return JSONRenderer().render(item)
+
+
+def _get_or_create(cache, key):
+    value = cache.get(key)
+    if value is None:
+        # Anahtar düşüp yeniden oluşursa eski değerlerle çakışmasın
+        value = time.time_ns()
+        if not cache.add(key, value, timeout=None):
+            value = cache.get(key, value)
+    return value
+
+
+def invalidate_all():
+    """Tüm thread'leri geçersiz kılar (ör. yorumlarda görünen kullanıcı adı değişti)."""
+    task_cache().set(EPOCH_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate(*task_ids):
+    """Raw DELETE / arşivleme gibi sinyalsiz toplu yazmalardan sonra."""
+    cache = task_cache()
+    for task_id in task_ids:
+        try:
+            cache.incr(_gen_key(task_id))
+        except ValueError:
+            pass
+    cache.delete_many([_meta_key(task_id) for task_id in task_ids])
+
+
+def thread_queryset(task_id):
+    """Thread'in veritabanından okunduğu sorgu (explain_querysets de bunu ölçer)."""
+    return comment_values(TaskComment.objects.filter(task_id=task_id).order_by("created_at", "id"))
+
+
+def rebuild(task_id):
+    """Thread'i veritabanından kurar. Dönen değer: (meta, {parça anahtarı: parça})"""
+    cache = task_cache()
+    # Sayaç sorgudan önce okunur: arada gelen yazma meta'yı bayat işaretler
+    gen = _get_or_create(cache, _gen_key(task_id))
+    epoch = _get_or_create(cache, EPOCH_KEY)
+    rows = list(thread_queryset(task_id))
+    entries = [
+        [comment_key(row["created_at"], row["id"]), _render(item)]
+        for row, item in zip(rows, comment_rows(rows))
+    ]
+
+    size = _chunk_size()
+    chunks, values = [], {}
+    for index in range(0, len(entries), size):
+        part = entries[index : index + size]
+        name = _chunk_name(gen, index // size)
+        chunks.append([part[-1][0], len(part), name])
+        values[_chunk_key(task_id, name)] = part
+    meta = {"gen": gen, "epoch": epoch, "chunks": chunks}
+    cache.set_many({**values, _meta_key(task_id): meta}, timeout=_timeout())
+    return meta, values
+
+
+def _fresh(meta, gen, epoch):
+    return meta is not None and meta["gen"] == gen and meta["epoch"] == epoch
+
+
+def _window(meta, after_key, limit):
+    """after_key'den sonraki limit + 1 yorumu kapsayan parçalar."""
+    chunks = meta["chunks"]
+    start = 0
+    if after_key is not None:
+        start = bisect.bisect_right([chunk[0] for chunk in chunks], after_key)
+    names, total = [], 0
+    for last_key, count, name in chunks[start:]:
+        names.append(name)
+        # İlk parçadaki yorumların bir kısmı after_key'den önce olabilir, sayılmaz
+        if after_key is None or len(names) > 1:
+            total += count
+        if total > limit:
+            break
+    return names
+
+
+def _slice(parts, after_key, limit):
+    entries = [entry for part in parts for entry in part]
+    if after_key is not None:
+        entries = [entry for entry in entries if entry[0] > after_key]
+    return entries[: limit + 1]
+
+
+def read(task_id, after_key, limit):
+    """
+    after_key'den sonraki en fazla limit + 1 [anahtar, yorum JSON'u];
+    limit'ten fazlası sonraki sayfa olduğunu gösterir.
+    """
+    cache = task_cache()
+    keys = [_gen_key(task_id), EPOCH_KEY, _meta_key(task_id)]
+    found = cache.get_many(keys)
+    meta = found.get(keys[2])
+    if _fresh(meta, found.get(keys[0]), found.get(keys[1])):
+        chunk_keys = [_chunk_key(task_id, name) for name in _window(meta, after_key, limit)]
+        parts = cache.get_many(chunk_keys)
+        if len(parts) == len(chunk_keys):
+            return _slice([parts[key] for key in chunk_keys], after_key, limit)
+    # Bayat ya da bir parçası düşmüş: yeniden kurulan parçalardan okunur
+    meta, parts = rebuild(task_id)
+    chunk_keys = [_chunk_key(task_id, name) for name in _window(meta, after_key, limit)]
+    return _slice([parts[key] for key in chunk_keys], after_key, limit)
+
+
+def _update(task_id, change):
+    """
+    change(meta, cache, gen) -> (yeni meta, {parça anahtarı: parça}) ya da None.
+    None ya da yarışan bir yazma görülürse meta silinir; sonraki okuma yeniden kurar.
+    """
+    cache = task_cache()
+    try:
+        gen = cache.incr(_gen_key(task_id))
+    except ValueError:
+        # Sayaç yok: thread hiç kurulmamış ya da düşmüş
+        return
+    meta = cache.get(_meta_key(task_id))
+    result = None
+    if meta is not None and meta["gen"] == gen - 1:
+        result = change(meta, cache, gen)
+    if result is None:
+        cache.delete(_meta_key(task_id))
+        return
+    meta, values = result
+    meta["gen"] = gen
+    values[_meta_key(task_id)] = meta
+    cache.set_many(values, timeout=_timeout())
+
+
+def _locate(meta, cache, task_id, key):
+    """(parça indeksi, parça, parça içindeki indeks) ya da None."""
+    chunks = meta["chunks"]
+    index = bisect.bisect_left([chunk[0] for chunk in chunks], key)
+    if index == len(chunks):
+        return None
+    part = cache.get(_chunk_key(task_id, chunks[index][2]))
+    if part is None:
+        return None
+    for position, entry in enumerate(part):
+        if entry[0] == key:
+            return index, part, position
+    return None
+
+
+def append(task_id, key, item):
+    """Yeni yorum: sadece son parça yeniden yazılır (doluysa yeni parça açılır)."""
+    entry = [key, _render(item)]
+
+    def change(meta, cache, gen):
+        chunks = meta["chunks"]
+        if chunks and key <= chunks[-1][0]:
+            # Sıra dışı (eşzamanlı eklenen yorumlar): yeniden kurulsun
+            return None
+        part = []
+        if chunks and chunks[-1][1] < _chunk_size():
+            part = cache.get(_chunk_key(task_id, chunks[-1][2]))
+            if part is None:
+                return None
+            chunks.pop()
+        part = [*part, entry]
+        name = _chunk_name(gen, len(chunks))
+        chunks.append([key, len(part), name])
+        return meta, {_chunk_key(task_id, name): part}
+
+    _update(task_id, change)
+
+
+def replace(task_id, key, item):
+    """Düzenlenen yorum: sadece bulunduğu parça yeniden yazılır."""
+    entry = [key, _render(item)]
+
+    def change(meta, cache, gen):
+        located = _locate(meta, cache, task_id, key)
+        if located is None:
+            return None
+        index, part, position = located
+        part = [*part[:position], entry, *part[position + 1 :]]
+        name = _chunk_name(gen, index)
+        meta["chunks"][index][2] = name
+        return meta, {_chunk_key(task_id, name): part}
+
+    _update(task_id, change)
+
+
+def remove(task_id, key):
+    """Silinen yorum: sadece bulunduğu parça yeniden yazılır (boşalırsa çıkarılır)."""
+
+    def change(meta, cache, gen):
+        located = _locate(meta, cache, task_id, key)
+        if located is None:
+            return None
+        index, part, position = located
+        part = [*part[:position], *part[position + 1 :]]
+        chunks = meta["chunks"]
+        if not part:
+            chunks.pop(index)
+            return meta, {}
+        if index and chunks[index - 1][1] + len(part) <= _chunk_size():
+            # Küçülen parça öncekine katılır; silmeler thread'i parçalamasın
+            previous = cache.get(_chunk_key(task_id, chunks[index - 1][2]))
+            if previous is None:
+                return None
+            chunks.pop(index)
+            index -= 1
+            part = [*previous, *part]
+        name = _chunk_name(gen, index)
+        chunks[index] = [part[-1][0], len(part), name]
+        return meta, {_chunk_key(task_id, name): part}
+
+    _update(task_id, change)
+
+
+def _render_page(request, entries, limit):
+    """
+    TaskCommentPagination ile aynı gövde; yorumlar cache'teki JSON'larıyla
+    birleştirilir. Sonraki sayfa linki son yorumun anahtarını taşır
+    (?after=<created_at µs>_<id>); yorum sonradan silinse de sayfalama bozulmaz.
+    """
+    next_link = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        url = remove_query_param(request.build_absolute_uri(), "cursor")
+        next_link = replace_query_param(url, "after", "{}_{}".format(*entries[-1][0]))
+    return b"".join(
+        [
+            b'{"next":',
+            b"null" if next_link is None else _render(next_link),
+            b',"previous":null,"results":[',
+            b",".join(entry[1] for entry in entries),
+            b"]}",
+        ]
+    )
+
+
+def _after_key(task_id, after):
+    """
+    ?after= değeri: next linklerindeki "<created_at µs>_<id>" ya da yorum id'si.
+    Id'si verilen yorum silinmişse id'si ondan büyük ilk yorumdan devam edilir.
+    """
+    created_at, _, comment_id = after.rpartition("_")
+    try:
+        comment_id = int(comment_id)
+        if created_at:
+            return [int(created_at), comment_id]
+    except ValueError:
+        raise NotFound("Invalid after")
+    comments = TaskComment.objects.filter(task_id=task_id)
+    created_at = comments.filter(id=comment_id).values_list("created_at", flat=True).first()
+    if created_at is not None:
+        return comment_key(created_at, comment_id)
+    following = (
+        comments.filter(id__gt=comment_id)
+        .order_by("created_at", "id")
+        .values_list("created_at", "id")
+        .first()
+    )
+    if following is None:
+        return [float("inf"), 0]
+    # Hemen öncesi: (created_at, id - 1) ile aynı created_at'teki küçük id'ler de atlanır
+    return comment_key(following[0], following[1] - 1)
+
+
+def page(request, task_id):
+    """
+    GET /api/tasks/<task_id>/comments/[?after=...] cevap gövdesi (bytes).
+    ?cursor= ve ?include_archived=1 için None: bunlar veritabanı yolundan okunur.
+    """
+    params = request.query_params
+    if params.get(TaskCommentPagination.cursor_query_param) or include_archived(params):
+        return None
+    limit = TaskCommentPagination().get_page_size(request)
+    after = params.get("after")
+    after_key = _after_key(task_id, after) if after else None
+    return _render_page(request, read(task_id, after_key, limit), limit)
@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+RATE_PATTERN = re.compile(r"^(\d+)/(\d*)([smhd])[a-z]*$")
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """"30/min" -> (30, 60), "10/15m" -> (10, 900)"""
+    match = RATE_PATTERN.match(rate.strip())
+    if match is None:
+        raise ImproperlyConfigured(f"Invalid throttle rate: {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+class InMemoryCounterStore:
+    """Process içi sabit pencereli sayaçlar; testler ve tek process'li geliştirme için."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def incr(self, key, window):
+        now = time.monotonic()
+        with self._lock:
+            count, expires = self._counters.get(key, (0, 0.0))
+            if expires <= now:
+                count, expires = 0, now + window
+            self._counters[key] = (count + 1, expires)
+            return count + 1
+
+    def get(self, key, window):
+        """(sayı, pencerenin bitmesine kalan saniye)"""
+        now = time.monotonic()
+        with self._lock:
+            count, expires = self._counters.get(key, (0, 0.0))
+        if expires <= now:
+            return 0, 0
+        return count, expires - now
+
+    def reset(self, key):
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class CacheCounterStore:
+    """
+    Django cache üzerinde sabit pencereli sayaçlar. Limitlerin worker'lar
+    arasında ortak olması için alias Redis gibi paylaşılan bir backend olmalı
+    (docker-compose.prod.yml: DEFAULT_CACHE_BACKEND=redis); locmem'de her
+    process kendi sayacını tutar ve limit worker sayısıyla çarpılır.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def _window_key(self, key, window):
+        return f"throttle:{key}:{window}:{int(time.time() // window)}"
+
+    def incr(self, key, window):
+        cache = caches[self.alias]
+        window_key = self._window_key(key, window)
+        cache.add(window_key, 0, timeout=window)
+        try:
+            return cache.incr(window_key)
+        except ValueError:
+            # Anahtar add ile incr arasında düştüyse
+            cache.set(window_key, 1, timeout=window)
+            return 1
+
+    def get(self, key, window):
+        count = caches[self.alias].get(self._window_key(key, window), 0)
+        return count, window - time.time() % window
+
+    def reset(self, key):
+        # Sadece içinde bulunulan pencere silinir; önceki pencereler zaten geçersiz
+        cache = caches[self.alias]
+        for window in {parse_rate(rate)[1] for rate in _rates().values()}:
+            cache.delete(self._window_key(key, window))
+
+
+_store = None
+
+
+def get_counter_store():
+    """settings.LOGIN_THROTTLE_STORE ile seçilen store'un process başına tek örneği."""
+    global _store
+    if _store is None:
+        config = getattr(settings, "LOGIN_THROTTLE_STORE", {})
+        backend = config.get("BACKEND", "accounts.throttling.CacheCounterStore")
+        _store = import_string(backend)(**config.get("OPTIONS", {}))
+    return _store
+
+
+@receiver(setting_changed)
+def reset_counter_store(setting, **kwargs):
+    global _store
+    if setting == "LOGIN_THROTTLE_STORE":
+        _store = None
+
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@checks.register(checks.Tags.security, deploy=True)
+def check_shared_counter_store(app_configs, **kwargs):
+    """manage.py check --deploy: login limitleri process içi bir cache'te tutulmasın."""
+    config = getattr(settings, "LOGIN_THROTTLE_STORE", {})
+    backend = config.get("BACKEND", "accounts.throttling.CacheCounterStore")
+    if backend == "accounts.throttling.InMemoryCounterStore":
+        alias_backend = backend
+    elif backend == "accounts.throttling.CacheCounterStore":
+        alias = config.get("OPTIONS", {}).get("alias", "default")
+        alias_backend = settings.CACHES.get(alias, {}).get("BACKEND")
+        if alias_backend not in PROCESS_LOCAL_CACHES:
+            return []
+    else:
+        return []
+    return [
+        checks.Warning(
+            f"Login throttle counters are kept per process ({alias_backend}).",
+            hint="Set DEFAULT_CACHE_BACKEND=redis so limits are shared by all workers.",
+            id="accounts.W001",
+        )
+    ]
+
+
+def _rates():
+    return {
+        "ip": getattr(settings, "LOGIN_THROTTLE_IP_RATE", "30/min"),
+        "account": getattr(settings, "LOGIN_THROTTLE_ACCOUNT_RATE", "10/15m"),
+    }
+
+
+class LoginThrottle:
+    """
+    Parola kontrolünden (PBKDF2/argon2) önce çağrılır; limit aşılmışsa hash
+    hiç hesaplanmaz.
+
+    - IP: her deneme sayılır (LOGIN_THROTTLE_IP_RATE)
+    - Hesap (username ya da user id): sadece başarısız denemeler sayılır
+      (LOGIN_THROTTLE_ACCOUNT_RATE); başarılı girişte sıfırlanır
+    """
+
+    def __init__(self, request, account):
+        self.store = get_counter_store()
+        self.ip_key = f"ip:{BaseThrottle().get_ident(request)}"
+        self.account_key = f"account:{str(account).lower()}"
+        rates = _rates()
+        self.ip_limit, self.ip_window = parse_rate(rates["ip"])
+        self.account_limit, self.account_window = parse_rate(rates["account"])
+
+    def wait(self):
+        """Limit aşıldıysa beklenecek saniye, aşılmadıysa None. IP denemesini sayar."""
+        count, remaining = self.store.get(self.account_key, self.account_window)
+        if count >= self.account_limit:
+            return max(1, int(remaining))
+        if self.store.incr(self.ip_key, self.ip_window) > self.ip_limit:
+            _, remaining = self.store.get(self.ip_key, self.ip_window)
+            return max(1, int(remaining))
+        return None
+
+    def record(self, success):
+        if success:
+            self.store.reset(self.account_key)
+        else:
+            self.store.incr(self.account_key, self.account_window)
@@ -1,7 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import AuthViewSet, UserViewSet, TaskViewSet, TaskCommentViewSet
+from . import async_views
+from .views import AuthViewSet, UserViewSet, TaskViewSet, TaskCommentViewSet, metrics
 
 router = DefaultRouter()
 router.register(r"", AuthViewSet, basename="auth")    
@@ -9,11 +10,46 @@ router.register(r"users", UserViewSet, basename="users")
 router.register(r"tasks", TaskViewSet, basename="tasks")
 
 urlpatterns = [
+    path("_metrics", metrics, name="metrics"),
+
+    # Sık okunan GET uçları async; diğer metodlar aynı ViewSet'lere gider
+    path(
+        "me/",
+        async_views.dispatch(
+            {"GET": async_views.me},
+            AuthViewSet.as_view({"get": "me"}, basename="auth", detail=False),
+        ),
+        name="auth-me",
+    ),
+    path(
+        "tasks/",
+        async_views.dispatch(
+            {"GET": async_views.task_list},
+            TaskViewSet.as_view({"get": "list", "post": "create"}, basename="tasks", detail=False),
+        ),
+        name="tasks-list",
+    ),
+    path(
+        "tasks/<int:pk>/",
+        async_views.dispatch(
+            {"GET": async_views.task_detail},
+            TaskViewSet.as_view(
+                {"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"},
+                basename="tasks",
+                detail=True,
+            ),
+        ),
+        name="tasks-detail",
+    ),
+
     path("", include(router.urls)),
 
     path(
         "tasks/<int:task_id>/comments/",
-        TaskCommentViewSet.as_view({"get": "list", "post": "create"}),
+        async_views.dispatch(
+            {"GET": async_views.task_comment_list},
+            TaskCommentViewSet.as_view({"get": "list", "post": "create"}),
+        ),
         name="task-comments",
     ),
     path(
@@ -1,13 +1,16 @@
-from django.contrib.auth import login, logout, authenticate
+from django.contrib.auth import login, logout, authenticate, update_session_auth_hash
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import Throttled, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Task, TaskComment
+from .models import Task, TaskComment, TaskVersionConflict
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -18,8 +21,37 @@ from .serializers import (
     TaskCommentSerializer,
 )
 from .permissions import IsStaff, IsStaffOrOwner
+from .pagination import TaskPagination, TaskCommentPagination
+from .search import search_users
+from .sync import (
+    collect_changes,
+    decode_sync_token,
+    encode_sync_token,
+    new_watermark,
+)
+from .bulk import (
+    get_bulk_items,
+    bulk_create_tasks,
+    bulk_update_tasks,
+    bulk_delete_tasks,
+)
+from .export import EXPORT_FORMATS
+from .compact import comment_rows
+from .archive import task_model
+from .listing import TaskListQuery, comment_list_queryset, sees_all_tasks
+from .filters import (
+    filter_tasks,
+    get_requested_fields,
+    project_tasks,
+)
 
 from .crypto_utils import encrypt_json
+from .throttling import LoginThrottle
+from .counters import get_stats
+from .deletion import schedule_account_deletion
+from . import cache, events, threads
+from .metrics import pool_samples, registry
+from .renderers import JSONRenderer
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -61,7 +93,18 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Limit aşıldıysa parola hash'i hiç hesaplanmaz
+        throttle = LoginThrottle(request, username)
+        wait = throttle.wait()
+        if wait is not None:
+            return Response(
+                {"success": False, "error": "Too many login attempts. Try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(wait)},
+            )
+
         user = authenticate(request, username=username, password=password)
+        throttle.record(success=user is not None)
         if user is None:
             return Response(
                 {"success": False, "error": "Invalid credentials"},
@@ -149,9 +192,10 @@ class AuthViewSet(viewsets.ViewSet):
             data=request.data,
             context={"request": request},
         )
-        serializer.is_valid(raise_exception=True)
+        self.validate_password_check(request, serializer, "old_password")
         serializer.save()
-        login(request, request.user)
+        # Oturum yeni parola hash'iyle güncellenir, kullanıcı çıkış yapmış olmaz
+        update_session_auth_hash(request, request.user)
         return Response({"success": True})
 
     @action(
@@ -165,59 +209,130 @@ class AuthViewSet(viewsets.ViewSet):
             data=request.data,
             context={"request": request},
         )
-        serializer.is_valid(raise_exception=True)
+        self.validate_password_check(request, serializer, "password")
         u = request.user
         logout(request)
-        u.delete()
+        # Task/yorum cascade'i istek içinde değil, arka plan job'unda
+        schedule_account_deletion(u)
         return Response({"success": True})
 
 
+    def validate_password_check(self, request, serializer, password_field):
+        """
+        Mevcut parolayı doğrulayan serializer'ları login ile aynı hesap
+        sayacına bağlar; yanlış parola başarısız giriş denemesi sayılır.
+        """
+        throttle = LoginThrottle(request, request.user.username)
+        wait = throttle.wait()
+        if wait is not None:
+            raise Throttled(wait=wait)
+        valid = serializer.is_valid()
+        throttle.record(success=password_field not in serializer.errors)
+        if not valid:
+            raise ValidationError(serializer.errors)
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """
     GET    /api/users/?q=...
     POST   /api/users/
-    DELETE /api/users/<id>/
+    DELETE /api/users/<id>/   (hemen pasifleşir, verisi arka planda silinir)
     """
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsStaff]
 
     def get_queryset(self):
-        qs = User.objects.filter(is_staff=False, is_superuser=False).order_by("id")
+        # Silinmeyi bekleyen (pasifleştirilmiş) kullanıcılar listelenmez
+        qs = User.objects.filter(is_staff=False, is_superuser=False, is_active=True).order_by("id")
         q = (self.request.query_params.get("q") or "").strip()
         if q:
-            qs = qs.filter(
-                Q(email__icontains=q)
-                | Q(first_name__icontains=q)
-                | Q(last_name__icontains=q)
-                | Q(username__icontains=q)
-            )
+            qs = search_users(qs, q)
         return qs
 
+    def perform_destroy(self, instance):
+        schedule_account_deletion(instance)
+
 
 class TaskViewSet(viewsets.ModelViewSet):
     """
-    GET    /api/tasks/?all=1
+    GET    /api/tasks/?all=1&cursor=...&page_size=...
+           &state=TODO,DONE&owner=<id>&updated_since=<iso>&search=...
+           &ordering=-updated_at&fields=id,title,state
+           &include=comment_stats,latest_comments&latest_comments=3
+           &include_archived=1   (arşivlenmiş DONE task'lar da; detay ve export'ta da geçerli)
+    GET    /api/tasks/changes/?since=<token>
+    GET    /api/tasks/stats/?all=1   (staff'a owner kırılımı da döner)
+    GET    /api/tasks/cache-stats/   (staff)
+    GET    /api/tasks/export/?type=csv|ndjson&state=...&owner=...
+           &created_after=<iso>&created_before=<iso>   (staff)
+    POST   /api/tasks/bulk/   [{...}, ...]
+    PATCH  /api/tasks/bulk/   [{"id": 1, ...}, ...]
+    DELETE /api/tasks/bulk/   {"ids": [1, 2, ...]}
     POST   /api/tasks/
-    PUT    /api/tasks/<id>/
+    PUT    /api/tasks/<id>/   (If-Match: "<version>" ile koşullu, çakışmada 412)
     DELETE /api/tasks/<id>/
     """
     serializer_class = TaskSerializer
+    pagination_class = TaskPagination
 
     def get_permissions(self):
         if self.action in ["update", "partial_update", "destroy", "retrieve"]:
             permission_classes = [IsAuthenticated, IsStaffOrOwner]
+        elif self.action in ["cache_stats", "export"]:
+            permission_classes = [IsAuthenticated, IsStaff]
         else:
             permission_classes = [IsAuthenticated]
         return [p() for p in permission_classes]
 
+    def sees_all_tasks(self):
+        return sees_all_tasks(self.request.user, self.request.query_params)
+
     def get_queryset(self):
-        show_all = self.request.query_params.get("all") == "1"
-        qs = Task.objects.select_related("owner").order_by("id")
+        params = self.request.query_params
+        model = Task
+        if self.action in ["retrieve", "export"]:
+            # ?include_archived=1: sıcak + arşiv tabloları (salt okunur view)
+            model = task_model(params)
+        qs = model.objects.select_related("owner").order_by("id")
+
+        if not self.sees_all_tasks():
+            qs = qs.filter(owner=self.request.user)
+
+        if self.action == "export":
+            qs = filter_tasks(qs, params)
 
-        if self.request.user.is_staff or show_all:
-            return qs
+        fields = self.get_requested_fields()
+        if fields is not None:
+            qs = project_tasks(qs, fields, ("id",))
 
-        return qs.filter(owner=self.request.user)
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        # HTTP'de GET /api/tasks/ async_views.task_list'e gider; ikisi de accounts.listing'i kullanır
+        query = TaskListQuery(request.user, request.query_params)
+        return cache.cached_list(request, query.scopes, lambda: self.compact_list(query))
+
+    def compact_list(self, query):
+        """list cevabı, TaskSerializer yerine accounts.compact ile (çıktı aynı)."""
+        page = self.paginate_queryset(self.list_queryset(query))
+        return self.get_paginated_response(query.rows(page))
+
+    def list_queryset(self, query=None):
+        """list'in sayfalanan sorgusu (explain_querysets de bunu ölçer)."""
+        if query is None:
+            query = TaskListQuery(self.request.user, self.request.query_params)
+        # TaskPagination keyset'i view.keyset_ordering'den kurar
+        self.keyset_ordering = query.ordering
+        return query.queryset()
+
+    def get_requested_fields(self):
+        if self.action not in ["retrieve", "changes"]:
+            return None
+        return get_requested_fields(self.request.query_params)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
 
     def perform_create(self, serializer):
         owner = serializer.validated_data.get("owner", None)
@@ -225,16 +340,158 @@ class TaskViewSet(viewsets.ModelViewSet):
             serializer.save(owner=owner)
         else:
             serializer.save(owner=self.request.user)
+        events.task_created(serializer.data)
+
+    def update(self, request, *args, **kwargs):
+        """
+        If-Match: "<version>" verilirse güncelleme koşulludur: ETag uyuşmazsa ya da
+        satır bu arada değiştiyse 412 ve task'ın güncel hali döner.
+        If-Match'siz istekler eskisi gibi koşulsuz yazar.
+        """
+        if_match = request.headers.get("If-Match")
+        if if_match is None:
+            response = super().update(request, *args, **kwargs)
+        else:
+            response = self.conditional_update(request, if_match, kwargs.get("partial", False))
+        if response.status_code == status.HTTP_200_OK and "version" in response.data:
+            response["ETag"] = f'"{response.data["version"]}"'
+        return response
+
+    def conditional_update(self, request, if_match, partial):
+        instance = self.get_object()
+        if not self.etag_matches(if_match, instance.version):
+            return self.precondition_failed(instance)
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        instance.expected_updated_at = instance.updated_at
+        try:
+            self.perform_update(serializer)
+        except TaskVersionConflict:
+            # Okuma ile yazma arasında başka bir istek güncelledi
+            return self.precondition_failed(self.get_object())
+        finally:
+            instance.expected_updated_at = None
+        return Response(serializer.data)
+
+    @staticmethod
+    def etag_matches(if_match, version):
+        tags = {tag.strip() for tag in if_match.split(",")}
+        return "*" in tags or f'"{version}"' in tags
+
+    def precondition_failed(self, instance):
+        data = TaskSerializer(instance).data
+        return Response(
+            data,
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            headers={"ETag": f'"{data["version"]}"'},
+        )
+
+    def perform_update(self, serializer):
+        before = self.get_serializer(serializer.instance).data
+        serializer.save()
+        events.task_updated(before, serializer.data)
+
+    def perform_destroy(self, instance):
+        task_id, owner_id = instance.id, instance.owner_id
+        instance.delete()
+        events.task_deleted(task_id, owner_id)
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        watermark = new_watermark()
+        token = (request.query_params.get("since") or "").strip()
+
+        result = None
+        if token:
+            owner_id = None if self.sees_all_tasks() else request.user.id
+            result = collect_changes(
+                self.get_queryset(), decode_sync_token(token), owner_id
+            )
+
+        if result is None:
+            # İlk senkron ya da çok eski / çok büyük fark: client tam listeyi çekmeli
+            return Response(
+                {
+                    "reset": True,
+                    "token": encode_sync_token(watermark),
+                    "changed": [],
+                    "deleted": [],
+                }
+            )
+
+        changed, deleted = result
+        return Response(
+            {
+                "reset": False,
+                "token": encode_sync_token(watermark),
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": deleted,
+            }
+        )
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        if request.method == "POST":
+            ok, results = bulk_create_tasks(request, get_bulk_items(request.data))
+            success_status = status.HTTP_201_CREATED
+        elif request.method == "PATCH":
+            ok, results = bulk_update_tasks(request, self, get_bulk_items(request.data))
+            success_status = status.HTTP_200_OK
+        else:
+            ids = get_bulk_items(request.data, key="ids")
+            ok, results = bulk_delete_tasks(request, self, ids)
+            success_status = status.HTTP_200_OK
+
+        if not ok:
+            # Hepsi ya da hiçbiri: hatalı öğe varsa hiçbir değişiklik yazılmadı
+            return Response(
+                {"success": False, "results": results},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"success": True, "results": results}, status=success_status)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        export_type = request.query_params.get("type", "csv")
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {"success": False, "error": "type must be csv or ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream, astream, content_type = EXPORT_FORMATS[export_type]
+        if isinstance(request._request, ASGIRequest):
+            # Sync iterator ASGI'de tamamen okunup öyle gönderilirdi
+            stream = astream
+        response = StreamingHttpResponse(
+            stream(self.get_queryset()), content_type=content_type
+        )
+        filename = f"tasks-{timezone.now():%Y%m%d-%H%M%S}.{export_type}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        # TaskCounter'dan okunur; task sayısından bağımsız, kullanıcı x state satır
+        if not self.sees_all_tasks():
+            return Response(get_stats(owner_id=request.user.id))
+        return Response(get_stats(by_owner=request.user.is_staff))
+
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        return Response(cache.stats.as_dict())
 
 
 class TaskCommentViewSet(viewsets.ModelViewSet):
     """
-    GET    /api/tasks/<task_id>/comments/
+    GET    /api/tasks/<task_id>/comments/?after=<comment_id>&page_size=...
+    GET    /api/tasks/<task_id>/comments/?cursor=...&page_size=...&include_archived=1
     POST   /api/tasks/<task_id>/comments/
     PUT    /api/tasks/<task_id>/comments/<id>/
     DELETE /api/tasks/<task_id>/comments/<id>/
     """
     serializer_class = TaskCommentSerializer
+    pagination_class = TaskCommentPagination
 
     def get_permissions(self):
         if self.action in ["update", "partial_update", "destroy"]:
@@ -244,13 +501,61 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
         return [p() for p in permission_classes]
 
     def get_queryset(self):
-        task_id = self.kwargs.get("task_id")
         return (
             TaskComment.objects.select_related("author")
-            .filter(task_id=task_id)
-            .order_by("created_at")
+            .filter(task_id=self.kwargs.get("task_id"))
+            .order_by("created_at", "id")
         )
 
+    def list(self, request, *args, **kwargs):
+        # İlk sayfa ve ?after= sayfaları cache'teki hazır thread'den (bkz. accounts.threads)
+        renderer = request.accepted_renderer
+        plain_json = isinstance(renderer, JSONRenderer) and renderer.get_indent(
+            request.accepted_media_type, {}
+        ) is None
+        body = threads.page(request, self.kwargs.get("task_id")) if plain_json else None
+        if body is not None:
+            return HttpResponse(body, content_type="application/json")
+        # HTTP'de async_views.task_comment_list'e gider; ikisi de accounts.listing'i kullanır
+        page = self.paginate_queryset(self.list_queryset())
+        return self.get_paginated_response(comment_rows(page))
+
+    def list_queryset(self):
+        return comment_list_queryset(self.kwargs.get("task_id"), self.request.query_params)
+
     def perform_create(self, serializer):
         task_id = self.kwargs.get("task_id")
         serializer.save(task_id=task_id, author=self.request.user)
+        events.comment_created(serializer.data)
+
+    def perform_update(self, serializer):
+        before = self.get_serializer(serializer.instance).data
+        serializer.save()
+        events.comment_updated(before, serializer.data)
+
+    def perform_destroy(self, instance):
+        comment_id, task_id = instance.id, instance.task_id
+        instance.delete()
+        events.comment_deleted(comment_id, task_id)
+
+
+def metrics(request):
+    """
+    GET /api/_metrics   (staff)
+    Route başına sorgu sayısı / DB / serializer / toplam süre histogramları ve
+    DB bağlantı havuzu doluluk/bekleme metrikleri, Prometheus text formatında.
+    """
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."},
+            status=403,
+        )
+    counters = [
+        (f"task_list_cache_{name}_total", value)
+        for name, value in cache.stats.as_dict().items()
+    ]
+    return HttpResponse(
+        registry.render(extra_counters=counters, extra_samples=pool_samples()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
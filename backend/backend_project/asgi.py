@@ -2,6 +2,8 @@
 ASGI config for backend_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections on /ws/ go to the
+real-time task/comment channel in accounts.realtime.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from accounts.realtime import websocket_application  # noqa: E402  (apps hazır olmalı)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        if scope["path"].rstrip("/") == "/ws":
+            return await websocket_application(scope, receive, send)
+        await receive()
+        return await send({"type": "websocket.close", "code": 4404})
+    return await django_application(scope, receive, send)
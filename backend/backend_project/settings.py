@@ -9,9 +9,13 @@ import os
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = "django-insecure-u8!un5g%52*x^ii1pb*73p3!v!57lq(&e7r#meb0qd$-@%$%%r"
-DEBUG = True
-ALLOWED_HOSTS = ["*"]
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY",
+    "django-insecure-u8!un5g%52*x^ii1pb*73p3!v!57lq(&e7r#meb0qd$-@%$%%r",
+)
+# Production'da DJANGO_DEBUG=0: DEBUG açıkken Django her SQL sorgusunu bellekte tutar
+DEBUG = os.environ.get("DJANGO_DEBUG", "1") == "1"
+ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "*").split(",")
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -29,6 +33,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "accounts.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,16 +63,53 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "backend_project.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": os.environ.get("DB_NAME", "mydb"),
-        "USER": os.environ.get("DB_USER", "myuser"),
-        "PASSWORD": os.environ.get("DB_PASSWORD", "mypassword"),
-        "HOST": os.environ.get("DB_HOST", "db"),
-        "PORT": os.environ.get("DB_PORT", "5432"),
+DB_ENGINE = os.environ.get("DB_ENGINE", "postgresql")
+
+if DB_ENGINE == "sqlite":
+    # Postgres olmadan yerel çalıştırma / testler için
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", str(BASE_DIR / "db.sqlite3")),
+        }
     }
-}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "mydb"),
+            "USER": os.environ.get("DB_USER", "myuser"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", "mypassword"),
+            "HOST": os.environ.get("DB_HOST", "db"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            # Havuz kapalıyken (DB_POOL=0) kalıcı bağlantılar: her istekte yeni TCP bağlantısı açılmaz
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+    }
+
+    # psycopg3 bağlantı havuzu (process başına). Toplam bağlantı sayısı
+    # worker sayısı x DB_POOL_MAX_SIZE'dır; Postgres max_connections'a göre ayarlanmalı.
+    if os.environ.get("DB_POOL", "1") == "1":
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            # Havuz doluyken bağlantı için en fazla bu kadar saniye beklenir
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+        }
+        # Havuzda CONN_HEALTH_CHECKS, bağlantı verilmeden önce kontrol edilmesi (pre-ping) demektir
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+        # Havuz bağlantıları kendisi yeniden kullanır; Django'nun kalıcı bağlantısıyla birlikte çalışmaz
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# Async view'ların (accounts.async_views) event loop başına aynı anda tutabileceği
+# DB bağlantısı; fazlası thread açmadan sırada bekler
+# (havuz açıksa DB_POOL_MAX_SIZE'ı aşmamalı)
+ASYNC_DB_MAX_CONNECTIONS = int(
+    os.environ.get("ASYNC_DB_MAX_CONNECTIONS", os.environ.get("DB_POOL_MAX_SIZE", "10"))
+)
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -82,6 +124,8 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = "static/"
+# collectstatic çıktısı; production'da nginx buradan servis eder
+STATIC_ROOT = os.environ.get("STATIC_ROOT", str(BASE_DIR / "staticfiles"))
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 ENCRYPTION_KEY_B64 = os.environ.get("ENCRYPTION_KEY_B64", "")
@@ -89,6 +133,15 @@ if not ENCRYPTION_KEY_B64:
  
     pass
 
+# Anahtar rotasyonu: ENCRYPTION_KEYS_B64="2:<b64>,1:<b64>", ENCRYPTION_KEY_ID=2
+# Tanımlı değilse tek anahtar olarak ENCRYPTION_KEY_B64 kullanılır.
+ENCRYPTION_KEYS_B64 = dict(
+    item.split(":", 1)
+    for item in os.environ.get("ENCRYPTION_KEYS_B64", "").split(",")
+    if ":" in item
+)
+ENCRYPTION_KEY_ID = os.environ.get("ENCRYPTION_KEY_ID", "")
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8080",
     "http://127.0.0.1:8080",
@@ -114,13 +167,156 @@ CSRF_COOKIE_SECURE = False
 
 SESSION_COOKIE_HTTPONLY = True  
 
+# Oturum okuma yolu: cached_db (varsayılan, cache'te bulursa DB'ye gitmez)
+# ya da django.contrib.sessions.backends.signed_cookies (hiç sorgu yok)
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE", "django.contrib.sessions.backends.cached_db"
+)
+SESSION_CACHE_ALIAS = "default"
+
+# İlk backend yeni login'ler için; ModelBackend eski oturumlar geçerli kalsın diye listede
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+# İstek başına auth_user SELECT'ini önleyen cache (0 = kapalı). Birden fazla worker'da
+# invalidation herkese ulaşsın diye alias paylaşılan olmalı (DEFAULT_CACHE_BACKEND=redis).
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_ALIAS = "default"
+
+# Yeni parolalar PASSWORD_HASHER ile hash'lenir; listedeki diğerleri eski hash'leri
+# doğrulamak için. Eski algoritma/maliyetle kayıtlı parola başarılı girişte yeniden hash'lenir.
+_PASSWORD_HASHERS = {
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "argon2")
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "2"))
+SCRYPT_WORK_FACTOR = int(os.environ.get("SCRYPT_WORK_FACTOR", str(2**14)))
+
+# Arka plan job'ları (accounts.jobs); DB kuyruğunu "python manage.py run_jobs" boşaltır.
+# JOBS_SYNC=1: job commit'ten sonra istek içinde çalışır (testler, worker'sız geliştirme).
+if os.environ.get("JOBS_SYNC", "0") == "1":
+    JOBS_QUEUE = {"BACKEND": "accounts.jobs.ImmediateQueue"}
+else:
+    JOBS_QUEUE = {
+        "BACKEND": "accounts.jobs.DatabaseQueue",
+        "OPTIONS": {
+            "lease_seconds": int(os.environ.get("JOBS_LEASE_SECONDS", "300")),
+            "max_attempts": int(os.environ.get("JOBS_MAX_ATTEMPTS", "5")),
+        },
+    }
+# Hesap silme: task/yorumlar bu büyüklükte batch'lerle, her biri ayrı transaction'da silinir
+ACCOUNT_PURGE_BATCH_SIZE = int(os.environ.get("ACCOUNT_PURGE_BATCH_SIZE", "500"))
+
+# Login / parola doğrulayan uçlar için deneme limitleri (accounts.throttling).
+# Birden fazla worker varsa sayaçlar paylaşılan bir cache'te (DEFAULT_CACHE_BACKEND=redis) tutulmalı.
+LOGIN_THROTTLE_STORE = {
+    "BACKEND": "accounts.throttling.CacheCounterStore",
+    "OPTIONS": {"alias": "default"},
+}
+LOGIN_THROTTLE_IP_RATE = os.environ.get("LOGIN_THROTTLE_IP_RATE", "30/min")
+LOGIN_THROTTLE_ACCOUNT_RATE = os.environ.get("LOGIN_THROTTLE_ACCOUNT_RATE", "10/15m")
+
 REST_FRAMEWORK = {
+    # DRF JSONRenderer ile aynı çıktı; orjson kuruluysa onunla (accounts.renderers)
+    "DEFAULT_RENDERER_CLASSES": [
+        "accounts.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # İstemci IP'si X-Forwarded-For'dan okunurken güvenilen proxy sayısı.
+    # 0: REMOTE_ADDR kullanılır; nginx arkasında 1 olmalı (docker-compose)
+    "NUM_PROXIES": int(os.environ.get("API_NUM_PROXIES", "0")),
 }
+
+# RequestMetricsMiddleware: istek başına sorgu bütçesi, route adına göre özelleştirilebilir
+QUERY_COUNT_BUDGET = int(os.environ.get("QUERY_COUNT_BUDGET", "20"))
+QUERY_COUNT_BUDGETS = {
+    "auth-me": 5,
+    "tasks-list": 8,
+    "task-comments": 8,
+}
+
+# Task / yorum listelerinde cursor sayfalama boyutu ve ?page_size= üst sınırı
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "100"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "500"))
+
+# ?include=latest_comments için varsayılan yorum sayısı
+TASK_LATEST_COMMENTS = int(os.environ.get("TASK_LATEST_COMMENTS", "3"))
+
+# /api/tasks/bulk/ isteği başına en fazla öğe
+TASK_BULK_MAX_ITEMS = int(os.environ.get("TASK_BULK_MAX_ITEMS", "1000"))
+
+# /api/tasks/export/ server-side cursor'larının satır paketi
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "2000"))
+
+# /api/tasks/changes/ delta senkronu
+TASK_SYNC_MAX_CHANGES = int(os.environ.get("TASK_SYNC_MAX_CHANGES", "1000"))
+TASK_SYNC_OVERLAP_SECONDS = int(os.environ.get("TASK_SYNC_OVERLAP_SECONDS", "2"))
+TASK_SYNC_RETENTION_DAYS = int(os.environ.get("TASK_SYNC_RETENTION_DAYS", "7"))
+
+# archive_tasks: bu kadar gündür DONE olan task'lar yorumlarıyla arşiv tablolarına taşınır
+TASK_ARCHIVE_AFTER_DAYS = int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "90"))
+TASK_ARCHIVE_BATCH_SIZE = int(os.environ.get("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+
+# Yorum listeleri: task başına "tasks" cache'inde tutulan hazır JSON thread'i
+# (bkz. accounts.threads); parça başına yorum sayısı ve parçaların ömrü.
+# Yazmalar thread'i yerinde günceller; birden fazla process varsa "tasks" cache'i
+# paylaşılan bir backend (redis) olmalı. Kısa ömür, kaçan bir yazmanın etkisini sınırlar.
+COMMENT_THREAD_CHUNK_SIZE = int(os.environ.get("COMMENT_THREAD_CHUNK_SIZE", "200"))
+COMMENT_THREAD_CACHE_TIMEOUT = int(os.environ.get("COMMENT_THREAD_CACHE_TIMEOUT", "60"))
+
+# Task liste cevapları için cache: locmem (tek process), file veya redis.
+# Birden fazla worker/process varsa (gunicorn, run_jobs) redis olmalı; aksi halde
+# bir process'teki yazma diğerlerinin cache versiyonlarını ve ETag'lerini bayatlatmaz.
+TASK_CACHE_BACKEND = os.environ.get("TASK_CACHE_BACKEND", "locmem")
+_TASK_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+_TASK_CACHE_LOCATIONS = {
+    "locmem": "tasks",
+    "file": "/tmp/task-list-cache",
+    "redis": "redis://localhost:6379/1",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": _TASK_CACHE_BACKENDS[os.environ.get("DEFAULT_CACHE_BACKEND", "locmem")],
+        "LOCATION": os.environ.get("DEFAULT_CACHE_LOCATION", ""),
+    },
+    "tasks": {
+        "BACKEND": _TASK_CACHE_BACKENDS[TASK_CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "TASK_CACHE_LOCATION", _TASK_CACHE_LOCATIONS[TASK_CACHE_BACKEND]
+        ),
+        "TIMEOUT": int(os.environ.get("TASK_CACHE_TIMEOUT", "300")),
+    },
+}
+
+# /ws/ gerçek zamanlı event'ler. Birden fazla worker varsa REALTIME_REDIS_URL verilmeli.
+REALTIME_REDIS_URL = os.environ.get("REALTIME_REDIS_URL", "")
+if REALTIME_REDIS_URL:
+    REALTIME_BROKER = {
+        "BACKEND": "accounts.broker.RedisBackend",
+        "OPTIONS": {"url": REALTIME_REDIS_URL},
+    }
+else:
+    REALTIME_BROKER = {"BACKEND": "accounts.broker.InMemoryBackend"}
 ENCRYPTION_KEY_B64 = os.environ.get("ENCRYPTION_KEY_B64", "")
 
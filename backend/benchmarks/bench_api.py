@@ -0,0 +1,223 @@
+"""
+API uçları için tekrarlanabilir benchmark.
+
+    cd backend
+    python benchmarks/bench_api.py --users 50 --tasks 2000 --comments 5 \\
+        --iterations 200 --output bench.json
+    # Önceki sonuca göre p95 / sorgu sayısı regresyonunda exit code 1:
+    python benchmarks/bench_api.py --baseline bench.json --max-regression 20
+
+Ayrı bir test veritabanı kurar (settings'teki DATABASES'e göre; DB_ENGINE=sqlite
+ile ağ gerektirmez), benchmarks/factories ile veriyi üretir ve her senaryoyu
+Django test client'ı üzerinden çalıştırır. --http-url verilirse aynı GET
+uçları çalışan bir sunucuya karşı benchmarks/loadtest ile de ölçülür
+(o sunucunun veritabanında --http-username kullanıcısı olmalıdır).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
+# /api/me/ cevabı şifrelenir; anahtar verilmemişse sadece ölçüm için sabit bir örnek anahtar
+os.environ.setdefault("ENCRYPTION_KEY_B64", "UVyuw95Rn1mpo4FuRzqKlnmYjpX1Ms5YugWlvzNaipo=")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from benchmarks import loadtest  # noqa: E402
+from benchmarks.factories import WORDS, seed  # noqa: E402
+
+PASSWORD = "bench-pass-123"
+# login senaryosu aynı IP/hesapla arka arkaya giriş yapar; sayaçlar yine
+# çalışır (maliyeti ölçülür) ama limitler iterasyon sayısıyla dolmasın
+THROTTLE_SETTINGS = {
+    "LOGIN_THROTTLE_STORE": {"BACKEND": "accounts.throttling.InMemoryCounterStore"},
+    "LOGIN_THROTTLE_IP_RATE": "1000000/s",
+    "LOGIN_THROTTLE_ACCOUNT_RATE": "1000000/s",
+}
+# Gate'te karşılaştırılan metrikler: artış kötüdür
+GATED_METRICS = ("p95_ms", "queries_per_request")
+
+
+def summarize(latencies, queries, elapsed):
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def scenarios(users, tasks):
+    """ad -> (kullanıcı adı, her iterasyonda çağrılan istek fonksiyonu)"""
+    owner = users[0]
+    staff = users[-1]
+    task_ids = [task.id for task in tasks]
+
+    def login(client, i):
+        return client.post(
+            "/api/login/",
+            {"username": owner.username, "password": PASSWORD},
+            content_type="application/json",
+        )
+
+    return {
+        "login": (owner, login),
+        "me": (owner, lambda client, i: client.get("/api/me/")),
+        "tasks": (owner, lambda client, i: client.get("/api/tasks/?page_size=50")),
+        "tasks_all": (owner, lambda client, i: client.get("/api/tasks/?all=1&page_size=50")),
+        "task_comments": (
+            owner,
+            lambda client, i: client.get(f"/api/tasks/{task_ids[i % len(task_ids)]}/comments/"),
+        ),
+        "users_search": (
+            staff,
+            lambda client, i: client.get(f"/api/users/?q={WORDS[i % len(WORDS)][:3]}"),
+        ),
+    }
+
+
+def run_scenario(user, request, iterations, warmup, cold_cache):
+    client = Client()
+    client.login(username=user.username, password=PASSWORD)
+    latencies, queries = [], []
+    elapsed = 0.0
+    for i in range(warmup + iterations):
+        if cold_cache:
+            caches["tasks"].clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = request(client, i)
+            duration = time.perf_counter() - start
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.status_code}: {response.content[:200]!r}")
+        if i >= warmup:
+            latencies.append(duration)
+            queries.append(len(ctx))
+            elapsed += duration
+    return summarize(latencies, queries, elapsed)
+
+
+def compare(report, baseline, max_regression):
+    """Baseline'a göre max_regression yüzdesinden fazla kötüleşen metrikler."""
+    failures = []
+    for name, result in report["client"].items():
+        previous = baseline.get("client", {}).get(name)
+        if previous is None:
+            continue
+        for metric in GATED_METRICS:
+            before, after = previous[metric], result[metric]
+            limit = before * (1 + max_regression / 100)
+            # Sorgu sayısında küçük mutlak artışlar da regresyondur
+            if metric == "queries_per_request":
+                limit = before
+            if after > limit:
+                failures.append(f"{name}.{metric}: {before} -> {after}")
+    return failures
+
+
+def run(args):
+    users, tasks, comments = seed(args.users, args.tasks, args.comments, PASSWORD, seed=args.seed)
+    User.objects.filter(pk=users[-1].pk).update(is_staff=True)
+    users[-1].is_staff = True
+    # Sahibinin task'larını gören senaryolar için ilk kullanıcının task'ları
+    owner_tasks = [task for task in tasks if task.owner_id == users[0].id] or tasks
+
+    report = {
+        "dataset": {
+            "vendor": connection.vendor,
+            "users": len(users),
+            "tasks": len(tasks),
+            "comments": len(comments),
+        },
+        "iterations": args.iterations,
+        "cold_cache": args.cold_cache,
+        "client": {},
+    }
+    selected = set(args.scenario or [])
+    for name, (user, request) in scenarios(users, owner_tasks).items():
+        if selected and name not in selected:
+            continue
+        report["client"][name] = run_scenario(
+            user, request, args.iterations, args.warmup, args.cold_cache
+        )
+
+    if args.http_url:
+        args.url = [args.http_url]
+        args.path = [
+            "/api/me/",
+            "/api/tasks/?page_size=50",
+            f"/api/tasks/{owner_tasks[0].id}/comments/",
+        ]
+        args.username, args.password = args.http_username, args.http_password
+        report["http"] = loadtest.run(args.http_url.rstrip("/"), args)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=5, help="Task başına yorum")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--scenario", action="append", help="Sadece verilen senaryo(lar)")
+    parser.add_argument("--cold-cache", action="store_true", help="Her istekten önce liste cache'ini temizle")
+    parser.add_argument("--output", help="JSON sonucu bu dosyaya da yaz")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki JSON sonucu")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Yüzde")
+    parser.add_argument("--http-url")
+    parser.add_argument("--http-username")
+    parser.add_argument("--http-password")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        with override_settings(**THROTTLE_SETTINGS):
+            report = run(args)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+
+    if args.baseline:
+        failures = compare(report, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        if failures:
+            print("Regressions:\n  " + "\n  ".join(failures), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Tekli ve toplu (/api/tasks/bulk/) task uçlarının karşılaştırması.
+
+    cd backend
+    python benchmarks/bench_bulk_tasks.py --items 1000
+
+Ayrı bir test veritabanı kurar (settings'teki DATABASES'e göre) ve sonunda siler.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts.models import Task  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(items):
+    user = User.objects.create_user("bench", "bench@example.com", "bench-pass-123")
+    client = APIClient()
+    client.login(username="bench", password="bench-pass-123")
+    payload = [{"title": f"task {i}", "description": "x" * 200} for i in range(items)]
+
+    def single_create():
+        for item in payload:
+            client.post("/api/tasks/", item, format="json")
+
+    def single_update():
+        for task_id in Task.objects.filter(owner=user).values_list("id", flat=True):
+            client.patch(f"/api/tasks/{task_id}/", {"state": "DONE"}, format="json")
+
+    def single_delete():
+        for task_id in Task.objects.filter(owner=user).values_list("id", flat=True):
+            client.delete(f"/api/tasks/{task_id}/")
+
+    def bulk_create():
+        client.post("/api/tasks/bulk/", payload, format="json")
+
+    def bulk_update():
+        ids = Task.objects.filter(owner=user).values_list("id", flat=True)
+        client.patch("/api/tasks/bulk/", [{"id": i, "state": "DONE"} for i in ids], format="json")
+
+    def bulk_delete():
+        ids = list(Task.objects.filter(owner=user).values_list("id", flat=True))
+        client.delete("/api/tasks/bulk/", {"ids": ids}, format="json")
+
+    report = {"items": items}
+    single = {
+        "create": timed(single_create),
+        "update": timed(single_update),
+        "delete": timed(single_delete),
+    }
+    bulk = {
+        "create": timed(bulk_create),
+        "update": timed(bulk_update),
+        "delete": timed(bulk_delete),
+    }
+    for op in ("create", "update", "delete"):
+        report[op] = {
+            "single_items_per_s": round(items / single[op], 1),
+            "bulk_items_per_s": round(items / bulk[op], 1),
+            "speedup": round(single[op] / bulk[op], 1),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        print(json.dumps(run(args.items), indent=2))
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+/api/me/ cevabını şifreleyen encrypt_json için mikro-benchmark.
+
+    cd backend
+    python benchmarks/bench_encrypt_json.py --iterations 50000
+
+"before": eski davranış gibi her çağrıda anahtar çözülüp AESGCM yeniden kurulur.
+"after": process başına önbelleğe alınmış key ring kullanılır.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
+# Anahtar verilmemişse sadece ölçüm için sabit bir örnek anahtar
+os.environ.setdefault("ENCRYPTION_KEY_B64", "UVyuw95Rn1mpo4FuRzqKlnmYjpX1Ms5YugWlvzNaipo=")
+
+import django  # noqa: E402
+
+django.setup()
+
+from accounts import crypto_utils  # noqa: E402
+
+PAYLOAD = {
+    "isAuthenticated": True,
+    "id": 42,
+    "username": "benchmark-user",
+    "email": "benchmark@example.com",
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "is_staff": False,
+    "is_superuser": False,
+}
+
+
+def measure(iterations, rebuild):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if rebuild:
+            crypto_utils._keyring = None
+        crypto_utils.encrypt_json(PAYLOAD)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    before = measure(args.iterations, rebuild=True)
+    after = measure(args.iterations, rebuild=False)
+    print(
+        json.dumps(
+            {
+                "iterations": args.iterations,
+                "before_ops_per_s": round(before),
+                "after_ops_per_s": round(after),
+                "speedup": round(after / before, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Liste uçlarının serialize yolu için benchmark: ModelSerializer + DRF JSONRenderer
+("drf") ile .values() + accounts.compact + accounts.renderers ("compact").
+
+    cd backend
+    python benchmarks/bench_list_serializers.py --rows 10000 --repeat 5
+
+Ayrı bir test veritabanına --rows task ve aynı sayıda yorum üretilir. Her yol
+için tüm satırlar tek listede okunur, dict'e çevrilir ve JSON'a render edilir;
+sonuç saniyedeki satır sayısıdır (en iyi --repeat ölçümü). İki yolun
+çıktısının byte byte aynı olduğu da kontrol edilir.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.renderers import JSONRenderer as DRFJSONRenderer  # noqa: E402
+
+from accounts import renderers  # noqa: E402
+from accounts.compact import comment_rows, comment_values, task_rows, task_values  # noqa: E402
+from accounts.models import Task, TaskComment  # noqa: E402
+from accounts.serializers import TaskCommentSerializer, TaskSerializer  # noqa: E402
+from benchmarks.factories import seed  # noqa: E402
+
+
+def drf_tasks():
+    tasks = Task.objects.select_related("owner").order_by("id")
+    return DRFJSONRenderer().render(TaskSerializer(tasks, many=True).data)
+
+
+def compact_tasks():
+    rows = list(task_values(Task.objects.order_by("id")))
+    return renderers.JSONRenderer().render(task_rows(rows))
+
+
+def drf_comments():
+    comments = TaskComment.objects.select_related("author").order_by("created_at", "id")
+    return DRFJSONRenderer().render(TaskCommentSerializer(comments, many=True).data)
+
+
+def compact_comments():
+    rows = list(comment_values(TaskComment.objects.order_by("created_at", "id")))
+    return renderers.JSONRenderer().render(comment_rows(rows))
+
+
+SCENARIOS = {
+    "tasks": (drf_tasks, compact_tasks),
+    "comments": (drf_comments, compact_comments),
+}
+
+
+def best_rate(render, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return round(rows / best)
+
+
+def run(args):
+    users, tasks, comments = seed(args.users, args.rows, 1, "bench-pass-123", seed=args.seed)
+    report = {
+        "dataset": {"vendor": connection.vendor, "tasks": len(tasks), "comments": len(comments)},
+        "orjson": renderers.orjson is not None,
+        "repeat": args.repeat,
+        "rows_per_s": {},
+    }
+    for name, (drf, compact) in SCENARIOS.items():
+        if drf() != compact():
+            raise SystemExit(f"{name}: compact output differs from the serializer output")
+        rows = len(tasks) if name == "tasks" else len(comments)
+        before = best_rate(drf, rows, args.repeat)
+        after = best_rate(compact, rows, args.repeat)
+        report["rows_per_s"][name] = {
+            "drf": before,
+            "compact": after,
+            "speedup": round(after / before, 2),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        report = run(args)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark ve yerel deneme verisi için basit factory'ler.
+
+Nesneler bulk_create ile eklenir (sinyaller çalışmaz); aynı --seed ile
+her çalıştırmada aynı veri üretilir.
+"""
+
+import itertools
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from accounts.models import Task, TaskComment
+
+WORDS = (
+    "alpha", "beta", "gamma", "delta", "report", "invoice", "design", "review",
+    "deploy", "backend", "frontend", "sprint", "budget", "meeting", "release",
+    "bug", "feature", "customer", "schema", "migration",
+)
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Ayşe", "Mehmet", "Zeynep", "Can", "Elif", "Deniz")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik")
+
+
+class Factory:
+    model = None
+    batch_size = 1000
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.sequence = itertools.count(1)
+
+    def fields(self, n):
+        raise NotImplementedError
+
+    def build(self, **overrides):
+        return self.model(**{**self.fields(next(self.sequence)), **overrides})
+
+    def create_batch(self, count, **overrides):
+        objects = [self.build(**overrides) for _ in range(count)]
+        return self.model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+
+class UserFactory(Factory):
+    model = User
+
+    def __init__(self, rng, password):
+        super().__init__(rng)
+        # Tüm kullanıcılar aynı hash'i paylaşır; PASSWORD_HASHER (varsayılan argon2) bir kez çalışır
+        self.password = make_password(password)
+
+    def fields(self, n):
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        return {
+            "username": f"{first.lower()}{n:06d}",
+            "email": f"{first.lower()}.{last.lower()}{n}@example.com",
+            "first_name": first,
+            "last_name": last,
+            "password": self.password,
+        }
+
+
+class TaskFactory(Factory):
+    model = Task
+
+    def __init__(self, rng, owners):
+        super().__init__(rng)
+        self.owners = owners
+
+    def fields(self, n):
+        return {
+            "title": " ".join(self.rng.choices(WORDS, k=3)) + f" #{n}",
+            "description": " ".join(self.rng.choices(WORDS, k=30)),
+            "state": self.rng.choice([value for value, _ in Task.STATUS_CHOICES]),
+            "owner": self.rng.choice(self.owners),
+        }
+
+
+class TaskCommentFactory(Factory):
+    model = TaskComment
+
+    def __init__(self, rng, authors):
+        super().__init__(rng)
+        self.authors = authors
+
+    def fields(self, n):
+        return {
+            "author": self.rng.choice(self.authors),
+            "content": " ".join(self.rng.choices(WORDS, k=12)),
+        }
+
+
+def seed(users, tasks, comments_per_task, password, seed=0):
+    """N kullanıcı, M task ve task başına K yorum; dönen değer oluşturulan nesneler."""
+    rng = random.Random(seed)
+    user_objects = UserFactory(rng, password).create_batch(users)
+    task_objects = TaskFactory(rng, user_objects).create_batch(tasks)
+    comment_factory = TaskCommentFactory(rng, user_objects)
+    comment_objects = []
+    for task in task_objects:
+        comment_objects.extend(comment_factory.build(task=task) for _ in range(comments_per_task))
+    TaskComment.objects.bulk_create(comment_objects, batch_size=comment_factory.batch_size)
+    return user_objects, task_objects, comment_objects
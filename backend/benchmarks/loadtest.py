@@ -0,0 +1,135 @@
+"""
+Çalışan bir sunucuya karşı basit HTTP yük testi (sadece standart kütüphane).
+
+runserver ile production profilini (gunicorn + uvicorn worker'ları) karşılaştırmak için:
+
+    # 1) python manage.py runserver 0.0.0.0:8001
+    # 2) DJANGO_DEBUG=0 gunicorn -c gunicorn.conf.py --bind 0.0.0.0:8002
+    python benchmarks/loadtest.py \\
+        --url http://127.0.0.1:8001 --url http://127.0.0.1:8002 \\
+        --username alice --password secret --concurrency 32 --duration 20
+
+Her URL'de bir kez giriş yapılır ve session cookie'si tüm sanal kullanıcılarla
+paylaşılır: herkes aynı hesapla giriş yapsaydı hesap başına login throttle'ı
+(LOGIN_THROTTLE_ACCOUNT_RATE) 429 döndürürdü. Her sanal kullanıcı kendi keep-alive
+bağlantısıyla --path listesini sırayla ister. Sonuç her URL için istek/sn ve
+gecikme yüzdelikleridir.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ["/api/me/", "/api/tasks/", "/api/tasks/?all=1"]
+
+
+class Client:
+    def __init__(self, base_url, cookies=None):
+        parts = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        self.cookies = dict(cookies or {})
+
+    def request(self, method, path, body=None):
+        headers = {"Accept": "application/json"}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        for header in response.headers.get_all("Set-Cookie") or []:
+            name, _, rest = header.partition("=")
+            self.cookies[name.strip()] = rest.split(";", 1)[0]
+        return response.status
+
+
+def login(base_url, args):
+    """Session cookie'lerini döner; giriş başarısızsa yük testi anlamsızdır."""
+    client = Client(base_url)
+    status = client.request("POST", "/api/login/", {"username": args.username, "password": args.password})
+    if status != 200:
+        raise SystemExit(f"{base_url}: login failed with HTTP {status}")
+    return client.cookies
+
+
+def worker(base_url, cookies, args, window, latencies, errors, lock):
+    client = Client(base_url, cookies)
+    # Tüm thread'ler hazır olunca süre herkes için aynı anda başlar
+    window["ready"].wait()
+
+    local, local_errors, index = [], [], 0
+    while time.perf_counter() < window["deadline"]:
+        path = args.path[index % len(args.path)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            status = client.request("GET", path)
+        except (OSError, http.client.HTTPException) as exc:
+            local_errors.append(type(exc).__name__)
+            client = Client(base_url, client.cookies)
+            continue
+        local.append(time.perf_counter() - start)
+        if status >= 400:
+            local_errors.append(str(status))
+    with lock:
+        latencies.extend(local)
+        errors.extend(local_errors)
+
+
+def run(base_url, args):
+    cookies = login(base_url, args)
+    latencies, errors, lock = [], [], threading.Lock()
+    window = {}
+
+    def open_window():
+        window["start"] = time.perf_counter()
+        window["deadline"] = window["start"] + args.duration
+
+    window["ready"] = threading.Barrier(args.concurrency, action=open_window)
+    threads = [
+        threading.Thread(
+            target=worker, args=(base_url, cookies, args, window, latencies, errors, lock)
+        )
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - window["start"]
+
+    result = {"url": base_url, "requests": len(latencies), "errors": len(errors)}
+    if latencies:
+        cuts = statistics.quantiles(latencies, n=100)
+        result.update(
+            rps=round(len(latencies) / elapsed, 1),
+            p50_ms=round(cuts[49] * 1000, 2),
+            p95_ms=round(cuts[94] * 1000, 2),
+            p99_ms=round(cuts[98] * 1000, 2),
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", required=True, help="Birden fazla verilebilir")
+    parser.add_argument("--path", action="append", help=f"Varsayılan: {' '.join(DEFAULT_PATHS)}")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Saniye")
+    args = parser.parse_args()
+    args.path = args.path or DEFAULT_PATHS
+
+    results = [run(url.rstrip("/"), args) for url in args.url]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
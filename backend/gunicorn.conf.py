@@ -0,0 +1,68 @@
+# Production sunucu ayarları: gunicorn -c gunicorn.conf.py
+#
+# Varsayılan olarak backend_project.asgi (HTTP + /ws/ WebSocket) uvicorn
+# worker'larıyla çalışır. Sadece HTTP gerekiyorsa GUNICORN_APP=wsgi ile
+# backend_project.wsgi senkron worker'larla sunulur.
+
+import multiprocessing
+import os
+
+_app = os.environ.get("GUNICORN_APP", "asgi")
+
+if _app == "wsgi":
+    wsgi_app = "backend_project.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+else:
+    wsgi_app = "backend_project.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+# WEB_CONCURRENCY verilmezse CPU başına 2 + 1 worker
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# Uzun ömürlü worker'larda bellek sızıntısını sınırlamak için periyodik yenileme
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Process içi state (locmem cache, InMemoryBackend) worker'lar arasında paylaşılmaz:
+# bir worker'daki yazma/invalidation diğerlerinin cache'ini, ETag'lerini, oturumdaki
+# kullanıcı satırını (accounts.backends.CachedModelBackend) ve WebSocket'lerini görmez.
+_LOCAL_STATE = [
+    f"{name} ({used_by})"
+    for name, value, used_by in (
+        (
+            "DEFAULT_CACHE_BACKEND",
+            os.environ.get("DEFAULT_CACHE_BACKEND", "locmem"),
+            "sessions, login throttles, auth user rows",
+        ),
+        (
+            "TASK_CACHE_BACKEND",
+            os.environ.get("TASK_CACHE_BACKEND", "locmem"),
+            "task lists, comment threads",
+        ),
+        (
+            "REALTIME_REDIS_URL",
+            os.environ.get("REALTIME_REDIS_URL", "") or "locmem",
+            "/ws/ events",
+        ),
+    )
+    if value == "locmem"
+]
+
+
+def on_starting(server):
+    if workers > 1 and _LOCAL_STATE:
+        raise RuntimeError(
+            f"{workers} workers need shared state; set {', '.join(_LOCAL_STATE)} "
+            "to redis (see docker-compose.prod.yml) or run with WEB_CONCURRENCY=1"
+        )
+
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
@@ -0,0 +1,14 @@
+import axios from "axios";
+
+// Liste uçları cursor ile sayfalı döner: { next, previous, results }
+export async function fetchAllPages(url) {
+  const items = [];
+  let next = url;
+  while (next) {
+    const res = await axios.get(next);
+    const data = res.data || {};
+    items.push(...(data.results || []));
+    next = data.next;
+  }
+  return items;
+}